@@ -3,25 +3,34 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--jobs N] [--incremental] [--streaming]
+
+    # Keep a validation server running, and validate through it when it is up
+    python validate.py --serve &
+    python validate.py <dir> --original <original_file> --server
+
+    # Write timings and counters as JSON (or append a line to a .jsonl file)
+    python validate.py <dir> --original <original_file> --report report.jsonl
 """
 
 import argparse
+import json
 import sys
+import time
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation.runner import run_validators
 
 
 def main():
     parser = argparse.ArgumentParser(description="Validate Office document XML files")
     parser.add_argument(
         "unpacked_dir",
+        nargs="?",
         help="Path to unpacked Office document directory",
     )
     parser.add_argument(
         "--original",
-        required=True,
         help="Path to original file (.docx/.pptx/.xlsx)",
     )
     parser.add_argument(
@@ -30,8 +39,61 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for XSD validation (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-validate parts changed since the last --incremental run "
+        "(results are kept in .<dir>.validation.json beside the directory)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Stream parts instead of keeping them in memory, for very large "
+        "documents (XSD validation still loads one part at a time)",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a validation server that keeps schemas and baselines loaded",
+    )
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Validate through a running validation server if there is one",
+    )
+    parser.add_argument(
+        "--socket",
+        help="Unix socket of the validation server "
+        "(default: $OOXML_VALIDATION_SOCKET or a socket in a private per-user "
+        "directory)",
+    )
+    parser.add_argument(
+        "--report",
+        help="Write a JSON report of per-check, per-rule and per-part timings and "
+        "cache counters to this file (appended as one line if it ends in .jsonl)",
+    )
     args = parser.parse_args()
 
+    if args.serve:
+        from validation.server import serve
+
+        try:
+            serve(args.socket)
+        except OSError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        return
+
+    if args.unpacked_dir is None or args.original is None:
+        parser.error("the following arguments are required: unpacked_dir, --original")
+
     # Validate paths
     unpacked_dir = Path(args.unpacked_dir)
     original_file = Path(args.original)
@@ -42,28 +104,74 @@ def main():
         f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
     )
 
-    # Run validations
-    match file_extension:
-        case ".docx":
-            validators = [DOCXSchemaValidator, RedliningValidator]
-        case ".pptx":
-            validators = [PPTXSchemaValidator]
-        case _:
-            print(f"Error: Validation not supported for file type {file_extension}")
-            sys.exit(1)
+    options = {
+        "jobs": args.jobs,
+        "incremental": args.incremental,
+        "streaming": args.streaming,
+    }
+
+    # Run validators, through the server if asked to and one is running
+    start = time.perf_counter()
+    results = None
+    if args.server:
+        from validation.server import validate_remote
 
-    # Run validators
-    success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+        try:
+            response = validate_remote(
+                unpacked_dir,
+                original_file,
+                verbose=args.verbose,
+                socket_path=args.socket,
+                **options,
+            )
+        except PermissionError as e:
+            print(f"Not using the validation server, validating locally: {e}")
+        except OSError:
+            pass  # No server running, validate here
+        except RuntimeError as e:
+            print(f"Validation server failed, validating locally:\n{e}")
+        else:
+            print(response["output"], end="")
+            results = response["results"]
+
+    if results is None:
+        try:
+            results = run_validators(
+                unpacked_dir, original_file, verbose=args.verbose, **options
+            )
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
 
+    success = all(result["passed"] for result in results)
     if success:
         print("All validations PASSED!")
 
+    if args.report:
+        write_report(
+            Path(args.report),
+            {
+                "unpacked_dir": str(unpacked_dir),
+                "original": str(original_file),
+                "success": success,
+                "seconds": time.perf_counter() - start,
+                "validators": results,
+            },
+        )
+
     sys.exit(0 if success else 1)
 
 
+def write_report(path, record):
+    """Write a report as JSON, or append it as one line to a .jsonl file."""
+    if path.suffix.lower() == ".jsonl":
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+            f.write("\n")
+
+
 if __name__ == "__main__":
     main()
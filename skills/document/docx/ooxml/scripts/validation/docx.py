@@ -3,19 +3,140 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
 import zipfile
 
 import lxml.etree
 
 from .base import BaseSchemaValidator
+from .engine import Rule, iterparse_part
+from .report import timed_check
+
+WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W_P = f"{{{WORD_2006_NAMESPACE}}}p"
+W_T = f"{{{WORD_2006_NAMESPACE}}}t"
+W_DEL = f"{{{WORD_2006_NAMESPACE}}}del"
+W_INS = f"{{{WORD_2006_NAMESPACE}}}ins"
+W_DEL_TEXT = f"{{{WORD_2006_NAMESPACE}}}delText"
+
+
+def _text_preview(text):
+    """Return a short repr of text for error messages."""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+class _DocumentXmlRule(Rule):
+    """Rule that only checks document.xml files."""
+
+    def applies_to(self, xml_file):
+        return xml_file.name == "document.xml"
+
+
+class WhitespacePreservationRule(_DocumentXmlRule):
+    """w:t elements with leading or trailing whitespace need xml:space='preserve'."""
+
+    def handlers(self):
+        return {("end", W_T): self.check_text}
+
+    def check_text(self, xml_file, elem, walk):
+        if not elem.text:
+            return
+        text = elem.text
+        # Check if text starts or ends with whitespace
+        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
+            # Check if xml:space="preserve" attribute exists
+            xml_space_attr = f"{{{self.validator.XML_NAMESPACE}}}space"
+            if (
+                xml_space_attr not in elem.attrib
+                or elem.attrib[xml_space_attr] != "preserve"
+            ):
+                self.errors.append(
+                    f"  {self.relative_path(xml_file)}: "
+                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {_text_preview(text)}"
+                )
+
+    def report(self):
+        if self.errors:
+            print(
+                f"FAILED - Found {len(self.errors)} whitespace preservation violations:"
+            )
+            for error in self.errors:
+                print(error)
+            return False
+        else:
+            if self.validator.verbose:
+                print("PASSED - All whitespace is properly preserved")
+            return True
+
+
+class DeletionsRule(_DocumentXmlRule):
+    """w:t elements must not appear within w:del elements.
+
+    For some reason, XSD validation does not catch this, so we do it manually.
+    """
+
+    SCOPES = (W_DEL,)
+
+    def handlers(self):
+        return {("end", W_T): self.check_text}
+
+    def check_text(self, xml_file, elem, walk):
+        if walk.inside(W_DEL) and elem.text:
+            self.errors.append(
+                f"  {self.relative_path(xml_file)}: "
+                f"Line {elem.sourceline}: <w:t> found within <w:del>: {_text_preview(elem.text)}"
+            )
+
+    def report(self):
+        if self.errors:
+            print(f"FAILED - Found {len(self.errors)} deletion validation violations:")
+            for error in self.errors:
+                print(error)
+            return False
+        else:
+            if self.validator.verbose:
+                print("PASSED - No w:t elements found within w:del elements")
+            return True
+
+
+class InsertionsRule(_DocumentXmlRule):
+    """w:delText is only allowed in w:ins if nested within a w:del."""
+
+    SCOPES = (W_INS, W_DEL)
+
+    def handlers(self):
+        return {("end", W_DEL_TEXT): self.check_del_text}
+
+    def check_del_text(self, xml_file, elem, walk):
+        if walk.inside(W_INS) and not walk.inside(W_DEL):
+            self.errors.append(
+                f"  {self.relative_path(xml_file)}: "
+                f"Line {elem.sourceline}: <w:delText> within <w:ins>: {_text_preview(elem.text or '')}"
+            )
+
+    def report(self):
+        if self.errors:
+            print(f"FAILED - Found {len(self.errors)} insertion validation violations:")
+            for error in self.errors:
+                print(error)
+            return False
+        else:
+            if self.validator.verbose:
+                print("PASSED - No w:delText elements within w:ins elements")
+            return True
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
     """Validator for Word document XML files against XSD schemas."""
 
     # Word-specific namespace
-    WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    WORD_2006_NAMESPACE = WORD_2006_NAMESPACE
+
+    # Word-specific rules run alongside the common ones
+    RULES = BaseSchemaValidator.RULES + [
+        WhitespacePreservationRule,
+        DeletionsRule,
+        InsertionsRule,
+    ]
 
     # Word-specific element to relationship type mappings
     # Start with empty mapping - add specific cases as we discover them
@@ -27,6 +148,10 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         if not self.validate_xml():
             return False
 
+        # Walk each part once for all element-level rules (Tests 1, 2, 6-9);
+        # the checks below report what the walk collected
+        self.run_rules(self.RULES)
+
         # Test 1: Namespace declarations
         all_valid = True
         if not self.validate_namespaces():
@@ -69,106 +194,20 @@ class DOCXSchemaValidator(BaseSchemaValidator):
 
         return all_valid
 
+    @timed_check
     def validate_whitespace_preservation(self):
         """
         Validate that w:t elements with whitespace have xml:space='preserve'.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All whitespace is properly preserved")
-            return True
+        return self._report_rule(WhitespacePreservationRule)
 
+    @timed_check
     def validate_deletions(self):
         """
         Validate that w:t elements are not within w:del elements.
         For some reason, XSD validation does not catch this, so we do it manually.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} deletion validation violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - No w:t elements found within w:del elements")
-            return True
+        return self._report_rule(DeletionsRule)
 
     def count_paragraphs_in_unpacked(self):
         """Count the number of paragraphs in the unpacked document."""
@@ -180,10 +219,13 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+                if self.streaming:
+                    count = self._count_paragraphs_streaming(xml_file)
+                else:
+                    root = self.parse_xml(xml_file).getroot()
+                    # Count all w:p elements
+                    paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+                    count = len(paragraphs)
             except Exception as e:
                 print(f"Error counting paragraphs in unpacked document: {e}")
 
@@ -194,71 +236,37 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
-
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
+            # Read document.xml straight from the original docx
+            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
+                if self.streaming:
+                    with zip_ref.open("word/document.xml") as xml_stream:
+                        return self._count_paragraphs_streaming(xml_stream)
+                root = lxml.etree.fromstring(zip_ref.read("word/document.xml"))
 
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
 
         return count
 
+    def _count_paragraphs_streaming(self, source):
+        """Count the w:p elements of a document.xml without keeping its tree."""
+        return sum(
+            1
+            for event, elem in iterparse_part(source)
+            if event == "end" and elem.tag == W_P
+        )
+
+    @timed_check
     def validate_insertions(self):
         """
         Validate that w:delText elements are not within w:ins elements.
         w:delText is only allowed in w:ins if nested within a w:del.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} insertion validation violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - No w:delText elements within w:ins elements")
-            return True
+        return self._report_rule(InsertionsRule)
 
     def compare_paragraph_counts(self):
         """Compare paragraph counts between original and new document."""
@@ -2,11 +2,13 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
+import xml.etree.ElementTree as ET
 import zipfile
 from pathlib import Path
 
+from .fingerprints import ParagraphIndex
+from .textdiff import diff_paragraphs
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
@@ -27,92 +29,82 @@ class RedliningValidator:
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
 
-        # First, check if there are any tracked changes by Claude to validate
+        # Parse the modified file using xml.etree.ElementTree, once for the
+        # check below and the redlining validation
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-
-            # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
-                if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
-                return True
-
-        except Exception:
-            # If we can't parse the XML, continue with full validation
-            pass
-
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
+            modified_root = ET.parse(modified_file).getroot()
+        except ET.ParseError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
 
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
+        # First, check if there are any tracked changes by Claude to validate
+        del_elements = modified_root.findall(".//w:del", self.namespaces)
+        ins_elements = modified_root.findall(".//w:ins", self.namespaces)
+
+        # Filter to only include changes by Claude
+        claude_del_elements = [
+            elem
+            for elem in del_elements
+            if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
+        ]
+        claude_ins_elements = [
+            elem
+            for elem in ins_elements
+            if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
+        ]
 
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
+        # Redlining validation is only needed if tracked changes by Claude have been used.
+        if not claude_del_elements and not claude_ins_elements:
+            if self.verbose:
+                print("PASSED - No tracked changes by Claude found.")
+            return True
 
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
+        # Read the original document.xml straight from the zip, without unpacking
+        try:
+            with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
+                if "word/document.xml" not in zip_ref.NameToInfo:
+                    print(
+                        f"FAILED - Original document.xml not found in {self.original_docx}"
+                    )
+                    return False
+                with zip_ref.open("word/document.xml") as original_file:
+                    original_root = ET.parse(original_file).getroot()
+        except ET.ParseError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
+        except Exception as e:
+            print(f"FAILED - Error reading original docx: {e}")
+            return False
 
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
+        # Remove Claude's tracked changes from both documents
+        self._remove_claude_tracked_changes(original_root)
+        self._remove_claude_tracked_changes(modified_root)
+
+        # Compare the documents paragraph by paragraph, by fingerprint
+        original_paragraphs = self._paragraph_index(original_root)
+        modified_paragraphs = self._paragraph_index(modified_root)
+        changes = list(original_paragraphs.changes(modified_paragraphs))
+
+        if changes:
+            # Show detailed word and character-level differences for each paragraph
+            error_message = self._generate_detailed_diff(
+                original_paragraphs, modified_paragraphs, changes
+            )
+            print(error_message)
+            return False
 
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+        if self.verbose:
+            print("PASSED - All changes by Claude are properly tracked")
+        return True
 
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
+    def _generate_detailed_diff(self, original, modified, changes):
+        """Generate detailed word-level differences of the changed paragraphs.
 
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+        Args:
+            original: ParagraphIndex of the original document
+            modified: ParagraphIndex of the modified document
+            changes: (i, j) pairs of differing paragraphs (see ParagraphIndex.changes)
+        """
         error_parts = [
             "FAILED - Document text doesn't match after removing Claude's tracked changes",
             "",
@@ -127,92 +119,24 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
-        else:
-            error_parts.append("Unable to generate word diff (git not available)")
+        # Show word diff of the changed paragraphs
+        error_parts.extend(["Differences:", "============"])
+        error_parts.extend(
+            diff_paragraphs(self._paragraph_changes(original, modified, changes))
+        )
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
-
-        return None
+    def _paragraph_changes(self, original, modified, changes):
+        """Yield (label, original text, modified text) of each differing paragraph."""
+        for i, j in changes:
+            if j is None:
+                # Removed: where it was in the original
+                yield f"original {original.label(i)}", original.text(i), None
+            elif i is None:
+                yield modified.label(j), None, modified.text(j)
+            else:
+                yield modified.label(j), original.text(i), modified.text(j)
 
     def _remove_claude_tracked_changes(self, root):
         """Remove tracked changes authored by Claude from the XML root."""
@@ -251,28 +175,15 @@ class RedliningValidator:
                     parent.insert(del_index, child)
                 parent.remove(del_elem)
 
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
-
-        Empty paragraphs are skipped to avoid false positives when tracked
-        insertions add only structural elements without text content.
-        """
+    def _paragraph_index(self, root):
+        """Index the paragraphs of a Word XML root by the fingerprints of their text."""
         p_tag = f"{{{self.namespaces['w']}}}p"
-        t_tag = f"{{{self.namespaces['w']}}}t"
+        return ParagraphIndex(root.iter(p_tag), self._paragraph_text)
 
-        paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
-            # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
-            # Skip empty paragraphs - they don't affect content validation
-            if paragraph_text:
-                paragraphs.append(paragraph_text)
-
-        return "\n".join(paragraphs)
+    def _paragraph_text(self, p_elem):
+        """Return the text of a paragraph (including paragraphs nested in it)."""
+        t_tag = f"{{{self.namespaces['w']}}}t"
+        return "".join(t_elem.text for t_elem in p_elem.iter(t_tag) if t_elem.text)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+"""
+Runs the validators that apply to an Office file type.
+
+Shared by validate.py and the validation server, so both run the same checks.
+"""
+
+import time
+
+from .base import BaseSchemaValidator
+from .docx import DOCXSchemaValidator
+from .pptx import PPTXSchemaValidator
+from .redlining import RedliningValidator
+
+# Validators to run for each file type, in order
+VALIDATORS = {
+    ".docx": [DOCXSchemaValidator, RedliningValidator],
+    ".pptx": [PPTXSchemaValidator],
+}
+
+
+def run_validators(unpacked_dir, original_file, verbose=False, **options):
+    """Run every validator for the original file's type.
+
+    Args:
+        unpacked_dir: Path to the unpacked Office document directory
+        original_file: Path to the original .docx/.pptx file
+        verbose: Enable verbose output
+        **options: Options for the schema validators (jobs, incremental,
+                   streaming); other validators do not take them
+
+    Returns:
+        list: One dict per validator that ran, with "validator" (class name),
+              "passed", "seconds" and, for schema validators, "report" (see
+              ValidationReport.to_dict)
+
+    Raises:
+        ValueError: If validation is not supported for the file type
+    """
+    file_extension = original_file.suffix.lower()
+    if file_extension not in VALIDATORS:
+        raise ValueError(f"Validation not supported for file type {file_extension}")
+
+    results = []
+    for V in VALIDATORS[file_extension]:
+        start = time.perf_counter()
+        if issubclass(V, BaseSchemaValidator):
+            validator = V(unpacked_dir, original_file, verbose=verbose, **options)
+        else:
+            validator = V(unpacked_dir, original_file, verbose=verbose)
+        result = {"validator": V.__name__, "passed": validator.validate()}
+        result["seconds"] = time.perf_counter() - start
+        if isinstance(validator, BaseSchemaValidator):
+            result["report"] = validator.report.to_dict()
+        results.append(result)
+    return results
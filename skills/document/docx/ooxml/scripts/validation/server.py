@@ -0,0 +1,222 @@
+"""
+Long-lived validation server listening on a Unix socket.
+
+Compiled XSD schemas and original-file baselines are cached per process, so a
+server that stays up validates each edit without paying for interpreter
+startup, imports and schema compilation again.
+
+Protocol: one JSON object per line in each direction.
+    request:  {"command": "validate", "unpacked_dir": ..., "original": ...,
+               "verbose": false, "options": {"jobs": 1, ...}}
+    response: {"success": true, "results": [{"validator": ..., "passed": ...,
+               "seconds": ..., "report": {...}}, ...],
+               "output": "<everything the validators printed>"}
+              or {"error": "<message>"}
+    request:  {"command": "shutdown"}
+"""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import tempfile
+import traceback
+from pathlib import Path
+
+from .runner import run_validators
+
+
+def default_socket_path():
+    """Return the socket path used when none is given.
+
+    OOXML_VALIDATION_SOCKET overrides the default, a socket in a directory
+    only the user can enter (see private_directory) under $XDG_RUNTIME_DIR or,
+    without one, the temp dir.
+    """
+    if os.environ.get("OOXML_VALIDATION_SOCKET"):
+        return os.environ["OOXML_VALIDATION_SOCKET"]
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    directory = private_directory(Path(base) / f"ooxml-validation-{os.getuid()}")
+    return str(directory / "server.sock")
+
+
+def private_directory(path):
+    """Create a directory only the current user can use, or check an existing one.
+
+    A directory at a predictable path may have been created by someone else
+    first, so it is only trusted if it is a real directory, owned by the user
+    and closed to everyone else.
+
+    Raises:
+        PermissionError: If the directory is not private to the user
+    """
+    path = Path(path)
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = path.lstat()
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is not a directory of the current user")
+    if info.st_mode & 0o077:
+        raise PermissionError(f"{path} is accessible to other users")
+    return path
+
+
+def _check_owner(socket_path):
+    """Refuse a socket that another user created (or could have replaced)."""
+    info = os.lstat(socket_path)
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f"{socket_path} is not a socket of the current user")
+
+
+def _check_peer(sock):
+    """Refuse a server run by another user, where the platform can tell."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return
+    credentials = sock.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    _, uid, _ = struct.unpack("3i", credentials)
+    if uid != os.getuid():
+        raise PermissionError("The validation server runs as another user")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                self._respond({"error": f"Invalid request: {e}"})
+                continue
+
+            command = request.get("command")
+            if command == "shutdown":
+                self._respond({"success": True})
+                self.server.shutdown_requested = True
+                return
+            elif command == "validate":
+                self._respond(self._validate(request))
+            else:
+                self._respond({"error": f"Unknown command: {command}"})
+
+    def _validate(self, request):
+        output = io.StringIO()
+        try:
+            # Requests are handled one at a time, so capturing stdout is safe
+            with contextlib.redirect_stdout(output):
+                results = run_validators(
+                    Path(request["unpacked_dir"]),
+                    Path(request["original"]),
+                    verbose=request.get("verbose", False),
+                    **request.get("options", {}),
+                )
+        except Exception:
+            return {"error": traceback.format_exc(), "output": output.getvalue()}
+
+        return {
+            "success": all(result["passed"] for result in results),
+            "results": results,
+            "output": output.getvalue(),
+        }
+
+    def _respond(self, response):
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class ValidationServer(socketserver.UnixStreamServer):
+    """Serves validation requests one at a time, keeping caches warm."""
+
+    def __init__(self, socket_path):
+        self.socket_path = str(socket_path)
+        self.shutdown_requested = False
+        # A socket file left behind by a server that died would block bind()
+        with contextlib.suppress(FileNotFoundError):
+            _check_owner(self.socket_path)
+            os.unlink(self.socket_path)
+        # Create the socket without group or other permissions, rather than
+        # leave it open to them until a chmod
+        umask = os.umask(0o177)
+        try:
+            super().__init__(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+
+    def serve_until_shutdown(self):
+        try:
+            while not self.shutdown_requested:
+                self.handle_request()
+        finally:
+            self.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.socket_path)
+
+
+def serve(socket_path=None):
+    """Run a validation server on socket_path until it is asked to shut down."""
+    socket_path = socket_path or default_socket_path()
+    server = ValidationServer(socket_path)
+    print(f"Validation server listening on {socket_path}")
+    server.serve_until_shutdown()
+
+
+def request(message, socket_path=None, timeout=None):
+    """Send one request to a running validation server and return its response.
+
+    The socket, and where possible the server process, must belong to the
+    user: paths and results are not exchanged with anyone else.
+
+    Raises:
+        OSError: If no server is listening on socket_path
+        PermissionError: If the socket or the server belongs to another user
+    """
+    socket_path = socket_path or default_socket_path()
+    _check_owner(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        _check_peer(sock)
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as response:
+            line = response.readline()
+    if not line:
+        raise ConnectionError("Validation server closed the connection")
+    return json.loads(line)
+
+
+def validate_remote(
+    unpacked_dir, original_file, verbose=False, socket_path=None, **options
+):
+    """Validate through a running validation server.
+
+    Args:
+        unpacked_dir: Path to the unpacked Office document directory
+        original_file: Path to the original .docx/.pptx file
+        verbose: Enable verbose output
+        socket_path: Server socket (default: default_socket_path())
+        **options: Options for the schema validators (jobs, incremental, streaming)
+
+    Returns:
+        dict: The server's response (success, results, output)
+
+    Raises:
+        OSError: If no server is running
+        PermissionError: If the socket or the server belongs to another user
+        RuntimeError: If the server failed to run the validators
+    """
+    response = request(
+        {
+            "command": "validate",
+            "unpacked_dir": str(Path(unpacked_dir).resolve()),
+            "original": str(Path(original_file).resolve()),
+            "verbose": verbose,
+            "options": options,
+        },
+        socket_path,
+    )
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response
@@ -0,0 +1,145 @@
+"""
+Word- and character-level differences between paragraphs, one line per paragraph.
+
+Changes are marked inline like git's --word-diff=plain: [-removed-]{+added+}.
+Only changed paragraphs are shown, unchanged text within them is shortened to
+some context around the changes, and at most a given number of paragraphs are
+shown, so messages stay short however large the documents are.
+"""
+
+import difflib
+import re
+
+MAX_DIFF_PARAGRAPHS = 50  # Changed paragraphs shown before the rest are counted
+CONTEXT_CHARS = 40  # Unchanged characters shown on each side of a change
+MAX_WORD_DIFF_TOKENS = 5000  # Longer paragraphs are shown whole, removed and added
+
+# Words, runs of whitespace, and single other characters
+_TOKEN_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+
+
+def diff_paragraphs(changes, max_paragraphs=MAX_DIFF_PARAGRAPHS):
+    """
+    Yield changed paragraphs with their changes marked inline.
+
+    Changed paragraphs are diffed word by word, and changed words that still
+    look alike character by character; added and removed paragraphs are shown
+    whole.
+
+    Args:
+        changes: Iterable of (label, original, modified) per changed paragraph:
+            where the paragraph is (or None), and its text before and after
+            the change, None for an added or a removed paragraph
+        max_paragraphs: Number of changed paragraphs to show; one more line
+            then says how many were left out
+
+    Yields:
+        str: One line per changed paragraph, "label: text"
+    """
+    shown = 0
+    left_out = 0
+    for label, original, modified in changes:
+        if shown == max_paragraphs:
+            left_out += 1
+            continue
+        shown += 1
+        if original is None:
+            line = f"{{+{_shorten(modified, True, True)}+}}"
+        elif modified is None:
+            line = f"[-{_shorten(original, True, True)}-]"
+        else:
+            line = diff_words(original, modified)
+        yield f"{label}: {line}" if label else line
+    if left_out:
+        yield f"... and {left_out} more changed paragraph(s)"
+
+
+def diff_words(original, modified):
+    """Return one paragraph with the changes to it marked inline."""
+    old_tokens = _TOKEN_PATTERN.findall(original)
+    new_tokens = _TOKEN_PATTERN.findall(modified)
+    if len(old_tokens) + len(new_tokens) > MAX_WORD_DIFF_TOKENS:
+        return (
+            f"[-{_shorten(original, True, True)}-]"
+            f"{{+{_shorten(modified, True, True)}+}}"
+        )
+
+    segments = _slide_to_words(
+        [
+            [tag, old_tokens[i1:i2], new_tokens[j1:j2]]
+            for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(
+                None, old_tokens, new_tokens, autojunk=False
+            ).get_opcodes()
+        ]
+    )
+    parts = []
+    for n, (tag, old_segment, new_segment) in enumerate(segments):
+        old = "".join(old_segment)
+        new = "".join(new_segment)
+        if tag == "equal":
+            parts.append(_shorten(old, n > 0, n < len(segments) - 1))
+        elif tag == "replace" and len(old_segment) == 1 and len(new_segment) == 1:
+            parts.append(_diff_chars(old, new))
+        else:
+            if old:
+                parts.append(f"[-{old}-]")
+            if new:
+                parts.append(f"{{+{new}+}}")
+    return "".join(parts)
+
+
+def _slide_to_words(segments):
+    """Move whitespace that starts an added or removed run to its end.
+
+    "The{+ initial+} term" and "The {+initial +}term" are the same change;
+    the second, which git shows too, reads better.
+    """
+    for n in range(1, len(segments) - 1):
+        tag, old, new = segments[n]
+        if tag not in ("insert", "delete"):
+            continue
+        changed = new if tag == "insert" else old
+        following = segments[n + 1][1]  # Unchanged tokens, the same in both
+        if segments[n - 1][0] != "equal" or segments[n + 1][0] != "equal":
+            continue
+        if changed[0].isspace() and following and changed[0] == following[0]:
+            token = changed.pop(0)
+            changed.append(token)
+            segments[n - 1][1].append(token)
+            segments[n - 1][2].append(token)
+            segments[n + 1][1].pop(0)
+            segments[n + 1][2].pop(0)
+    return segments
+
+
+def _diff_chars(old, new):
+    """Mark the changed characters of one word replaced by another."""
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    if matcher.ratio() < 0.5:
+        return f"[-{old}-]{{+{new}+}}"  # Different words, not a changed word
+    parts = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            parts.append(old[i1:i2])
+            continue
+        if i1 < i2:
+            parts.append(f"[-{old[i1:i2]}-]")
+        if j1 < j2:
+            parts.append(f"{{+{new[j1:j2]}+}}")
+    return "".join(parts)
+
+
+def _shorten(text, after_change, before_change):
+    """Shorten unchanged text to the context next to the changes around it.
+
+    Args:
+        text: Unchanged text
+        after_change: Keep the start of the text, which follows a change
+        before_change: Keep the end of the text, which precedes a change
+    """
+    keep = CONTEXT_CHARS * (after_change + before_change)
+    if len(text) <= keep + CONTEXT_CHARS:
+        return text
+    head = text[:CONTEXT_CHARS] if after_change else ""
+    tail = text[-CONTEXT_CHARS:] if before_change else ""
+    return f"{head}...{tail}"
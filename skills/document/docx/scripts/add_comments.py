@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Command line tool to add comments in bulk to a Word document, e.g. from a review tool.
+
+Usage:
+    PYTHONPATH=<docx skill root> python -m scripts.add_comments <document> <comments.jsonl>
+        [--output <file.docx or dir>] [--author NAME] [--initials XY]
+        [--backend lxml] [--no-validate]
+
+<document> is an unpacked directory or a .docx. Without --output, it is updated
+in place.
+
+Each line of the JSONL file is one comment (see Document.add_comments):
+
+    {"id": "c1", "start": {"tag": "w:p", "contains": "Section 2"}, "text": "Unclear", "author": "Jane Roe"}
+    {"start": {"tag": "w:r", "line_number": [120, 130], "contains": "fee"}, "end": {"tag": "w:r", "contains": "days"}, "text": "Why?"}
+    {"parent": "c1", "text": "Agreed", "author": "Ann Lee", "initials": "AL"}
+    {"parent": 3, "text": "Reply to comment 3 of the document"}
+
+Anchors (start, end) are get_node arguments for word/document.xml; a
+line_number of [first, last] is the range of lines first through last.
+"""
+
+import argparse
+import json
+import sys
+
+from scripts.document import Document
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Add comments from a JSONL file to a Word document"
+    )
+    parser.add_argument("document", help="Unpacked DOCX directory or .docx file")
+    parser.add_argument("comments", help="JSONL file with one comment per line")
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Where to save the document (default: update it in place)",
+    )
+    parser.add_argument(
+        "--author",
+        default="Claude",
+        help="Author of comments that name none (default: Claude)",
+    )
+    parser.add_argument(
+        "--initials",
+        default="C",
+        help="Initials of that author (default: C)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["minidom", "lxml"],
+        default="lxml",
+        help="XMLEditor backend (default: lxml, which is faster on large documents)",
+    )
+    parser.add_argument(
+        "--no-validate",
+        action="store_true",
+        help="Save without validating the document",
+    )
+    args = parser.parse_args()
+
+    try:
+        records = read_records(args.comments)
+        doc = Document(
+            args.document,
+            author=args.author,
+            initials=args.initials,
+            backend=args.backend,
+        )
+        comment_ids = doc.add_comments(records)
+        doc.save(args.output, validate=not args.no_validate)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"Added {len(comment_ids)} comments")
+
+
+def read_records(path):
+    """Read the comment records of a JSONL file, skipping blank lines."""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}, line {line_number}: {e}") from None
+            if not isinstance(record, dict):
+                raise ValueError(f"{path}, line {line_number}: not a JSON object")
+            for key in ("start", "end"):
+                if isinstance(record.get(key), dict):
+                    try:
+                        record[key] = _get_node_arguments(record[key])
+                    except ValueError as e:
+                        raise ValueError(f"{path}, line {line_number}: {e}") from None
+            records.append(record)
+    return records
+
+
+def _get_node_arguments(locator):
+    """Turn a JSON line range [first, last] into the range get_node expects."""
+    line_number = locator.get("line_number")
+    if isinstance(line_number, list):
+        bounds_are_ints = all(
+            isinstance(bound, int) and not isinstance(bound, bool)
+            for bound in line_number
+        )
+        if len(line_number) != 2 or not bounds_are_ints:
+            raise ValueError(
+                f"line_number must be a line or a [first, last] pair of lines, "
+                f"not {line_number!r}"
+            )
+        first, last = line_number
+        locator = dict(locator, line_number=range(first, last + 1))
+    return locator
+
+
+if __name__ == "__main__":
+    main()
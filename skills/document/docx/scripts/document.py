@@ -8,6 +8,8 @@ Usage:
     # Initialize
     doc = Document('workspace/unpacked')
     doc = Document('workspace/unpacked', author="John Doe", initials="JD")
+    doc = Document('workspace/unpacked', backend="lxml")  # Faster on large files
+    doc = Document('workspace/report.docx')  # Edit the .docx itself, no unpack/pack
 
     # Find nodes
     node = doc["word/document.xml"].get_node(tag="w:del", attrs={"w:id": "1"})
@@ -16,6 +18,7 @@ Usage:
     # Add comments
     doc.add_comment(start=node, end=node, text="Comment text")
     doc.reply_to_comment(parent_comment_id=0, text="Reply text")
+    doc.add_comments(records)  # Many at once, see add_comments.py for the CLI
 
     # Suggest tracked changes
     doc["word/document.xml"].suggest_deletion(node)  # Delete content
@@ -24,25 +27,54 @@ Usage:
 
     # Save
     doc.save()
+
+    # The same edits to many documents: see edit_documents.py
 """
 
+import bisect
+import contextlib
+import copy
+import filecmp
 import html
+import os
 import random
 import shutil
+import struct
 import tempfile
+import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
 
 from defusedxml import minidom
 from ooxml.scripts.pack import pack_document
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
+from ooxml.scripts.validation.manifest import combine_hashes, hash_file
 from ooxml.scripts.validation.redlining import RedliningValidator
 
-from .utilities import XMLEditor
+from .utilities import XMLEditor, user_cache_dir
 
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# Packed validation baselines, shared by all sessions of the user, in a
+# private directory of the user's cache (see user_cache_dir)
+BASELINE_CACHE_NAME = "docx-baselines"
+BASELINE_CACHE_SIZE = 16  # Least recently used baselines beyond this are removed
+
+# Keys of add_comments records, and get_node arguments with their types, as
+# accepted from records (e.g. read from JSON)
+COMMENT_RECORD_KEYS = {"text", "start", "end", "parent", "author", "initials", "id"}
+GET_NODE_TYPES = {
+    "tag": str,
+    "attrs": dict,
+    "line_number": (int, range),
+    "contains": str,
+}
+
+# Parts the workspace links to instead of copying: they are only ever replaced
+# (XMLEditor.save renames a new file over them), never written into
+LINKED_SUFFIXES = (".xml", ".rels")
+
 
 class DocxXMLEditor(XMLEditor):
     """XMLEditor that automatically applies RSID, author, and date to new elements.
@@ -53,11 +85,19 @@ class DocxXMLEditor(XMLEditor):
     - w:id (for w:ins and w:del elements)
 
     Attributes:
-        dom (defusedxml.minidom.Document): The DOM document for direct manipulation
+        dom: The DOM document for direct manipulation (see XMLEditor)
+        timestamp: Date applied to new elements (default None: the time of each edit)
     """
 
     def __init__(
-        self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
+        self,
+        xml_path,
+        rsid: str,
+        author: str = "Claude",
+        initials: str = "C",
+        backend: str = "minidom",
+        ids=None,
+        cache_dir=None,
     ):
         """Initialize with required RSID and optional author.
 
@@ -66,52 +106,63 @@ class DocxXMLEditor(XMLEditor):
             rsid: RSID to automatically apply to new elements
             author: Author name for tracked changes and comments (default: "Claude")
             initials: Author initials (default: "C")
+            backend: XMLEditor backend, "minidom" (default) or "lxml"
+            ids: IdAllocator shared with the other parts of the document
+                 (default: a new one for this part only)
+            cache_dir: Optional directory of parsed trees to reuse (see XMLEditor)
         """
-        super().__init__(xml_path)
+        super().__init__(xml_path, backend=backend, cache_dir=cache_dir)
         self.rsid = rsid
         self.author = author
         self.initials = initials
+        self.timestamp = None
+        self.ids = ids or IdAllocator()
+        self.ids.register(self)
 
     def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
-        max_id = -1
-        for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
-            for elem in elements:
-                change_id = elem.getAttribute("w:id")
-                if change_id:
-                    try:
-                        max_id = max(max_id, int(change_id))
-                    except ValueError:
-                        pass
-        return max_id + 1
+        """Get the next available change ID (unique across the document's parts)."""
+        return self.ids.next_change_id()
+
+    def get_next_rid(self):
+        """Get the next available rId for relationships files."""
+        return self.ids.next_rid(self)
+
+    def _reserve_ids(self, nodes):
+        """Tell the ID allocator about the IDs that inserted nodes bring along."""
+        # Tag -> (ID attribute, reserve method), for one pass over each node
+        reserve = {
+            "w:ins": ("w:id", self.ids.reserve_change_id),
+            "w:del": ("w:id", self.ids.reserve_change_id),
+            "w:comment": ("w:id", self.ids.reserve_comment_id),
+            "w:p": ("w14:paraId", self.ids.reserve_hex_id),
+            "Relationship": ("Id", lambda value: self.ids.reserve_rid(self, value)),
+        }
+        for node in nodes:
+            if not self.is_element(node):
+                continue
+            for elem in self._backend.iter_elements(node):
+                entry = reserve.get(self.tag_name(elem))
+                if entry is not None:
+                    name, reserve_id = entry
+                    reserve_id(self.get_attribute(elem, name))
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w16du"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w16du",
-                "http://schemas.microsoft.com/office/word/2023/wordml/word16du",
-            )
+        self.ensure_namespace(
+            "w16du", "http://schemas.microsoft.com/office/word/2023/wordml/word16du"
+        )
 
     def _ensure_w16cex_namespace(self):
         """Ensure w16cex namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w16cex"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w16cex",
-                "http://schemas.microsoft.com/office/word/2018/wordml/cex",
-            )
+        self.ensure_namespace(
+            "w16cex", "http://schemas.microsoft.com/office/word/2018/wordml/cex"
+        )
 
     def _ensure_w14_namespace(self):
         """Ensure w14 namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w14"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w14",
-                "http://schemas.microsoft.com/office/word/2010/wordml",
-            )
+        self.ensure_namespace(
+            "w14", "http://schemas.microsoft.com/office/word/2010/wordml"
+        )
 
     def _inject_attributes_to_nodes(self, nodes):
         """Inject RSID, author, and date attributes into DOM nodes where applicable.
@@ -129,112 +180,113 @@ class DocxXMLEditor(XMLEditor):
         """
         from datetime import datetime, timezone
 
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        timestamp = self.timestamp or datetime.now(timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
+        )
 
         def is_inside_deletion(elem):
             """Check if element is inside a w:del element."""
-            parent = elem.parentNode
-            while parent:
-                if parent.nodeType == parent.ELEMENT_NODE and parent.tagName == "w:del":
+            parent = self.parent(elem)
+            while parent is not None:
+                if self.is_element(parent) and self.tag_name(parent) == "w:del":
                     return True
-                parent = parent.parentNode
+                parent = self.parent(parent)
             return False
 
         def add_rsid_to_p(elem):
-            if not elem.hasAttribute("w:rsidR"):
-                elem.setAttribute("w:rsidR", self.rsid)
-            if not elem.hasAttribute("w:rsidRDefault"):
-                elem.setAttribute("w:rsidRDefault", self.rsid)
-            if not elem.hasAttribute("w:rsidP"):
-                elem.setAttribute("w:rsidP", self.rsid)
+            if not self.has_attribute(elem, "w:rsidR"):
+                self.set_attribute(elem, "w:rsidR", self.rsid)
+            if not self.has_attribute(elem, "w:rsidRDefault"):
+                self.set_attribute(elem, "w:rsidRDefault", self.rsid)
+            if not self.has_attribute(elem, "w:rsidP"):
+                self.set_attribute(elem, "w:rsidP", self.rsid)
             # Add w14:paraId and w14:textId if not present
-            if not elem.hasAttribute("w14:paraId"):
+            if not self.has_attribute(elem, "w14:paraId"):
                 self._ensure_w14_namespace()
-                elem.setAttribute("w14:paraId", _generate_hex_id())
-            if not elem.hasAttribute("w14:textId"):
+                self.set_attribute(elem, "w14:paraId", self.ids.hex_id())
+            if not self.has_attribute(elem, "w14:textId"):
                 self._ensure_w14_namespace()
-                elem.setAttribute("w14:textId", _generate_hex_id())
+                self.set_attribute(elem, "w14:textId", _generate_hex_id())
 
         def add_rsid_to_r(elem):
             # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
             if is_inside_deletion(elem):
-                if not elem.hasAttribute("w:rsidDel"):
-                    elem.setAttribute("w:rsidDel", self.rsid)
+                if not self.has_attribute(elem, "w:rsidDel"):
+                    self.set_attribute(elem, "w:rsidDel", self.rsid)
             else:
-                if not elem.hasAttribute("w:rsidR"):
-                    elem.setAttribute("w:rsidR", self.rsid)
+                if not self.has_attribute(elem, "w:rsidR"):
+                    self.set_attribute(elem, "w:rsidR", self.rsid)
 
         def add_tracked_change_attrs(elem):
             # Auto-assign w:id if not present
-            if not elem.hasAttribute("w:id"):
-                elem.setAttribute("w:id", str(self._get_next_change_id()))
-            if not elem.hasAttribute("w:author"):
-                elem.setAttribute("w:author", self.author)
-            if not elem.hasAttribute("w:date"):
-                elem.setAttribute("w:date", timestamp)
+            if not self.has_attribute(elem, "w:id"):
+                self.set_attribute(elem, "w:id", str(self._get_next_change_id()))
+            if not self.has_attribute(elem, "w:author"):
+                self.set_attribute(elem, "w:author", self.author)
+            if not self.has_attribute(elem, "w:date"):
+                self.set_attribute(elem, "w:date", timestamp)
             # Add w16du:dateUtc for tracked changes (same as w:date since we generate UTC timestamps)
-            if elem.tagName in ("w:ins", "w:del") and not elem.hasAttribute(
-                "w16du:dateUtc"
+            if self.tag_name(elem) in ("w:ins", "w:del") and not self.has_attribute(
+                elem, "w16du:dateUtc"
             ):
                 self._ensure_w16du_namespace()
-                elem.setAttribute("w16du:dateUtc", timestamp)
+                self.set_attribute(elem, "w16du:dateUtc", timestamp)
 
         def add_comment_attrs(elem):
-            if not elem.hasAttribute("w:author"):
-                elem.setAttribute("w:author", self.author)
-            if not elem.hasAttribute("w:date"):
-                elem.setAttribute("w:date", timestamp)
-            if not elem.hasAttribute("w:initials"):
-                elem.setAttribute("w:initials", self.initials)
+            if not self.has_attribute(elem, "w:author"):
+                self.set_attribute(elem, "w:author", self.author)
+            if not self.has_attribute(elem, "w:date"):
+                self.set_attribute(elem, "w:date", timestamp)
+            if not self.has_attribute(elem, "w:initials"):
+                self.set_attribute(elem, "w:initials", self.initials)
 
         def add_comment_extensible_date(elem):
             # Add w16cex:dateUtc for comment extensible elements
-            if not elem.hasAttribute("w16cex:dateUtc"):
+            if not self.has_attribute(elem, "w16cex:dateUtc"):
                 self._ensure_w16cex_namespace()
-                elem.setAttribute("w16cex:dateUtc", timestamp)
+                self.set_attribute(elem, "w16cex:dateUtc", timestamp)
 
         def add_xml_space_to_t(elem):
             # Add xml:space="preserve" to w:t if text has leading/trailing whitespace
-            if (
-                elem.firstChild
-                and elem.firstChild.nodeType == elem.firstChild.TEXT_NODE
-            ):
-                text = elem.firstChild.data
-                if text and (text[0].isspace() or text[-1].isspace()):
-                    if not elem.hasAttribute("xml:space"):
-                        elem.setAttribute("xml:space", "preserve")
+            text = self.leading_text(elem)
+            if text and (text[0].isspace() or text[-1].isspace()):
+                if not self.has_attribute(elem, "xml:space"):
+                    self.set_attribute(elem, "xml:space", "preserve")
+
+        # IDs already in the content must not be handed out below
+        self._reserve_ids(nodes)
 
         for node in nodes:
-            if node.nodeType != node.ELEMENT_NODE:
+            if not self.is_element(node):
                 continue
 
             # Handle the node itself
-            if node.tagName == "w:p":
+            if self.tag_name(node) == "w:p":
                 add_rsid_to_p(node)
-            elif node.tagName == "w:r":
+            elif self.tag_name(node) == "w:r":
                 add_rsid_to_r(node)
-            elif node.tagName == "w:t":
+            elif self.tag_name(node) == "w:t":
                 add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
+            elif self.tag_name(node) in ("w:ins", "w:del"):
                 add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
+            elif self.tag_name(node) == "w:comment":
                 add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
+            elif self.tag_name(node) == "w16cex:commentExtensible":
                 add_comment_extensible_date(node)
 
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
+            # Process descendants (find_all doesn't return the element itself)
+            for elem in self.find_all("w:p", node):
                 add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
+            for elem in self.find_all("w:r", node):
                 add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
+            for elem in self.find_all("w:t", node):
                 add_xml_space_to_t(elem)
             for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
+                for elem in self.find_all(tag, node):
                     add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
+            for elem in self.find_all("w:comment", node):
                 add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
+            for elem in self.find_all("w16cex:commentExtensible", node):
                 add_comment_extensible_date(elem)
 
     def replace_node(self, elem, new_content):
@@ -261,6 +313,101 @@ class DocxXMLEditor(XMLEditor):
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
+    def find_runs(self, text, within=None):
+        """Find text in paragraphs, including text split across several runs.
+
+        Only w:t text counts, so deleted text (w:delText) is skipped and inserted
+        text is found. Paragraph texts and their offsets are cached until the
+        paragraph is edited, so repeated searches do not re-read the document.
+
+        Args:
+            text: Text to find; entity notation (&#8220;) is unescaped like in get_node
+            within: Only search paragraphs inside this element (default: whole document)
+
+        Returns:
+            list: One dict per match, in document order, with "paragraph" (the w:p),
+                  "runs" (the w:r elements holding the match), "texts" (the w:t
+                  elements holding the match), "start" (offset of the match in the
+                  first w:t) and "end" (offset just past the match in the last w:t)
+
+        Example:
+            # "within 30 days" may be split into several runs by formatting
+            match = doc["word/document.xml"].find_runs("within 30 days")[0]
+            for run in match["runs"]:
+                doc["word/document.xml"].suggest_deletion(run)
+        """
+        text = html.unescape(text)
+        if not text:
+            raise ValueError("find_runs requires non-empty text")
+
+        matches = []
+        paragraphs = self._node_index().find_text(
+            "w:p", text, "w:t text", lambda para: self._w_t_offsets(para)[0]
+        )
+        for para in paragraphs:
+            if not self._is_attached(para) or not self._is_within(para, within):
+                continue
+            para_text, segments = self._w_t_offsets(para)
+            start = para_text.find(text)
+            paragraph_matches = []
+            while start != -1:
+                paragraph_matches.append(
+                    self._text_match(para, segments, start, start + len(text))
+                )
+                start = para_text.find(text, start + len(text))
+            matches.append(paragraph_matches)
+
+        paragraphs = self._in_document_order([m[0]["paragraph"] for m in matches])
+        by_paragraph = {m[0]["paragraph"]: m for m in matches}
+        return [match for para in paragraphs for match in by_paragraph[para]]
+
+    def _w_t_offsets(self, para):
+        """Return the w:t text of a paragraph and the offset each w:t starts at."""
+        return self._cached(para, "w:t offsets", self._read_w_t_offsets)
+
+    def _read_w_t_offsets(self, para):
+        parts = []
+        segments = []  # (start offset, w:t), in document order
+        offset = 0
+        for t_elem in self.find_all("w:t", para):
+            # Paragraphs nested in this one (e.g. in text boxes) have their own text
+            ancestor = self.parent(t_elem)
+            while ancestor is not para and self.tag_name(ancestor) != "w:p":
+                ancestor = self.parent(ancestor)
+            if ancestor is not para:
+                continue
+            t_text = self.own_text(t_elem)
+            segments.append((offset, t_elem))
+            parts.append(t_text)
+            offset += len(t_text)
+        return "".join(parts), segments
+
+    def _text_match(self, para, segments, start, end):
+        """Describe the w:t elements and runs holding para's text[start:end]."""
+        starts = [segment_start for segment_start, _ in segments]
+        first = bisect.bisect_right(starts, start) - 1
+        last = bisect.bisect_left(starts, end) - 1
+        texts = [t_elem for _, t_elem in segments[first : last + 1]]
+        runs = []
+        for t_elem in texts:
+            run = self.parent(t_elem)
+            if self.tag_name(run) == "w:r" and run not in runs:
+                runs.append(run)
+        return {
+            "paragraph": para,
+            "runs": runs,
+            "texts": texts,
+            "start": start - starts[first],
+            "end": end - starts[last],
+        }
+
+    def _is_within(self, elem, ancestor):
+        if ancestor is None:
+            return True
+        while elem is not None and elem is not ancestor:
+            elem = self.parent(elem)
+        return elem is ancestor
+
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
 
@@ -287,57 +434,53 @@ class DocxXMLEditor(XMLEditor):
         """
         # Collect insertions
         ins_elements = []
-        if elem.tagName == "w:ins":
+        if self.tag_name(elem) == "w:ins":
             ins_elements.append(elem)
         else:
-            ins_elements.extend(elem.getElementsByTagName("w:ins"))
+            ins_elements.extend(self.find_all("w:ins", elem))
 
         # Validate that there are insertions to reject
         if not ins_elements:
             raise ValueError(
                 f"revert_insertion requires w:ins elements. "
-                f"The provided element <{elem.tagName}> contains no insertions. "
+                f"The provided element <{self.tag_name(elem)}> contains no insertions. "
             )
 
         # Process all insertions - wrap all children in w:del
         for ins_elem in ins_elements:
-            runs = list(ins_elem.getElementsByTagName("w:r"))
-            if not runs:
-                continue
+            self._reject_insertion(ins_elem)
 
-            # Create deletion wrapper
-            del_wrapper = self.dom.createElement("w:del")
-
-            # Process each run
-            for run in runs:
-                # Convert w:t → w:delText and w:rsidR → w:rsidDel
-                if run.hasAttribute("w:rsidR"):
-                    run.setAttribute("w:rsidDel", run.getAttribute("w:rsidR"))
-                    run.removeAttribute("w:rsidR")
-                elif not run.hasAttribute("w:rsidDel"):
-                    run.setAttribute("w:rsidDel", self.rsid)
-
-                for t_elem in list(run.getElementsByTagName("w:t")):
-                    del_text = self.dom.createElement("w:delText")
-                    # Copy ALL child nodes (not just firstChild) to handle entities
-                    while t_elem.firstChild:
-                        del_text.appendChild(t_elem.firstChild)
-                    for i in range(t_elem.attributes.length):
-                        attr = t_elem.attributes.item(i)
-                        del_text.setAttribute(attr.name, attr.value)
-                    t_elem.parentNode.replaceChild(del_text, t_elem)
-
-            # Move all children from ins to del wrapper
-            while ins_elem.firstChild:
-                del_wrapper.appendChild(ins_elem.firstChild)
-
-            # Add del wrapper back to ins
-            ins_elem.appendChild(del_wrapper)
+        return [elem]
 
-            # Inject attributes to the deletion wrapper
-            self._inject_attributes_to_nodes([del_wrapper])
+    def _reject_insertion(self, ins_elem):
+        """Wrap the content of one w:ins in a w:del (see revert_insertion)."""
+        runs = list(self.find_all("w:r", ins_elem))
+        if not runs:
+            return
 
-        return [elem]
+        # Create deletion wrapper
+        del_wrapper = self.create_element("w:del")
+
+        # Process each run
+        for run in runs:
+            # Convert w:t → w:delText and w:rsidR → w:rsidDel
+            if self.has_attribute(run, "w:rsidR"):
+                self.set_attribute(run, "w:rsidDel", self.get_attribute(run, "w:rsidR"))
+                self.remove_attribute(run, "w:rsidR")
+            elif not self.has_attribute(run, "w:rsidDel"):
+                self.set_attribute(run, "w:rsidDel", self.rsid)
+
+            for t_elem in list(self.find_all("w:t", run)):
+                self.rename(t_elem, "w:delText")
+
+        # Move all children from ins to del wrapper
+        self.move_children(ins_elem, del_wrapper)
+
+        # Add del wrapper back to ins
+        self.append_node(ins_elem, del_wrapper)
+
+        # Inject attributes to the deletion wrapper
+        self._inject_attributes_to_nodes([del_wrapper])
 
     def revert_deletion(self, elem):
         """Reject a deletion by re-inserting the deleted content.
@@ -366,18 +509,18 @@ class DocxXMLEditor(XMLEditor):
         """
         # Collect deletions FIRST - before we modify the DOM
         del_elements = []
-        is_single_del = elem.tagName == "w:del"
+        is_single_del = self.tag_name(elem) == "w:del"
 
         if is_single_del:
             del_elements.append(elem)
         else:
-            del_elements.extend(elem.getElementsByTagName("w:del"))
+            del_elements.extend(self.find_all("w:del", elem))
 
         # Validate that there are deletions to reject
         if not del_elements:
             raise ValueError(
                 f"revert_deletion requires w:del elements. "
-                f"The provided element <{elem.tagName}> contains no deletions. "
+                f"The provided element <{self.tag_name(elem)}> contains no deletions. "
             )
 
         # Track created insertion (only relevant if elem is a single w:del)
@@ -385,50 +528,93 @@ class DocxXMLEditor(XMLEditor):
 
         # Process all deletions - create insertions that copy the deleted content
         for del_elem in del_elements:
-            # Clone the deleted runs and convert them to insertions
-            runs = list(del_elem.getElementsByTagName("w:r"))
-            if not runs:
-                continue
+            inserted = self._reject_deletion(del_elem)
 
-            # Create insertion wrapper
-            ins_elem = self.dom.createElement("w:ins")
+            # If processing a single w:del, track the created insertion
+            if is_single_del and inserted is not None:
+                created_insertion = inserted
 
-            for run in runs:
-                # Clone the run
-                new_run = run.cloneNode(True)
+        # Return based on input type
+        if is_single_del and created_insertion is not None:
+            return [elem, created_insertion]
+        else:
+            return [elem]
 
-                # Convert w:delText → w:t
-                for del_text in list(new_run.getElementsByTagName("w:delText")):
-                    t_elem = self.dom.createElement("w:t")
-                    # Copy ALL child nodes (not just firstChild) to handle entities
-                    while del_text.firstChild:
-                        t_elem.appendChild(del_text.firstChild)
-                    for i in range(del_text.attributes.length):
-                        attr = del_text.attributes.item(i)
-                        t_elem.setAttribute(attr.name, attr.value)
-                    del_text.parentNode.replaceChild(t_elem, del_text)
+    def _reject_deletion(self, del_elem):
+        """Insert a copy of one w:del's content after it (see revert_deletion).
 
-                # Update run attributes: w:rsidDel → w:rsidR
-                if new_run.hasAttribute("w:rsidDel"):
-                    new_run.setAttribute("w:rsidR", new_run.getAttribute("w:rsidDel"))
-                    new_run.removeAttribute("w:rsidDel")
-                elif not new_run.hasAttribute("w:rsidR"):
-                    new_run.setAttribute("w:rsidR", self.rsid)
+        Returns:
+            The new w:ins, or None if the deletion has no runs
+        """
+        # Clone the deleted runs and convert them to insertions
+        runs = list(self.find_all("w:r", del_elem))
+        if not runs:
+            return None
+
+        # Create insertion wrapper
+        ins_elem = self.create_element("w:ins")
+
+        for run in runs:
+            # Clone the run
+            new_run = self.clone(run)
+
+            # Convert w:delText → w:t
+            for del_text in list(self.find_all("w:delText", new_run)):
+                self.rename(del_text, "w:t")
+
+            # Update run attributes: w:rsidDel → w:rsidR
+            if self.has_attribute(new_run, "w:rsidDel"):
+                self.set_attribute(
+                    new_run, "w:rsidR", self.get_attribute(new_run, "w:rsidDel")
+                )
+                self.remove_attribute(new_run, "w:rsidDel")
+            elif not self.has_attribute(new_run, "w:rsidR"):
+                self.set_attribute(new_run, "w:rsidR", self.rsid)
 
-                ins_elem.appendChild(new_run)
+            self.append_node(ins_elem, new_run)
 
-            # Insert the new insertion after the deletion
-            nodes = self.insert_after(del_elem, ins_elem.toxml())
+        # Insert the new insertion after the deletion
+        nodes = self.insert_after(del_elem, self.to_xml(ins_elem))
+        return nodes[0] if nodes else None
 
-            # If processing a single w:del, track the created insertion
-            if is_single_del and nodes:
-                created_insertion = nodes[0]
+    def _accept_insertion(self, ins_elem):
+        """Keep the content of one w:ins as untracked content."""
+        for child in self.child_nodes(ins_elem):
+            self.insert_node_before(ins_elem, child)
+        self.remove_node(ins_elem)
 
-        # Return based on input type
-        if is_single_del and created_insertion:
-            return [elem, created_insertion]
-        else:
-            return [elem]
+    def _accept_deletion(self, del_elem):
+        """Remove one w:del and its content."""
+        self.remove_node(del_elem)
+
+    def _tracked_changes(self, match, containers=None):
+        """
+        Find the tracked insertions and deletions of runs that match.
+
+        Paragraph mark changes (w:ins and w:del in a w:rPr) are left out, and so
+        are changes inside another change that is returned.
+
+        Args:
+            match: Function of a w:ins or w:del element, True to include it
+            containers: Only search these elements (default: the whole part)
+
+        Returns:
+            list: Matching w:ins elements, then w:del elements, in document order
+        """
+        changes = {}
+        for tag in ("w:ins", "w:del"):
+            for container in [None] if containers is None else containers:
+                for elem in self.find_all(tag, container):
+                    if self.tag_name(self.parent(elem)) != "w:rPr" and match(elem):
+                        changes[elem] = None
+
+        def is_nested(elem):
+            parent = self.parent(elem)
+            while parent is not None and parent not in changes:
+                parent = self.parent(parent)
+            return parent is not None
+
+        return [elem for elem in changes if not is_nested(elem)]
 
     @staticmethod
     def suggest_paragraph(xml_content: str) -> str:
@@ -495,94 +681,82 @@ class DocxXMLEditor(XMLEditor):
         Raises:
             ValueError: If element has existing tracked changes or invalid structure
         """
-        if elem.nodeName == "w:r":
+        if self.tag_name(elem) == "w:r":
             # Check for existing w:delText
-            if elem.getElementsByTagName("w:delText"):
+            if self.find_all("w:delText", elem):
                 raise ValueError("w:r element already contains w:delText")
 
-            # Convert w:t → w:delText
-            for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
-                # Copy ALL child nodes (not just firstChild) to handle entities
-                while t_elem.firstChild:
-                    del_text.appendChild(t_elem.firstChild)
-                # Preserve attributes like xml:space
-                for i in range(t_elem.attributes.length):
-                    attr = t_elem.attributes.item(i)
-                    del_text.setAttribute(attr.name, attr.value)
-                t_elem.parentNode.replaceChild(del_text, t_elem)
+            # Convert w:t → w:delText, preserving attributes like xml:space
+            for t_elem in list(self.find_all("w:t", elem)):
+                self.rename(t_elem, "w:delText")
 
             # Update run attributes: w:rsidR → w:rsidDel
-            if elem.hasAttribute("w:rsidR"):
-                elem.setAttribute("w:rsidDel", elem.getAttribute("w:rsidR"))
-                elem.removeAttribute("w:rsidR")
-            elif not elem.hasAttribute("w:rsidDel"):
-                elem.setAttribute("w:rsidDel", self.rsid)
+            if self.has_attribute(elem, "w:rsidR"):
+                self.set_attribute(
+                    elem, "w:rsidDel", self.get_attribute(elem, "w:rsidR")
+                )
+                self.remove_attribute(elem, "w:rsidR")
+            elif not self.has_attribute(elem, "w:rsidDel"):
+                self.set_attribute(elem, "w:rsidDel", self.rsid)
 
             # Wrap in w:del
-            del_wrapper = self.dom.createElement("w:del")
-            parent = elem.parentNode
-            parent.insertBefore(del_wrapper, elem)
-            parent.removeChild(elem)
-            del_wrapper.appendChild(elem)
+            del_wrapper = self.create_element("w:del")
+            self.insert_node_before(elem, del_wrapper)
+            self.append_node(del_wrapper, elem)
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
 
             return del_wrapper
 
-        elif elem.nodeName == "w:p":
+        elif self.tag_name(elem) == "w:p":
             # Check for existing tracked changes
-            if elem.getElementsByTagName("w:ins") or elem.getElementsByTagName("w:del"):
+            if self.find_all("w:ins", elem) or self.find_all("w:del", elem):
                 raise ValueError("w:p element already contains tracked changes")
 
             # Check if it's a numbered list item
-            pPr_list = elem.getElementsByTagName("w:pPr")
-            is_numbered = pPr_list and pPr_list[0].getElementsByTagName("w:numPr")
+            pPr_list = self.find_all("w:pPr", elem)
+            is_numbered = pPr_list and self.find_all("w:numPr", pPr_list[0])
 
             if is_numbered:
                 # Add <w:del/> to w:rPr in w:pPr
                 pPr = pPr_list[0]
-                rPr_list = pPr.getElementsByTagName("w:rPr")
+                rPr_list = self.find_all("w:rPr", pPr)
 
                 if not rPr_list:
-                    rPr = self.dom.createElement("w:rPr")
-                    pPr.appendChild(rPr)
+                    rPr = self.create_element("w:rPr")
+                    self.append_node(pPr, rPr)
                 else:
                     rPr = rPr_list[0]
 
                 # Add <w:del/> marker
-                del_marker = self.dom.createElement("w:del")
-                rPr.insertBefore(
-                    del_marker, rPr.firstChild
-                ) if rPr.firstChild else rPr.appendChild(del_marker)
-
-            # Convert w:t → w:delText in all runs
-            for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
-                # Copy ALL child nodes (not just firstChild) to handle entities
-                while t_elem.firstChild:
-                    del_text.appendChild(t_elem.firstChild)
-                # Preserve attributes like xml:space
-                for i in range(t_elem.attributes.length):
-                    attr = t_elem.attributes.item(i)
-                    del_text.setAttribute(attr.name, attr.value)
-                t_elem.parentNode.replaceChild(del_text, t_elem)
+                del_marker = self.create_element("w:del")
+                first_child = self.first_child(rPr)
+                if first_child is not None:
+                    self.insert_node_before(first_child, del_marker)
+                else:
+                    self.append_node(rPr, del_marker)
+
+            # Convert w:t → w:delText in all runs, preserving attributes like xml:space
+            for t_elem in list(self.find_all("w:t", elem)):
+                self.rename(t_elem, "w:delText")
 
             # Update run attributes: w:rsidR → w:rsidDel
-            for run in elem.getElementsByTagName("w:r"):
-                if run.hasAttribute("w:rsidR"):
-                    run.setAttribute("w:rsidDel", run.getAttribute("w:rsidR"))
-                    run.removeAttribute("w:rsidR")
-                elif not run.hasAttribute("w:rsidDel"):
-                    run.setAttribute("w:rsidDel", self.rsid)
+            for run in self.find_all("w:r", elem):
+                if self.has_attribute(run, "w:rsidR"):
+                    self.set_attribute(
+                        run, "w:rsidDel", self.get_attribute(run, "w:rsidR")
+                    )
+                    self.remove_attribute(run, "w:rsidR")
+                elif not self.has_attribute(run, "w:rsidDel"):
+                    self.set_attribute(run, "w:rsidDel", self.rsid)
 
             # Wrap all non-pPr children in <w:del>
-            del_wrapper = self.dom.createElement("w:del")
-            for child in [c for c in elem.childNodes if c.nodeName != "w:pPr"]:
-                elem.removeChild(child)
-                del_wrapper.appendChild(child)
-            elem.appendChild(del_wrapper)
+            del_wrapper = self.create_element("w:del")
+            for child in self.child_nodes(elem):
+                if self.tag_name(child) != "w:pPr":
+                    self.append_node(del_wrapper, child)
+            self.append_node(elem, del_wrapper)
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
@@ -590,7 +764,7 @@ class DocxXMLEditor(XMLEditor):
             return elem
 
         else:
-            raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
+            raise ValueError(f"Element must be w:r or w:p, got {self.tag_name(elem)}")
 
 
 def _generate_hex_id() -> str:
@@ -609,6 +783,368 @@ def _generate_rsid() -> str:
     return "".join(random.choices("0123456789ABCDEF", k=8))
 
 
+class IdAllocator:
+    """Hands out IDs that are unique across the parts of one document.
+
+    Parts are registered as their editors open, and each part is scanned once
+    per kind of ID, on first use. After that IDs come from counters and sets in
+    memory, so IDs placed by other means than the editors' methods are not seen.
+    """
+
+    def __init__(self):
+        self._editors = []
+        self._scanned = {"change": 0, "comment": 0, "hex": 0}  # editors scanned
+        self._max_change_id = -1
+        self._max_comment_id = -1
+        self._hex_ids = set()  # paraIds and durableIds in use
+        self._max_rids = {}  # editor -> highest rId number of its .rels part
+
+    def register(self, editor):
+        """Add the part of an editor; its IDs are scanned when first needed."""
+        self._editors.append(editor)
+
+    def next_change_id(self):
+        """Return a new w:id for a tracked change (w:ins, w:del)."""
+        self._scan("change", self._scan_change_ids)
+        self._max_change_id += 1
+        return self._max_change_id
+
+    def next_comment_id(self):
+        """Return a new w:id for a comment."""
+        self._scan("comment", self._scan_comment_ids)
+        self._max_comment_id += 1
+        return self._max_comment_id
+
+    def hex_id(self):
+        """Return a new random paraId/durableId (see _generate_hex_id)."""
+        self._scan("hex", self._scan_hex_ids)
+        hex_id = _generate_hex_id()
+        while hex_id in self._hex_ids:
+            hex_id = _generate_hex_id()
+        self._hex_ids.add(hex_id)
+        return hex_id
+
+    def next_rid(self, editor):
+        """Return the next free rId of an editor's .rels part (without using it up)."""
+        if editor not in self._max_rids:
+            self._max_rids[editor] = 0
+            for rel_elem in editor.find_all("Relationship"):
+                self.reserve_rid(editor, editor.get_attribute(rel_elem, "Id"))
+        return f"rId{self._max_rids[editor] + 1}"
+
+    def reserve_change_id(self, value):
+        self._max_change_id = max(self._max_change_id, _to_int(value, -1))
+
+    def reserve_comment_id(self, value):
+        self._max_comment_id = max(self._max_comment_id, _to_int(value, -1))
+
+    def reserve_hex_id(self, value):
+        if value:
+            self._hex_ids.add(value.upper())
+
+    def reserve_rid(self, editor, value):
+        if editor in self._max_rids and value.startswith("rId"):
+            number = _to_int(value[3:], 0)
+            self._max_rids[editor] = max(self._max_rids[editor], number)
+
+    def snapshot(self):
+        """Return the allocator's state, for restore()."""
+        return (
+            len(self._editors),
+            dict(self._scanned),
+            self._max_change_id,
+            self._max_comment_id,
+            set(self._hex_ids),
+            dict(self._max_rids),
+        )
+
+    def restore(self, snapshot):
+        """Go back to a snapshot(), handing out the same IDs again."""
+        (
+            editor_count,
+            self._scanned,
+            self._max_change_id,
+            self._max_comment_id,
+            self._hex_ids,
+            self._max_rids,
+        ) = snapshot
+        del self._editors[editor_count:]
+
+    def _scan(self, kind, scan_editor):
+        while self._scanned[kind] < len(self._editors):
+            scan_editor(self._editors[self._scanned[kind]])
+            self._scanned[kind] += 1
+
+    def _scan_change_ids(self, editor):
+        for tag in ("w:ins", "w:del"):
+            for elem in editor.find_all(tag):
+                self.reserve_change_id(editor.get_attribute(elem, "w:id"))
+
+    def _scan_comment_ids(self, editor):
+        if editor.tag_name(editor.root) == "w:comments":
+            for elem in editor.find_all("w:comment"):
+                self.reserve_comment_id(editor.get_attribute(elem, "w:id"))
+
+    def _scan_hex_ids(self, editor):
+        for elem in editor.find_all("w:p"):
+            self.reserve_hex_id(editor.get_attribute(elem, "w14:paraId"))
+        # durableIds live in the parts that list comments by durableId
+        root_tag = editor.tag_name(editor.root)
+        for parent_tag, tag, name in (
+            ("w16cid:commentsIds", "w16cid:commentId", "w16cid:durableId"),
+            (
+                "w16cex:commentsExtensible",
+                "w16cex:commentExtensible",
+                "w16cex:durableId",
+            ),
+        ):
+            if root_tag == parent_tag:
+                for elem in editor.find_all(tag):
+                    self.reserve_hex_id(editor.get_attribute(elem, name))
+
+
+def _link_tree(source_dir, target_dir, suffixes=None):
+    """Mirror source_dir in target_dir, hard-linking its XML parts.
+
+    Only files ending with LINKED_SUFFIXES are linked; other files (e.g. media,
+    which callers may overwrite in place) are copied, so that writing into the
+    mirror never changes the original. Files are also copied where they cannot
+    be linked (e.g. across file systems).
+    If suffixes is given, only files whose names end with one of these are
+    mirrored (so "_rels/.rels" counts as a ".rels" file).
+    """
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for source in sorted(source_dir.rglob("*")):
+        target = target_dir / source.relative_to(source_dir)
+        if source.is_dir():
+            if suffixes is None:
+                target.mkdir(exist_ok=True)
+            continue
+        if suffixes is not None and not source.name.endswith(tuple(suffixes)):
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if source.name.endswith(LINKED_SUFFIXES):
+            _link_file(source, target)
+        else:
+            shutil.copy2(source, target)
+
+
+def _link_file(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _pack_baseline(xml_dir):
+    """Return the cached .docx of the parts in xml_dir, packing it if needed."""
+    parts = sorted(path for path in xml_dir.rglob("*") if path.is_file())
+    key = combine_hashes(
+        *(f"{path.relative_to(xml_dir).as_posix()}:{hash_file(path)}" for path in parts)
+    )
+    cache_dir = user_cache_dir(BASELINE_CACHE_NAME)
+    package = cache_dir / f"{key}.docx"
+    if package.exists():
+        os.utime(package)  # Most recently used
+        return package
+
+    fd, temp_name = tempfile.mkstemp(dir=cache_dir, prefix=".", suffix=".docx")
+    os.close(fd)
+    try:
+        pack_document(xml_dir, temp_name, validate=False)
+        os.replace(temp_name, package)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+    cached = [path for path in cache_dir.glob("*.docx") if path.name[0] != "."]
+    cached.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in cached[BASELINE_CACHE_SIZE:]:
+        path.unlink(missing_ok=True)
+    return package
+
+
+def _check_baseline(package, source_dir):
+    """Check that a packed baseline has all the XML parts of source_dir.
+
+    Raises:
+        ValueError: If the package lacks parts of source_dir, or has others
+    """
+    expected = {
+        path.relative_to(source_dir).as_posix()
+        for path in source_dir.rglob("*")
+        if path.is_file() and path.name.endswith(LINKED_SUFFIXES)
+    }
+    with zipfile.ZipFile(package) as zf:
+        packed = {name for name in zf.namelist() if not name.endswith("/")}
+    if packed != expected:
+        missing = sorted(expected - packed)
+        extra = sorted(packed - expected)
+        raise ValueError(
+            f"Validation baseline does not match {source_dir}: "
+            f"missing {missing}, unexpected {extra}"
+        )
+
+
+def _copy_changed_files(source_dir, target_dir):
+    """Copy the files of source_dir that differ from those in target_dir.
+
+    Files with the same size and modification time are taken to be unchanged
+    (copies keep the modification time); files of equal size are compared.
+    Each file is written to a temporary name and renamed over the old one.
+    """
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for source in sorted(source_dir.rglob("*")):
+        target = target_dir / source.relative_to(source_dir)
+        if source.is_dir():
+            target.mkdir(parents=True, exist_ok=True)
+            continue
+        source_stat = source.stat()
+        try:
+            target_stat = target.stat()
+        except FileNotFoundError:
+            pass
+        else:
+            if target_stat.st_size == source_stat.st_size and (
+                target_stat.st_mtime_ns == source_stat.st_mtime_ns
+                or filecmp.cmp(source, target, shallow=False)
+            ):
+                continue
+
+        fd, temp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+        os.close(fd)
+        try:
+            shutil.copy2(source, temp_name)
+            os.replace(temp_name, target)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+
+
+def _write_package(source, workspace, extracted, target):
+    """Write the files of workspace to target as a package based on source.
+
+    Members whose files are unchanged since extraction, or were never extracted,
+    are copied compressed as they are. Edited and new files are compressed, and
+    extracted files that were deleted are left out.
+
+    Args:
+        source: Package the workspace was extracted from
+        workspace: Directory of extracted and new files
+        extracted: Member name -> file state after extraction (see _file_state)
+        target: Path of the package to write
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(source) as source_zip, zipfile.ZipFile(
+            temp_name, "w", zipfile.ZIP_DEFLATED
+        ) as target_zip:
+            names = set()
+            for info in source_zip.infolist():
+                names.add(info.filename)
+                path = workspace / info.filename
+                state = extracted.get(info.filename)
+                if path.is_file() and _file_state(path) != state:
+                    target_zip.write(path, info.filename)
+                elif state is None or path.exists():
+                    _copy_member(source_zip, target_zip, info)
+
+            for path in sorted(workspace.rglob("*")):
+                name = path.relative_to(workspace).as_posix()
+                if path.is_file() and name not in names:
+                    target_zip.write(path, name)
+
+        # Members copied as they are bypass zipfile's own writing: read the
+        # package back before it replaces anything
+        with zipfile.ZipFile(temp_name) as written:
+            bad_member = written.testzip()
+        if bad_member is not None:
+            raise zipfile.BadZipFile(f"Corrupt member in new package: {bad_member}")
+        _copy_target_mode(target, temp_name)
+        os.replace(temp_name, target)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+def _copy_member(source_zip, target_zip, info):
+    """Add a member of source_zip to target_zip without recompressing it.
+
+    zipfile has no API for this, so the member is written the way
+    ZipFile.write() writes one: local header, data, then an entry that close()
+    adds to the central directory. This relies on ZipFile internals (fp,
+    filelist, NameToInfo, start_dir, _didModify and _lock), so _write_package
+    checks the package it wrote with testzip().
+    """
+    with source_zip._lock, target_zip._lock:
+        # Skip the local header, whose name and extra field lengths are at offset 26
+        source_zip.fp.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack("<HH", source_zip.fp.read(4))
+        source_zip.fp.seek(name_length + extra_length, os.SEEK_CUR)
+
+        member = copy.copy(info)
+        member.flag_bits &= ~0x08  # CRC and sizes go in the header, not a descriptor
+        member.extra = b""  # FileHeader() adds a zip64 field if needed
+        member.header_offset = target_zip.fp.tell()
+        target_zip.fp.write(member.FileHeader())
+        remaining = info.compress_size
+        while remaining:
+            chunk = source_zip.fp.read(min(remaining, 1 << 20))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated member: {info.filename}")
+            target_zip.fp.write(chunk)
+            remaining -= len(chunk)
+
+        target_zip.filelist.append(member)
+        target_zip.NameToInfo[member.filename] = member
+        target_zip.start_dir = target_zip.fp.tell()
+        target_zip._didModify = True
+
+
+def _copy_target_mode(target, temp_name):
+    """Give a file about to replace target the mode of target.
+
+    mkstemp() creates files readable by their owner only. A new target gets
+    the mode a newly created file would have, given the umask.
+    """
+    if target.exists():
+        shutil.copymode(target, temp_name)
+        return
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(temp_name, 0o666 & ~umask)
+
+
+def _file_state(path):
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _to_utc(value):
+    """Return a datetime or ISO 8601 string as an aware datetime (naive means UTC)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _to_int(value, default):
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def _initials(name):
+    """Return the initials of a name, e.g. "JR" for "Jane Roe"."""
+    return "".join(word[0] for word in name.split()).upper()
+
+
 class Document:
     """Manages comments in unpacked Word documents."""
 
@@ -619,31 +1155,66 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        backend="minidom",
+        cache_dir=None,
     ):
         """
-        Initialize with path to unpacked Word document directory.
+        Initialize with path to unpacked Word document directory, or to a .docx.
         Automatically sets up comment infrastructure (people.xml, RSIDs).
 
+        A .docx is edited without unpacking and packing it: only its XML parts
+        are extracted (as stored, so usually one line each), and save() writes
+        a new .docx that copies unchanged parts without recompressing them.
+
         Args:
-            unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory)
+            unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory),
+                or to a .docx file
             rsid: Optional RSID to use for all comment elements. If not provided, one will be generated.
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            backend: XMLEditor backend for all editors, "minidom" (default) or
+                "lxml" (much faster and leaner on large documents; nodes are
+                lxml elements)
+            cache_dir: Optional directory of parsed trees, so that scripts
+                reopening the same document skip parsing its unchanged parts
+                (minidom backend only; see XMLEditor)
         """
-        self.original_path = Path(unpacked_dir)
-
-        if not self.original_path.exists() or not self.original_path.is_dir():
+        self.original_path = Path(unpacked_dir).resolve()
+
+        self._package = None
+        if self.original_path.is_file() and zipfile.is_zipfile(self.original_path):
+            self._package = self.original_path
+        elif self.original_path.is_file():
+            raise ValueError(f"Not a .docx (zip) package: {unpacked_dir}")
+        elif not self.original_path.is_dir():
             raise ValueError(f"Directory not found: {unpacked_dir}")
 
-        # Create temporary directory with subdirectories for unpacked content and baseline
+        # Create temporary directory with subdirectories for unpacked content and
+        # baseline, in the temp dir rather than among the user's files
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
+        if self.original_path in Path(self.temp_dir).resolve().parents:
+            shutil.rmtree(self.temp_dir)
+            raise ValueError(
+                f"The temp dir is inside {unpacked_dir}; set TMPDIR elsewhere"
+            )
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
 
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+        if self._package:
+            # Extract the XML parts; other parts stay in the package until
+            # validation needs them. The package itself is the baseline.
+            self._extracted = {}  # Member name -> file state after extraction
+            self._extract(suffixes=(".xml", ".rels"))
+            self._original_docx = Path(self.temp_dir) / "original.docx"
+            _link_file(self._package, self._original_docx)
+        else:
+            _link_tree(self.original_path, self.unpacked_path)
+
+            # Keep the original XML parts for the validation baseline, which is
+            # only packed when validation first needs it (see original_docx)
+            self._baseline_path = Path(self.temp_dir) / "baseline"
+            _link_tree(self.original_path, self._baseline_path, LINKED_SUFFIXES)
+            self._original_docx = None
 
         self.word_path = self.unpacked_path / "word"
 
@@ -654,9 +1225,14 @@ class Document:
         # Set default author and initials
         self.author = author
         self.initials = initials
+        self.backend = backend
+        self.cache_dir = cache_dir
 
-        # Cache for lazy-loaded editors
+        # Cache for lazy-loaded editors, and the IDs they hand out
         self._editors = {}
+        self._handed_out = set()  # Parts whose editors the caller got with doc[...]
+        self.ids = IdAllocator()
+        self._timestamp = None  # Shared by all edits of a batch
 
         # Comment file paths
         self.comments_path = self.word_path / "comments.xml"
@@ -664,18 +1240,18 @@ class Document:
         self.comments_ids_path = self.word_path / "commentsIds.xml"
         self.comments_extensible_path = self.word_path / "commentsExtensible.xml"
 
-        # Load existing comments and determine next ID (before setup modifies files)
+        # Load existing comments (before setup modifies files)
         self.existing_comments = self._load_existing_comments()
-        self.next_comment_id = self._get_next_comment_id()
 
-        # Convenient access to document.xml editor (semi-private)
+        # Convenient access to document.xml editor (semi-private), handed out
+        # like doc[...] so that direct edits through it are saved too
         self._document = self["word/document.xml"]
 
         # Setup tracked changes infrastructure
         self._setup_tracking(track_revisions=track_revisions)
 
         # Add author to people.xml
-        self._add_author_to_people(author)
+        self._add_authors_to_people([author])
 
     def __getitem__(self, xml_path: str) -> DocxXMLEditor:
         """
@@ -700,16 +1276,105 @@ class Document:
             # Get node from comments.xml
             comment = doc["word/comments.xml"].get_node(tag="w:comment", attrs={"w:id": "0"})
         """
+        # Its nodes may be edited directly from now on, so it is always saved
+        self._handed_out.add(xml_path)
+        return self._editor(xml_path)
+
+    def _editor(self, xml_path):
+        """Get or create the editor of a part, for the document's own use."""
         if xml_path not in self._editors:
             file_path = self.unpacked_path / xml_path
             if not file_path.exists():
                 raise ValueError(f"XML file not found: {xml_path}")
             # Use DocxXMLEditor with RSID, author, and initials for all editors
             self._editors[xml_path] = DocxXMLEditor(
-                file_path, rsid=self.rsid, author=self.author, initials=self.initials
+                file_path,
+                rsid=self.rsid,
+                author=self.author,
+                initials=self.initials,
+                backend=self.backend,
+                ids=self.ids,
+                cache_dir=self.cache_dir,
             )
+            self._editors[xml_path].timestamp = self._timestamp
         return self._editors[xml_path]
 
+    def batch(self):
+        """
+        Queue edits and apply them together when the with block ends, or not at all.
+
+        All targets are looked up before anything changes, so line numbers and
+        texts refer to the document as it was. The edits then share one
+        timestamp, tracked change IDs are counted instead of rescanned, and if
+        any edit fails, every edit of the batch is undone and the error raised.
+        If the with block raises, nothing is applied.
+
+        Targets are elements or dicts of get_node arguments. Results of the
+        edits (inserted nodes, comment IDs) are in batch.results afterwards, in
+        the order the edits were queued.
+
+        Returns:
+            Batch: Context manager collecting the edits
+
+        Example:
+            with doc.batch() as batch:
+                batch.suggest_deletion({"tag": "w:r", "contains": "obsolete"})
+                batch.replace_node({"tag": "w:r", "line_number": 120}, new_xml)
+                batch.add_comment(
+                    start={"tag": "w:p", "contains": "Section 2"},
+                    end={"tag": "w:p", "contains": "Section 2"},
+                    text="Please review",
+                )
+            comment_id = batch.results[2]
+        """
+        return Batch(self)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Apply the edits made in the with block to all editors, or none of them."""
+        if self._timestamp is not None:
+            yield  # Part of an enclosing transaction, which commits or rolls back
+            return
+
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        editors = dict(self._editors)
+        comment_paths = (
+            self.comments_path,
+            self.comments_extended_path,
+            self.comments_ids_path,
+            self.comments_extensible_path,
+        )
+        missing = [path for path in comment_paths if not path.exists()]
+        existing_comments = dict(self.existing_comments)
+        ids = self.ids.snapshot()
+
+        self._timestamp = timestamp
+        for editor in editors.values():
+            editor.begin_transaction()
+            editor.timestamp = timestamp
+        try:
+            yield
+        except BaseException:
+            for editor in editors.values():
+                editor.rollback()
+            # Editors opened during the batch only have unsaved changes
+            for xml_path in list(self._editors):
+                if xml_path not in editors:
+                    del self._editors[xml_path]
+            for path in missing:
+                if path.exists():
+                    path.unlink()
+            self.existing_comments = existing_comments
+            self.ids.restore(ids)
+            raise
+        else:
+            for editor in editors.values():
+                editor.commit()
+        finally:
+            self._timestamp = None
+            for editor in self._editors.values():
+                editor.timestamp = None
+
     def add_comment(self, start, end, text: str) -> int:
         """
         Add a comment spanning from one element to another.
@@ -727,40 +1392,19 @@ class Document:
             end_node = cm.get_document_node(tag="w:ins", id="2")
             cm.add_comment(start=start_node, end=end_node, text="Explanation")
         """
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        # Add comment ranges to document.xml immediately
-        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
-
-        # If end node is a paragraph, append comment markup inside it
-        # Otherwise insert after it (for run-level anchors)
-        if end.tagName == "w:p":
-            self._document.append_to(end, self._comment_range_end_xml(comment_id))
-        else:
-            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
-
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
+        comment = self._new_comment(text, self.author, self.initials, None)
+        timestamp = self._timestamp or datetime.now(timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
         )
 
-        # Add to commentsExtended.xml immediately
-        self._add_to_comments_extended_xml(para_id, parent_para_id=None)
-
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
-
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+        # Add comment ranges to document.xml immediately
+        self._anchor_comment(comment["id"], start, end)
 
-        # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
+        # Add to comments.xml, commentsExtended.xml, commentsIds.xml and
+        # commentsExtensible.xml immediately
+        self._add_to_comment_parts([comment], timestamp)
 
-        self.next_comment_id += 1
-        return comment_id
+        return comment["id"]
 
     def reply_to_comment(
         self,
@@ -784,57 +1428,245 @@ class Document:
             raise ValueError(f"Parent comment with id={parent_comment_id} not found")
 
         parent_info = self.existing_comments[parent_comment_id]
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        # Add comment ranges to document.xml immediately
-        parent_start_elem = self._document.get_node(
-            tag="w:commentRangeStart", attrs={"w:id": str(parent_comment_id)}
+        comment = self._new_comment(
+            text, self.author, self.initials, parent_info["para_id"]
         )
-        parent_ref_elem = self._document.get_node(
-            tag="w:commentReference", attrs={"w:id": str(parent_comment_id)}
+        timestamp = self._timestamp or datetime.now(timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
         )
 
-        self._document.insert_after(
-            parent_start_elem, self._comment_range_start_xml(comment_id)
-        )
-        parent_ref_run = parent_ref_elem.parentNode
-        self._document.insert_after(
-            parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'
-        )
-        self._document.insert_after(
-            parent_ref_run, self._comment_ref_run_xml(comment_id)
-        )
+        # Add comment ranges to document.xml immediately
+        self._anchor_reply(comment["id"], parent_comment_id)
 
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
-        )
+        # Add to the comment parts immediately (with parent)
+        self._add_to_comment_parts([comment], timestamp)
+
+        return comment["id"]
+
+    def add_comments(self, records) -> list:
+        """
+        Add many comments and replies at once, e.g. imported from a review tool.
+
+        All anchors are looked up before anything changes, so they refer to the
+        document as it was and share one set of indexes. Each comment part is
+        then written once for all comments, people.xml once for all new
+        authors, and everything is added in one transaction with one
+        timestamp: if one record fails, no comment is added.
+
+        Args:
+            records: Iterable of dicts, one per comment, with the keys
+                text: Comment content (required)
+                start: Element of word/document.xml, or dict of get_node
+                    arguments, where the comment starts (required, except for
+                    replies)
+                end: Where the comment ends (default: start)
+                parent: Make the comment a reply to the record with this "id",
+                    or to the comment with this w:id (int) in the document
+                author: Author name (default: the document's author)
+                initials: Author initials (default: the document's initials
+                    for its author, else the initials of the author's name)
+                id: Key that later records use as their parent
+
+        Returns:
+            list[int]: The comment IDs created, in record order
+
+        Raises:
+            ValueError: If a record is invalid or its anchor is not found
+                (nothing is changed)
+
+        Example:
+            ids = doc.add_comments([
+                {"id": "a", "start": {"tag": "w:p", "contains": "Section 2"},
+                 "text": "Is this still accurate?", "author": "Jane Roe"},
+                {"parent": "a", "text": "Yes, checked against the 2024 figures"},
+            ])
+        """
+        records = list(records)
+        if not records:
+            return []
+
+        # Look up all anchors first, so that edits do not invalidate the indexes
+        anchors = []  # (start, end) of comments, or (None, parent) of replies
+        keys = {}  # record id -> record index
+        for index, record in enumerate(records):
+            try:
+                if not isinstance(record, dict):
+                    raise ValueError(f"Expected a dict, got {type(record).__name__}")
+                unknown = set(record) - COMMENT_RECORD_KEYS
+                if unknown:
+                    raise ValueError(f"Unknown keys: {', '.join(sorted(unknown))}")
+                anchors.append(self._comment_anchor(record, keys))
+                if record.get("id") is not None:
+                    if record["id"] in keys:
+                        raise ValueError(f"Duplicate id {record['id']!r}")
+                    keys[record["id"]] = index
+            except ValueError as e:
+                raise ValueError(f"Comment record {index + 1}: {e}") from None
+
+        comments = []
+        with self._transaction():
+            for record, (start, end) in zip(records, anchors):
+                author = record.get("author") or self.author
+                initials = record.get("initials") or (
+                    self.initials if author == self.author else _initials(author)
+                )
+                if start is None:
+                    # A reply, to an earlier record or to an existing comment
+                    kind, parent = end
+                    parent_id = comments[parent]["id"] if kind == "record" else parent
+                    parent_para_id = self.existing_comments[parent_id]["para_id"]
+                else:
+                    parent_para_id = None
+                comment = self._new_comment(
+                    record["text"], author, initials, parent_para_id
+                )
+                if start is None:
+                    self._anchor_reply(comment["id"], parent_id)
+                else:
+                    self._anchor_comment(comment["id"], start, end)
+                comments.append(comment)
+
+            self._add_to_comment_parts(comments, self._timestamp)
+            self._add_authors_to_people([comment["author"] for comment in comments])
+        return [comment["id"] for comment in comments]
 
-        # Add to commentsExtended.xml immediately (with parent)
-        self._add_to_comments_extended_xml(
-            para_id, parent_para_id=parent_info["para_id"]
+    def reject_changes(
+        self, start=None, end=None, author=None, since=None, until=None
+    ) -> int:
+        """
+        Reject the tracked changes of other authors that match all given filters.
+
+        Insertions are rejected by deleting their content and deletions by
+        inserting their content again, as tracked changes of this document's
+        author (like revert_insertion and revert_deletion). Body, headers,
+        footers, footnotes and endnotes are searched in one pass each, and all
+        changes are made in one transaction with one timestamp: if one fails,
+        none are made.
+
+        Changes of this document's author, paragraph mark changes, and changes
+        inside another matching change are left as they are.
+
+        Args:
+            start: First w:p of word/document.xml whose changes to include (with
+                start or end, other parts are not searched)
+            end: Last w:p of word/document.xml whose changes to include
+            author: Only changes by this author (or one of a list of authors)
+            since: Only changes dated at or after this time (datetime or ISO 8601
+                string; times without a time zone are UTC)
+            until: Only changes dated before this time
+
+        Returns:
+            int: Number of changes rejected
+
+        Example:
+            doc.reject_changes(author="Counterparty Counsel")
+            doc.reject_changes(since="2024-06-01", until="2024-07-01")
+            first = doc["word/document.xml"].get_node(tag="w:p", contains="Section 4")
+            last = doc["word/document.xml"].get_node(tag="w:p", contains="Section 5")
+            doc.reject_changes(start=first, end=last)
+        """
+        return self._apply_to_changes(
+            "_reject_insertion", "_reject_deletion", start, end, author, since, until
         )
 
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
+    def accept_changes(
+        self, start=None, end=None, author=None, since=None, until=None
+    ) -> int:
+        """
+        Accept the tracked changes of other authors that match all given filters.
 
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+        Inserted content is kept as untracked content and deleted content is
+        removed. Filters, parts searched and changes left as they are are those
+        of reject_changes().
 
-        # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
+        Returns:
+            int: Number of changes accepted
 
-        self.next_comment_id += 1
-        return comment_id
+        Example:
+            doc.accept_changes(author="Jane Editor", until="2024-06-01")
+        """
+        return self._apply_to_changes(
+            "_accept_insertion", "_accept_deletion", start, end, author, since, until
+        )
+
+    def _apply_to_changes(
+        self, on_insertion, on_deletion, start, end, author, since, until
+    ):
+        """Call an editor method on each matching change, in one transaction."""
+        authors = {author} if isinstance(author, str) else author
+        authors = None if authors is None else set(authors)
+        since, until = _to_utc(since), _to_utc(until)
+
+        def match(editor, elem):
+            change_author = editor.get_attribute(elem, "w:author")
+            if change_author == self.author:
+                return False
+            if authors is not None and change_author not in authors:
+                return False
+            if since is not None or until is not None:
+                try:
+                    date = _to_utc(editor.get_attribute(elem, "w:date") or None)
+                except ValueError:
+                    date = None
+                if date is None:
+                    return False
+                if since is not None and date < since:
+                    return False
+                if until is not None and date >= until:
+                    return False
+            return True
+
+        if start is None and end is None:
+            parts = [(self._editor(name), None) for name in self._text_parts()]
+        else:
+            paragraphs = list(self._document.find_all("w:p"))
+            try:
+                first = 0 if start is None else paragraphs.index(start)
+                last = len(paragraphs) - 1 if end is None else paragraphs.index(end)
+            except ValueError:
+                raise ValueError("start and end must be w:p elements of document.xml")
+            parts = [(self._document, paragraphs[first : last + 1])]
+
+        count = 0
+        with self._transaction():
+            for editor, containers in parts:
+                changes = editor._tracked_changes(
+                    lambda elem: match(editor, elem), containers
+                )
+                for elem in changes:
+                    if editor.tag_name(elem) == "w:ins":
+                        getattr(editor, on_insertion)(elem)
+                    else:
+                        getattr(editor, on_deletion)(elem)
+                    count += 1
+        return count
 
     def __del__(self):
         """Clean up temporary directory on deletion."""
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
 
+    @property
+    def original_docx(self):
+        """
+        The original document packed as .docx, the baseline for validation.
+
+        Only XML parts are packed, as nothing else is validated. Packages are
+        cached by content hash in a private directory of the user, so reopening
+        an unchanged document reuses the package of an earlier session. Without
+        a usable cache directory, the package is made for this session only.
+        """
+        if self._original_docx is None:
+            original_docx = Path(self.temp_dir) / "original.docx"
+            try:
+                _link_file(_pack_baseline(self._baseline_path), original_docx)
+            except OSError as e:
+                print(f"Warning: Not caching the validation baseline: {e}")
+                pack_document(self._baseline_path, original_docx, validate=False)
+            _check_baseline(original_docx, self.original_path)
+            self._original_docx = original_docx
+        return self._original_docx
+
     def validate(self) -> None:
         """
         Validate the document against XSD schema and redlining rules.
@@ -842,9 +1674,13 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
-        # Create validators with current state
+        if self._package:
+            self._extract()
+
+        # Create validators with current state. Validation is incremental, so
+        # repeated calls only re-check the parts changed since the last one.
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            self.unpacked_path, self.original_docx, verbose=False, incremental=True
         )
         redlining_validator = RedliningValidator(
             self.unpacked_path, self.original_docx, verbose=False
@@ -861,9 +1697,17 @@ class Document:
         Save all modified XML files to disk and copy to destination directory.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        Only parts that may have changed are serialized: those changed by the
+        editors' methods, and every part whose editor was got with doc[...],
+        since its nodes may have been edited directly. Only files that differ
+        from the destination are copied, each replacing its old version atomically.
+
+        A document opened from a .docx is saved as a .docx, written to a
+        temporary file and renamed over the destination.
 
         Args:
-            destination: Optional path to save to. If None, saves back to original directory.
+            destination: Optional path to save to. If None, saves back to original directory
+                (or .docx).
             validate: If True, validates document before saving (default: True).
         """
         # Only ensure comment relationships and content types if comment files exist
@@ -872,8 +1716,9 @@ class Document:
             self._ensure_comment_content_types()
 
         # Save all modified XML files in temp directory
-        for editor in self._editors.values():
-            editor.save()
+        for xml_path, editor in self._editors.items():
+            if editor.modified or xml_path in self._handed_out:
+                editor.save()
 
         # Validate by default
         if validate:
@@ -881,43 +1726,57 @@ class Document:
 
         # Copy contents from temp directory to destination (or original directory)
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        if self._package:
+            _write_package(
+                self._package, self.unpacked_path, self._extracted, target_path
+            )
+        else:
+            _copy_changed_files(self.unpacked_path, target_path)
 
     # ==================== Private: Initialization ====================
 
-    def _get_next_comment_id(self):
-        """Get the next available comment ID."""
-        if not self.comments_path.exists():
-            return 0
+    def _text_parts(self):
+        """Parts with tracked text: the body, then headers, footers and notes."""
+        names = ["word/document.xml"]
+        for pattern in ("header*.xml", "footer*.xml", "footnotes.xml", "endnotes.xml"):
+            names.extend(
+                f"word/{path.name}" for path in sorted(self.word_path.glob(pattern))
+            )
+        return names
 
-        editor = self["word/comments.xml"]
-        max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
-            if comment_id:
-                try:
-                    max_id = max(max_id, int(comment_id))
-                except ValueError:
-                    pass
-        return max_id + 1
+    def _extract(self, suffixes=None):
+        """Extract the members of the package not extracted yet.
+
+        Args:
+            suffixes: Only extract members whose names end with one of these
+        """
+        with zipfile.ZipFile(self._package) as package:
+            for info in package.infolist():
+                name = info.filename
+                if info.is_dir() or name in self._extracted:
+                    continue
+                if suffixes is not None and not name.endswith(suffixes):
+                    continue
+                path = Path(package.extract(info, self.unpacked_path))
+                self._extracted[name] = _file_state(path)
 
     def _load_existing_comments(self):
         """Load existing comments from files to enable replies."""
         if not self.comments_path.exists():
             return {}
 
-        editor = self["word/comments.xml"]
+        editor = self._editor("word/comments.xml")
         existing = {}
 
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
+        for comment_elem in editor.find_all("w:comment"):
+            comment_id = editor.get_attribute(comment_elem, "w:id")
             if not comment_id:
                 continue
 
             # Find para_id from the w:p element within the comment
             para_id = None
-            for p_elem in comment_elem.getElementsByTagName("w:p"):
-                para_id = p_elem.getAttribute("w14:paraId")
+            for p_elem in editor.find_all("w:p", comment_elem):
+                para_id = editor.get_attribute(p_elem, "w14:paraId")
                 if para_id:
                     break
 
@@ -959,25 +1818,25 @@ class Document:
 
     def _add_content_type_for_people(self, path):
         """Add people.xml content type to [Content_Types].xml if not already present."""
-        editor = self["[Content_Types].xml"]
+        editor = self._editor("[Content_Types].xml")
 
         if self._has_override(editor, "/word/people.xml"):
             return
 
         # Add Override element
-        root = editor.dom.documentElement
+        root = editor.root
         override_xml = '<Override PartName="/word/people.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.people+xml"/>'
         editor.append_to(root, override_xml)
 
     def _add_relationship_for_people(self, path):
         """Add people.xml relationship to document.xml.rels if not already present."""
-        editor = self["word/_rels/document.xml.rels"]
+        editor = self._editor("word/_rels/document.xml.rels")
 
         if self._has_relationship(editor, "people.xml"):
             return
 
-        root = editor.dom.documentElement
-        root_tag = root.tagName  # type: ignore
+        root = editor.root
+        root_tag = editor.tag_name(root)
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid = editor.get_next_rid()
 
@@ -996,15 +1855,16 @@ class Document:
         - trackRevisions: early (before defaultTabStop)
         - rsids: late (after compat)
         """
-        editor = self["word/settings.xml"]
+        editor = self._editor("word/settings.xml")
         root = editor.get_node(tag="w:settings")
-        prefix = root.tagName.split(":")[0] if ":" in root.tagName else "w"
+        root_tag = editor.tag_name(root)
+        prefix = root_tag.split(":")[0] if ":" in root_tag else "w"
 
         # Conditionally add trackRevisions if requested
         if track_revisions:
             track_revisions_exists = any(
-                elem.tagName == f"{prefix}:trackRevisions"
-                for elem in editor.dom.getElementsByTagName(f"{prefix}:trackRevisions")
+                editor.tag_name(elem) == f"{prefix}:trackRevisions"
+                for elem in editor.find_all(f"{prefix}:trackRevisions")
             )
 
             if not track_revisions_exists:
@@ -1012,20 +1872,21 @@ class Document:
                 # Try to insert before documentProtection, defaultTabStop, or at start
                 inserted = False
                 for tag in [f"{prefix}:documentProtection", f"{prefix}:defaultTabStop"]:
-                    elements = editor.dom.getElementsByTagName(tag)
+                    elements = editor.find_all(tag)
                     if elements:
                         editor.insert_before(elements[0], track_rev_xml)
                         inserted = True
                         break
                 if not inserted:
                     # Insert as first child of settings
-                    if root.firstChild:
-                        editor.insert_before(root.firstChild, track_rev_xml)
+                    first_child = editor.first_child(root)
+                    if first_child is not None:
+                        editor.insert_before(first_child, track_rev_xml)
                     else:
                         editor.append_to(root, track_rev_xml)
 
         # Always check if rsids section exists
-        rsids_elements = editor.dom.getElementsByTagName(f"{prefix}:rsids")
+        rsids_elements = editor.find_all(f"{prefix}:rsids")
 
         if not rsids_elements:
             # Add new rsids section
@@ -1036,15 +1897,13 @@ class Document:
 
             # Try to insert after compat, before clrSchemeMapping, or before closing tag
             inserted = False
-            compat_elements = editor.dom.getElementsByTagName(f"{prefix}:compat")
+            compat_elements = editor.find_all(f"{prefix}:compat")
             if compat_elements:
                 editor.insert_after(compat_elements[0], rsids_xml)
                 inserted = True
 
             if not inserted:
-                clr_elements = editor.dom.getElementsByTagName(
-                    f"{prefix}:clrSchemeMapping"
-                )
+                clr_elements = editor.find_all(f"{prefix}:clrSchemeMapping")
                 if clr_elements:
                     editor.insert_before(clr_elements[0], rsids_xml)
                     inserted = True
@@ -1055,77 +1914,194 @@ class Document:
             # Check if this rsid already exists
             rsids_elem = rsids_elements[0]
             rsid_exists = any(
-                elem.getAttribute(f"{prefix}:val") == self.rsid
-                for elem in rsids_elem.getElementsByTagName(f"{prefix}:rsid")
+                editor.get_attribute(elem, f"{prefix}:val") == self.rsid
+                for elem in editor.find_all(f"{prefix}:rsid", rsids_elem)
             )
 
             if not rsid_exists:
                 rsid_xml = f'<{prefix}:rsid {prefix}:val="{self.rsid}"/>'
                 editor.append_to(rsids_elem, rsid_xml)
 
+    # ==================== Private: Comments ====================
+
+    def _comment_anchor(self, record, keys):
+        """Look up where an add_comments record goes: (start, end) or (None, parent)."""
+        if "text" not in record:
+            raise ValueError("text is required")
+        if not isinstance(record["text"], str):
+            raise ValueError(f"text must be a string, not {record['text']!r}")
+        parent = record.get("parent")
+        if parent is not None:
+            if isinstance(parent, (str, int)) and parent in keys:
+                return None, ("record", keys[parent])
+            if parent in self.existing_comments:
+                return None, ("comment", parent)
+            raise ValueError(f"Parent comment {parent!r} not found")
+
+        if record.get("start") is None:
+            raise ValueError("start is required (or parent, for a reply)")
+        start = record["start"]
+        end = record["end"] if record.get("end") is not None else start
+        return self._document_node(start), self._document_node(end)
+
+    def _document_node(self, target):
+        """Return an element of document.xml, or look it up by get_node arguments."""
+        if not isinstance(target, dict):
+            try:
+                is_element = self._document.is_element(target)
+            except AttributeError:  # Not a node of either backend
+                is_element = False
+            if not is_element:
+                raise ValueError(
+                    f"Expected an element or a dict of get_node arguments, "
+                    f"got {type(target).__name__}"
+                )
+            return target
+        unknown = set(target) - GET_NODE_TYPES.keys()
+        if unknown:
+            raise ValueError(
+                f"Unknown get_node arguments: {', '.join(sorted(unknown))}"
+            )
+        if "tag" not in target:
+            raise ValueError("get_node arguments need a tag")
+        for name, value in target.items():
+            if value is not None and not isinstance(value, GET_NODE_TYPES[name]):
+                raise ValueError(f"Invalid {name}: {value!r}")
+        return self._document.get_node(**target)
+
+    def _new_comment(self, text, author, initials, parent_para_id):
+        """Allocate the IDs of a new comment and register it so replies work."""
+        comment = {
+            "id": self.ids.next_comment_id(),
+            "para_id": self.ids.hex_id(),
+            "durable_id": self.ids.hex_id(),
+            "parent_para_id": parent_para_id,
+            "text": text,
+            "author": author,
+            "initials": initials,
+        }
+        self.existing_comments[comment["id"]] = {"para_id": comment["para_id"]}
+        return comment
+
+    def _anchor_comment(self, comment_id, start, end):
+        """Add the range and reference of a comment to document.xml."""
+        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
+
+        # If end node is a paragraph, append comment markup inside it
+        # Otherwise insert after it (for run-level anchors)
+        if self._document.tag_name(end) == "w:p":
+            self._document.append_to(end, self._comment_range_end_xml(comment_id))
+        else:
+            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
+
+    def _anchor_reply(self, comment_id, parent_comment_id):
+        """Add the range and reference of a reply to document.xml, beside its parent's."""
+        parent_start_elem = self._document.get_node(
+            tag="w:commentRangeStart", attrs={"w:id": str(parent_comment_id)}
+        )
+        parent_ref_elem = self._document.get_node(
+            tag="w:commentReference", attrs={"w:id": str(parent_comment_id)}
+        )
+
+        self._document.insert_after(
+            parent_start_elem, self._comment_range_start_xml(comment_id)
+        )
+        parent_ref_run = self._document.parent(parent_ref_elem)
+        self._document.insert_after(
+            parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'
+        )
+        self._document.insert_after(
+            parent_ref_run, self._comment_ref_run_xml(comment_id)
+        )
+
     # ==================== Private: XML File Creation ====================
 
-    def _add_to_comments_xml(
-        self, comment_id, para_id, text, author, initials, timestamp
-    ):
-        """Add a single comment to comments.xml."""
+    def _add_to_comment_parts(self, comments, timestamp):
+        """Add comments to the four comment parts, with one edit per part."""
+        self._add_to_comments_xml(comments, timestamp)
+        self._add_to_comments_extended_xml(comments)
+        self._add_to_comments_ids_xml(comments)
+        self._add_to_comments_extensible_xml(comments)
+
+    def _add_to_comments_xml(self, comments, timestamp):
+        """Add comments (see _new_comment) to comments.xml."""
         if not self.comments_path.exists():
             shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
 
-        editor = self["word/comments.xml"]
+        editor = self._editor("word/comments.xml")
         root = editor.get_node(tag="w:comments")
 
-        escaped_text = (
-            text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        )
-        # Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p, w:rsidR on w:r,
-        # and w:author, w:date, w:initials on w:comment are automatically added by DocxXMLEditor
-        comment_xml = f'''<w:comment w:id="{comment_id}">
-  <w:p w14:paraId="{para_id}" w14:textId="77777777">
+        # Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p and w:rsidR on w:r
+        # are automatically added by DocxXMLEditor
+        comments_xml = []
+        for comment in comments:
+            escaped_text = (
+                comment["text"]
+                .replace("&", "&amp;")
+                .replace("<", "&lt;")
+                .replace(">", "&gt;")
+            )
+            author = html.escape(comment["author"], quote=True)
+            initials = html.escape(comment["initials"], quote=True)
+            comment_xml = f'''<w:comment w:id="{comment["id"]}" w:author="{author}" w:date="{timestamp}" w:initials="{initials}">
+  <w:p w14:paraId="{comment["para_id"]}" w14:textId="77777777">
     <w:r><w:rPr><w:rStyle w:val="CommentReference"/></w:rPr><w:annotationRef/></w:r>
     <w:r><w:rPr><w:color w:val="000000"/><w:sz w:val="20"/><w:szCs w:val="20"/></w:rPr><w:t>{escaped_text}</w:t></w:r>
   </w:p>
 </w:comment>'''
-        editor.append_to(root, comment_xml)
+            comments_xml.append(comment_xml)
+        editor.append_to(root, "".join(comments_xml))
 
-    def _add_to_comments_extended_xml(self, para_id, parent_para_id):
-        """Add a single comment to commentsExtended.xml."""
+    def _add_to_comments_extended_xml(self, comments):
+        """Add comments to commentsExtended.xml."""
         if not self.comments_extended_path.exists():
             shutil.copy(
                 TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
             )
 
-        editor = self["word/commentsExtended.xml"]
+        editor = self._editor("word/commentsExtended.xml")
         root = editor.get_node(tag="w15:commentsEx")
 
-        if parent_para_id:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
-        else:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
-        editor.append_to(root, xml)
+        xml = []
+        for comment in comments:
+            para_id = comment["para_id"]
+            parent_para_id = comment["parent_para_id"]
+            if parent_para_id:
+                xml.append(
+                    f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
+                )
+            else:
+                xml.append(f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>')
+        editor.append_to(root, "".join(xml))
 
-    def _add_to_comments_ids_xml(self, para_id, durable_id):
-        """Add a single comment to commentsIds.xml."""
+    def _add_to_comments_ids_xml(self, comments):
+        """Add comments to commentsIds.xml."""
         if not self.comments_ids_path.exists():
             shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
 
-        editor = self["word/commentsIds.xml"]
+        editor = self._editor("word/commentsIds.xml")
         root = editor.get_node(tag="w16cid:commentsIds")
 
-        xml = f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
+        xml = "".join(
+            f'<w16cid:commentId w16cid:paraId="{comment["para_id"]}" w16cid:durableId="{comment["durable_id"]}"/>'
+            for comment in comments
+        )
         editor.append_to(root, xml)
 
-    def _add_to_comments_extensible_xml(self, durable_id):
-        """Add a single comment to commentsExtensible.xml."""
+    def _add_to_comments_extensible_xml(self, comments):
+        """Add comments to commentsExtensible.xml."""
         if not self.comments_extensible_path.exists():
             shutil.copy(
                 TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
             )
 
-        editor = self["word/commentsExtensible.xml"]
+        editor = self._editor("word/commentsExtensible.xml")
         root = editor.get_node(tag="w16cex:commentsExtensible")
 
-        xml = f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
+        xml = "".join(
+            f'<w16cex:commentExtensible w16cex:durableId="{comment["durable_id"]}"/>'
+            for comment in comments
+        )
         editor.append_to(root, xml)
 
     # ==================== Private: XML Fragments ====================
@@ -1159,56 +2135,57 @@ class Document:
 
     def _has_relationship(self, editor, target):
         """Check if a relationship with given target exists."""
-        for rel_elem in editor.dom.getElementsByTagName("Relationship"):
-            if rel_elem.getAttribute("Target") == target:
+        for rel_elem in editor.find_all("Relationship"):
+            if editor.get_attribute(rel_elem, "Target") == target:
                 return True
         return False
 
     def _has_override(self, editor, part_name):
         """Check if an override with given part name exists."""
-        for override_elem in editor.dom.getElementsByTagName("Override"):
-            if override_elem.getAttribute("PartName") == part_name:
+        for override_elem in editor.find_all("Override"):
+            if editor.get_attribute(override_elem, "PartName") == part_name:
                 return True
         return False
 
-    def _has_author(self, editor, author):
-        """Check if an author already exists in people.xml."""
-        for person_elem in editor.dom.getElementsByTagName("w15:person"):
-            if person_elem.getAttribute("w15:author") == author:
-                return True
-        return False
-
-    def _add_author_to_people(self, author):
-        """Add author to people.xml (called during initialization)."""
+    def _add_authors_to_people(self, authors):
+        """Add the authors not listed yet to people.xml, in one edit."""
         people_path = self.word_path / "people.xml"
 
         # people.xml should already exist from _setup_tracking
         if not people_path.exists():
             raise ValueError("people.xml should exist after _setup_tracking")
 
-        editor = self["word/people.xml"]
+        editor = self._editor("word/people.xml")
         root = editor.get_node(tag="w15:people")
 
-        # Check if author already exists
-        if self._has_author(editor, author):
-            return
-
-        # Add author with proper XML escaping to prevent injection
-        escaped_author = html.escape(author, quote=True)
-        person_xml = f'''<w15:person w15:author="{escaped_author}">
+        # Skip authors that already exist (and repeats)
+        known = {
+            editor.get_attribute(person_elem, "w15:author")
+            for person_elem in editor.find_all("w15:person")
+        }
+        people_xml = []
+        for author in authors:
+            if author in known:
+                continue
+            known.add(author)
+            # Add author with proper XML escaping to prevent injection
+            escaped_author = html.escape(author, quote=True)
+            person_xml = f'''<w15:person w15:author="{escaped_author}">
   <w15:presenceInfo w15:providerId="None" w15:userId="{escaped_author}"/>
 </w15:person>'''
-        editor.append_to(root, person_xml)
+            people_xml.append(person_xml)
+        if people_xml:
+            editor.append_to(root, "".join(people_xml))
 
     def _ensure_comment_relationships(self):
         """Ensure word/_rels/document.xml.rels has comment relationships."""
-        editor = self["word/_rels/document.xml.rels"]
+        editor = self._editor("word/_rels/document.xml.rels")
 
         if self._has_relationship(editor, "comments.xml"):
             return
 
-        root = editor.dom.documentElement
-        root_tag = root.tagName  # type: ignore
+        root = editor.root
+        root_tag = editor.tag_name(root)
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid_num = int(editor.get_next_rid()[3:])
 
@@ -1242,12 +2219,12 @@ class Document:
 
     def _ensure_comment_content_types(self):
         """Ensure [Content_Types].xml has comment content types."""
-        editor = self["[Content_Types].xml"]
+        editor = self._editor("[Content_Types].xml")
 
         if self._has_override(editor, "/word/comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor.root
 
         # Add Override elements
         overrides = [
@@ -1274,3 +2251,89 @@ class Document:
                 f'<Override PartName="{part_name}" ContentType="{content_type}"/>'
             )
             editor.append_to(root, override_xml)
+
+
+class Batch:
+    """Edits queued by Document.batch(), applied when the with block ends.
+
+    Edits of document parts other than word/document.xml name their part,
+    e.g. batch.append_to(target, xml, part="word/comments.xml").
+
+    Attributes:
+        results: Return values of the edits in queue order (None until applied)
+    """
+
+    def __init__(self, document):
+        self._document = document
+        self._edits = []  # (part, method name, targets, other arguments)
+        self.results = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.apply()
+        return False
+
+    def replace_node(self, target, new_content, part="word/document.xml"):
+        self._queue(part, "replace_node", [target], new_content)
+
+    def insert_after(self, target, xml_content, part="word/document.xml"):
+        self._queue(part, "insert_after", [target], xml_content)
+
+    def insert_before(self, target, xml_content, part="word/document.xml"):
+        self._queue(part, "insert_before", [target], xml_content)
+
+    def append_to(self, target, xml_content, part="word/document.xml"):
+        self._queue(part, "append_to", [target], xml_content)
+
+    def suggest_deletion(self, target, part="word/document.xml"):
+        self._queue(part, "suggest_deletion", [target])
+
+    def revert_insertion(self, target, part="word/document.xml"):
+        self._queue(part, "revert_insertion", [target])
+
+    def revert_deletion(self, target, part="word/document.xml"):
+        self._queue(part, "revert_deletion", [target])
+
+    def add_comment(self, start, end, text: str):
+        self._queue(None, "add_comment", [start, end], text)
+
+    def reply_to_comment(self, parent_comment_id: int, text: str):
+        self._queue(None, "reply_to_comment", [], parent_comment_id, text)
+
+    def reject_changes(self, start=None, end=None, author=None, since=None, until=None):
+        self._queue(None, "reject_changes", [start, end], author, since, until)
+
+    def accept_changes(self, start=None, end=None, author=None, since=None, until=None):
+        self._queue(None, "accept_changes", [start, end], author, since, until)
+
+    def apply(self):
+        """
+        Look up all targets, then apply the queued edits in order.
+
+        Raises:
+            ValueError: If a target is not found (nothing is changed), or whatever
+                        an edit raised (after undoing the edits already applied)
+        """
+        document = self._document
+        calls = []
+        for part, method, targets, args in self._edits:
+            editor = document._document if part is None else document[part]
+            nodes = [
+                editor.get_node(**target) if isinstance(target, dict) else target
+                for target in targets
+            ]
+            owner = document if part is None else editor
+            calls.append((getattr(owner, method), nodes + list(args)))
+        self._edits = []
+
+        results = []
+        with document._transaction():
+            for call, args in calls:
+                results.append(call(*args))
+        self.results = results
+
+    def _queue(self, part, method, targets, *args):
+        self._edits.append((part, method, targets, args))
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Command line tool to apply the same edits to many Word documents, in worker processes.
+
+Usage:
+    PYTHONPATH=<docx skill root> python -m scripts.edit_documents <documents> <edit_script.py>
+        --output-dir DIR [--results results.jsonl] [--jobs N]
+        [--author NAME] [--initials XY] [--backend lxml] [--track-revisions]
+        [--no-validate]
+
+<documents> is a directory, whose .docx files (in subdirectories too) are all
+edited, or a manifest with one document per line: its path, or a JSON object
+with its "path", optionally an "output" path, and parameters for the script:
+
+    contracts/0001.docx
+    {"path": "contracts/0002.docx", "output": "0002-reviewed.docx", "party": "ACME"}
+
+Paths in a manifest are relative to the manifest, outputs to --output-dir.
+By default each document is saved in --output-dir under its name, or under its
+path in the <documents> directory.
+
+The edit script defines edit(doc, params), called with each opened Document
+and the parameters of the document in the manifest ({} for none). What it
+returns is recorded in the results:
+
+    def edit(doc, params):
+        with doc.batch() as batch:
+            batch.suggest_deletion({"tag": "w:r", "contains": "obsolete"})
+        return doc.add_comments([{"start": ..., "text": params["note"]}])
+
+Each worker process imports the script once and keeps its imports and compiled
+XSD schemas warm from one document to the next. A document whose edit,
+validation or save fails, or whose worker process dies, is recorded as failed;
+the other documents carry on. Results are written as documents finish, one
+JSON line each (default: results.jsonl in the output directory):
+
+    {"path": ..., "output": ..., "worker": 4242, "ok": true, "result": [0, 1],
+     "seconds": 0.41, "timings": {"open": 0.05, "edit": 0.12, "save": 0.24}}
+    {"path": ..., "output": ..., "worker": 4243, "ok": false,
+     "error": "Schema validation failed", "traceback": ..., "log": ..., ...}
+
+"log" is what the session printed, e.g. the validation errors. A document
+whose worker died has a null "worker" and "seconds", and empty "timings".
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from scripts.document import Document
+
+# Set in each worker process by _init_worker
+_edit = None
+_options = None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Apply an edit script to many Word documents in parallel"
+    )
+    parser.add_argument(
+        "documents", help="Directory of .docx files, or manifest of documents"
+    )
+    parser.add_argument("script", help="Python file defining edit(doc, params)")
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        required=True,
+        help="Directory to save the edited documents to",
+    )
+    parser.add_argument(
+        "--results",
+        help="JSONL file of per-document results (default: results.jsonl in the "
+        "output directory)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--author",
+        default="Claude",
+        help="Author of tracked changes and comments (default: Claude)",
+    )
+    parser.add_argument(
+        "--initials",
+        default="C",
+        help="Initials of that author (default: C)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["minidom", "lxml"],
+        default="lxml",
+        help="XMLEditor backend (default: lxml, which is faster on large documents)",
+    )
+    parser.add_argument(
+        "--track-revisions",
+        action="store_true",
+        help="Enable track revisions in the settings of each document",
+    )
+    parser.add_argument(
+        "--no-validate",
+        action="store_true",
+        help="Save without validating the documents",
+    )
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    results_path = Path(args.results) if args.results else output_dir / "results.jsonl"
+    options = {
+        "author": args.author,
+        "initials": args.initials,
+        "backend": args.backend,
+        "track_revisions": args.track_revisions,
+        "validate": not args.no_validate,
+    }
+    try:
+        tasks = find_documents(args.documents, output_dir)
+        load_edit_function(args.script)  # Fail now rather than in every worker
+        output_dir.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        with open(results_path, "w", encoding="utf-8") as results:
+            counts = run_batch(tasks, args.script, results, args.jobs, **options)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Edited {counts['ok']} of {len(tasks)} documents in {elapsed:.1f}s "
+        f"({counts['failed']} failed), results in {results_path}"
+    )
+    if counts["failed"]:
+        sys.exit(1)
+
+
+def find_documents(source, output_dir):
+    """
+    List the documents to edit and where to save them.
+
+    Args:
+        source: Directory of .docx files, or manifest of documents
+        output_dir: Directory the edited documents are saved to
+
+    Returns:
+        list: One task dict per document (path, output, params)
+
+    Raises:
+        ValueError: If there are no documents, or two would be saved to one file
+    """
+    source = Path(source)
+    output_dir = Path(output_dir)
+    if source.is_dir():
+        entries = []
+        for path in sorted(source.rglob("*.docx")):
+            # Skip Word's lock files, hidden files and directories (e.g. left
+            # behind by other tools), and the outputs of an earlier run
+            parts = path.relative_to(source).parts
+            if (
+                path.name.startswith("~$")
+                or any(part.startswith(".") for part in parts)
+                or output_dir.resolve() in path.resolve().parents
+            ):
+                continue
+            entries.append((path, path.relative_to(source), {}))
+    else:
+        entries = _read_manifest(source)
+
+    tasks = [
+        {"path": str(path), "output": str(output_dir / output), "params": params}
+        for path, output, params in entries
+    ]
+    if not tasks:
+        raise ValueError(f"No documents found in {source}")
+
+    outputs = Counter(task["output"] for task in tasks)
+    for output, count in outputs.items():
+        if count > 1:
+            raise ValueError(f"{count} documents would be saved to {output}")
+    return tasks
+
+
+def _read_manifest(path):
+    """Read the (path, output, params) of each document of a manifest."""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if not line.startswith("{"):
+                entry = {"path": line}
+            else:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}, line {line_number}: {e}") from None
+                if "path" not in entry:
+                    raise ValueError(f"{path}, line {line_number}: no path")
+            document = Path(path).parent / entry.pop("path")
+            output = entry.pop("output", document.name)
+            entries.append((document, output, entry))
+    return entries
+
+
+def load_edit_function(script):
+    """
+    Import an edit script and return its edit function.
+
+    Raises:
+        ValueError: If the script cannot be imported or defines no edit function
+    """
+    spec = importlib.util.spec_from_file_location("edit_script", script)
+    if spec is None:
+        raise ValueError(f"Not a Python file: {script}")
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except Exception as e:
+        raise ValueError(f"Cannot import {script}: {e!r}") from e
+    edit = getattr(module, "edit", None)
+    if not callable(edit):
+        raise ValueError(f"{script} defines no edit(doc, params) function")
+    return edit
+
+
+def run_batch(tasks, script, results, jobs, **options):
+    """
+    Edit documents in worker processes, writing each one's result as it finishes.
+
+    Args:
+        tasks: Documents to edit, as returned by find_documents
+        script: Path to the edit script
+        results: Text file to write the JSON result lines to
+        jobs: Number of worker processes
+        **options: Document options (author, initials, backend,
+            track_revisions) and validate, for Document.save
+
+    Returns:
+        Counter: Number of "ok" and of "failed" documents
+    """
+    counts = Counter()
+    pending = deque(tasks)
+    suspects = deque()  # Documents in flight when a worker died
+    while pending or suspects:
+        # Sessions keep their temporary directories in one directory per
+        # pool, removed with the pool, so workers that die leave nothing behind
+        temp_dir = tempfile.mkdtemp(prefix="edit_documents_")
+        try:
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_worker,
+                initargs=(script, options, temp_dir),
+            ) as pool:
+                lost = _run_pool(pool, jobs, pending, suspects, results, counts)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        if len(lost) > 1:
+            suspects.extend(lost)
+            continue
+        for task in lost:
+            record = {
+                "path": task["path"],
+                "output": task["output"],
+                "worker": None,
+                "ok": False,
+                "error": "Worker process died while editing the document",
+                "seconds": None,
+                "timings": {},
+            }
+            _write_result(results, record, counts)
+    return counts
+
+
+def _run_pool(pool, jobs, pending, suspects, results, counts):
+    """Edit documents in a pool until all are done or a worker dies.
+
+    Returns:
+        list: Tasks that were in flight when a worker died (empty if none did)
+    """
+    running = {}  # Future -> task
+    alone = False  # Whether a suspect is running by itself
+    try:
+        while pending or suspects or running:
+            # Suspects run one at a time, so that a worker dying again is
+            # down to the one document it was editing
+            if suspects and not running:
+                task = suspects.popleft()
+                running[pool.submit(_edit_document, task)] = task
+                alone = True
+            # Submit no more than the workers can run, so that a dying
+            # worker takes as few documents down with it
+            while pending and not alone and len(running) < jobs:
+                task = pending.popleft()
+                running[pool.submit(_edit_document, task)] = task
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                _write_result(results, future.result(), counts)
+                del running[future]
+            alone = alone and bool(running)
+    except BrokenProcessPool:
+        lost = []
+        for future, task in running.items():
+            if future.done() and future.exception() is None:
+                _write_result(results, future.result(), counts)
+            else:
+                lost.append(task)
+        return lost
+    return []
+
+
+def _write_result(results, record, counts):
+    results.write(json.dumps(record) + "\n")
+    results.flush()
+    if record["ok"]:
+        counts["ok"] += 1
+    else:
+        counts["failed"] += 1
+        print(f"Failed: {record['path']}: {record['error']}")
+
+
+def _init_worker(script, options, temp_dir):
+    """Load the edit script once per worker process, and keep sessions in temp_dir."""
+    global _edit, _options
+    tempfile.tempdir = temp_dir
+    _edit = load_edit_function(script)
+    _options = options
+
+
+def _edit_document(task):
+    """Worker task: open, edit and save one document, returning its result record.
+
+    Any error is recorded rather than raised, so it only fails this document.
+    """
+    options = dict(_options)
+    validate = options.pop("validate")
+    record = {"path": task["path"], "output": task["output"], "worker": os.getpid()}
+    timings = {}
+    start = lap = time.perf_counter()
+
+    def timed(phase):
+        nonlocal lap
+        now = time.perf_counter()
+        timings[phase] = round(now - lap, 3)
+        lap = now
+
+    log = io.StringIO()
+    doc = None
+    try:
+        with contextlib.redirect_stdout(log):
+            doc = Document(task["path"], **options)
+            timed("open")
+            result = _edit(doc, task["params"])
+            timed("edit")
+            Path(task["output"]).parent.mkdir(parents=True, exist_ok=True)
+            doc.save(task["output"], validate=validate)
+            timed("save")
+        # Results go through JSON; anything else is recorded as its str()
+        record.update(ok=True, result=json.loads(json.dumps(result, default=str)))
+    except Exception as e:
+        record.update(
+            ok=False,
+            error=str(e) or type(e).__name__,
+            traceback=traceback.format_exc(),
+            log=log.getvalue(),
+        )
+    finally:
+        doc = None  # Removes the session's temporary directory
+
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    record["timings"] = timings
+    return record
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,16 @@ This module provides XMLEditor, a tool for manipulating XML files with support f
 line-number-based node finding and DOM manipulation. Each element is automatically
 annotated with its original line and column position during parsing.
 
+Two backends are available. "minidom" (the default) parses with defusedxml.minidom;
+"lxml" parses with lxml, which is much faster and uses far less memory on large
+files, and reports source lines natively. Nodes returned by the editor belong to
+the selected backend, so code that should work with both uses the editor's node
+helpers (find_all, tag_name, get_attribute, ...) instead of the DOM API.
+
 Example usage:
     editor = XMLEditor("document.xml")
+    editor = XMLEditor("document.xml", backend="lxml")
+    editor = XMLEditor("document.xml", cache_dir="~/.cache/docx-dom")  # Reuse parses
 
     # Find node by line number or range
     elem = editor.get_node(tag="w:r", line_number=519)
@@ -30,12 +38,45 @@ Example usage:
     editor.save()
 """
 
+import bisect
+import contextlib
+import copy
+import gc
+import hashlib
 import html
+import io
+import marshal
+import os
+import re
+import shutil
+import stat
+import sys
+import tempfile
 from pathlib import Path
 from typing import Optional, Union
+from xml.dom import minidom
+from xml.dom.minicompat import NodeList
 
 import defusedxml.minidom
 import defusedxml.sax
+import lxml.etree
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+# libxml2 stores at most this as an element's line number
+_MAX_LXML_LINE = 65535
+
+# Bump when the records stored in the DOM cache change
+DOM_CACHE_VERSION = 1
+DOM_CACHE_MAX_BYTES = 1 << 30  # Least recently used trees beyond this are removed
+
+SAVE_BUFFER_SIZE = 1 << 20  # Bytes XMLEditor.save buffers before writing to disk
+
+# Comments, CDATA sections, processing instructions and DOCTYPEs are matched
+# whole so that a lone "<" match is always the start of an element
+_START_TAG_PATTERN = re.compile(
+    rb"<!--.*?-->|<!\[CDATA\[.*?\]\]>|<\?.*?\?>|<!DOCTYPE[^>]*>|<(?=[^/!?])", re.DOTALL
+)
 
 
 class XMLEditor:
@@ -49,29 +90,47 @@ class XMLEditor:
     Attributes:
         xml_path: Path to the XML file being edited
         encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
-        dom: Parsed DOM tree with parse_position attributes on elements
+        backend: Name of the parsing backend ('minidom' or 'lxml')
+        dom: Parsed document - a defusedxml.minidom.Document with parse_position
+             attributes on elements, or an lxml ElementTree for the lxml backend
+        modified: True if the editor's methods changed the DOM since it was
+                  loaded or last saved
     """
 
-    def __init__(self, xml_path):
+    def __init__(self, xml_path, backend="minidom", cache_dir=None):
         """
         Initialize with path to XML file and parse with line number tracking.
 
         Args:
             xml_path: Path to XML file to edit (str or Path)
+            backend: "minidom" (default) or "lxml"
+            cache_dir: Optional directory of parsed trees to reuse across runs,
+                keyed by file content. Only the minidom backend uses it; lxml
+                parses faster than a cached tree loads.
 
         Raises:
-            ValueError: If the XML file does not exist
+            ValueError: If the XML file does not exist or the backend is unknown
         """
         self.xml_path = Path(xml_path)
         if not self.xml_path.exists():
             raise ValueError(f"XML file not found: {xml_path}")
+        if backend not in _BACKENDS:
+            raise ValueError(
+                f"Unknown XMLEditor backend: {backend} "
+                f"(expected one of {', '.join(_BACKENDS)})"
+            )
 
         with open(self.xml_path, "rb") as f:
             header = f.read(200).decode("utf-8", errors="ignore")
         self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
 
-        parser = _create_line_tracking_parser()
-        self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+        self.backend = backend
+        self._backend = _BACKENDS[backend](self.xml_path, cache_dir)
+        self.dom = self._backend.dom
+        self._index = None  # _NodeIndex, built by the first get_node
+        self.modified = False
+        self._journal = None  # node -> state before the transaction, if one is open
+        self._modified_before = False  # modified when the transaction began
 
     def get_node(
         self,
@@ -86,6 +145,12 @@ class XMLEditor:
         Finds an element by either its line number in the original file or by
         matching attribute values. Exactly one match must be found.
 
+        Lookups by tag, attribute value and line use indexes that are built on
+        the first call, and the text of elements searched with contains is
+        cached. Both are kept up to date by the editor's own edit methods, so
+        repeated lookups do not rescan the document. After changing the DOM
+        directly, call invalidate_indexes().
+
         Args:
             tag: The XML tag name (e.g., "w:del", "w:ins", "w:r")
             attrs: Dictionary of attribute name-value pairs to match (e.g., {"w:id": "1"})
@@ -94,7 +159,7 @@ class XMLEditor:
                       Supports both entity notation (&#8220;) and Unicode characters (\u201c).
 
         Returns:
-            defusedxml.minidom.Element: The matching DOM element
+            The matching element (a minidom Element or lxml element, per backend)
 
         Raises:
             ValueError: If node not found or multiple matches found
@@ -109,40 +174,27 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
-        matches = []
-        for elem in self.dom.getElementsByTagName(tag):
-            # Check line_number filter
-            if line_number is not None:
-                parse_pos = getattr(elem, "parse_position", (None,))
-                elem_line = parse_pos[0]
-
-                # Handle both single line number and range
-                if isinstance(line_number, range):
-                    if elem_line not in line_number:
-                        continue
-                else:
-                    if elem_line != line_number:
-                        continue
-
-            # Check attrs filter
-            if attrs is not None:
-                if not all(
-                    elem.getAttribute(attr_name) == attr_value
-                    for attr_name, attr_value in attrs.items()
-                ):
-                    continue
-
-            # Check contains filter
-            if contains is not None:
-                elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
-                if normalized_contains not in elem_text:
-                    continue
-
-            # If all applicable filters passed, this is a match
-            matches.append(elem)
+        index = self._node_index()
+        matches = self._filter_nodes(
+            index.candidates(tag, attrs, line_number, contains),
+            attrs,
+            line_number,
+            contains,
+            index.text,
+        )
+        # Elements changed or removed directly may still be indexed as they were
+        matches = [
+            elem
+            for elem in self._filter_nodes(matches, None, None, contains)
+            if self._is_attached(elem)
+        ]
+        if not matches:
+            # Elements added to the tree directly are not indexed yet
+            matches = self._filter_nodes(
+                self.find_all(tag), attrs, line_number, contains
+            )
+            if matches:
+                self._index = None
 
         if not matches:
             # Build descriptive error message
@@ -180,118 +232,160 @@ class XMLEditor:
             )
         return matches[0]
 
-    def _get_element_text(self, elem):
+    def _filter_nodes(self, elems, attrs, line_number, contains, get_text=None):
+        """Return the elements that pass the get_node filters."""
+        get_text = get_text or self.get_text
+        if contains is not None:
+            # Normalize the search string: convert HTML entities to Unicode characters
+            # This allows searching for both "&#8220;Rowan" and ""Rowan"
+            normalized_contains = html.unescape(contains)
+        matches = []
+        for elem in elems:
+            # Check line_number filter
+            if line_number is not None:
+                elem_line = self.get_line(elem)
+
+                # Handle both single line number and range
+                if isinstance(line_number, range):
+                    if elem_line not in line_number:
+                        continue
+                else:
+                    if elem_line != line_number:
+                        continue
+
+            # Check attrs filter
+            if attrs is not None:
+                if not all(
+                    self.get_attribute(elem, attr_name) == attr_value
+                    for attr_name, attr_value in attrs.items()
+                ):
+                    continue
+
+            # Check contains filter
+            if contains is not None:
+                elem_text = get_text(elem)
+                if normalized_contains not in elem_text:
+                    continue
+
+            # If all applicable filters passed, this is a match
+            matches.append(elem)
+        return matches
+
+    def _is_attached(self, elem):
+        """Return True if an element is still part of the document."""
+        root = self.root
+        while elem is not None and elem is not root:
+            elem = self.parent(elem)
+        return elem is root
+
+    def invalidate_indexes(self):
         """
-        Recursively extract all text content from an element.
+        Drop the get_node indexes and cached texts, e.g. after editing the DOM directly.
 
-        Skips text nodes that contain only whitespace (spaces, tabs, newlines),
-        which typically represent XML formatting rather than document content.
+        The editor is marked modified too, since its own methods did not see the edits.
+        """
+        self._index = None
+        self.modified = True
 
-        Args:
-            elem: defusedxml.minidom.Element to extract text from
+    def _node_index(self):
+        if self._index is None:
+            self._index = _NodeIndex(self)
+        return self._index
 
-        Returns:
-            str: Concatenated text from all non-whitespace text nodes within the element
+    def _cached(self, elem, key, compute):
         """
-        text_parts = []
-        for node in elem.childNodes:
-            if node.nodeType == node.TEXT_NODE:
-                # Skip whitespace-only text nodes (XML formatting)
-                if node.data.strip():
-                    text_parts.append(node.data)
-            elif node.nodeType == node.ELEMENT_NODE:
-                text_parts.append(self._get_element_text(node))
-        return "".join(text_parts)
+        Return compute(elem), cached until the element's subtree is edited.
+
+        Args:
+            elem: Element the value is derived from
+            key: Name of the value, so one element can cache several
+            compute: Callable taking elem; must only read elem and its descendants
+        """
+        return self._node_index().derived(elem, key, compute)
+
+    def _in_document_order(self, elems):
+        """Sort attached elements of one tag into document order."""
+        if len(elems) < 2 or self._node_index().in_document_order:
+            return elems  # The index lists them in document order
+        position = {
+            elem: i for i, elem in enumerate(self.find_all(self.tag_name(elems[0])))
+        }
+        return sorted(elems, key=position.__getitem__)
 
     def replace_node(self, elem, new_content):
         """
         Replace a DOM element with new XML content.
 
         Args:
-            elem: defusedxml.minidom.Element to replace
+            elem: Element to replace
             new_content: String containing XML to replace the node with
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            list: All inserted nodes
 
         Example:
             new_nodes = editor.replace_node(old_elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        nodes = self._parse_fragment(new_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
-        parent.removeChild(elem)
-        return nodes
+        self._record(self.parent(elem))
+        self._unindex(elem)
+        return self._indexed(self._backend.replace_node(elem, new_content))
 
     def insert_after(self, elem, xml_content):
         """
         Insert XML content after a DOM element.
 
         Args:
-            elem: defusedxml.minidom.Element to insert after
+            elem: Element to insert after
             xml_content: String containing XML to insert
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            list: All inserted nodes
 
         Example:
             new_nodes = editor.insert_after(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        next_sibling = elem.nextSibling
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            if next_sibling:
-                parent.insertBefore(node, next_sibling)
-            else:
-                parent.appendChild(node)
-        return nodes
+        self._record(self.parent(elem))
+        return self._indexed(self._backend.insert_after(elem, xml_content))
 
     def insert_before(self, elem, xml_content):
         """
         Insert XML content before a DOM element.
 
         Args:
-            elem: defusedxml.minidom.Element to insert before
+            elem: Element to insert before
             xml_content: String containing XML to insert
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            list: All inserted nodes
 
         Example:
             new_nodes = editor.insert_before(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
-        return nodes
+        self._record(self.parent(elem))
+        return self._indexed(self._backend.insert_before(elem, xml_content))
 
     def append_to(self, elem, xml_content):
         """
         Append XML content as a child of a DOM element.
 
         Args:
-            elem: defusedxml.minidom.Element to append to
+            elem: Element to append to
             xml_content: String containing XML to append
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            list: All inserted nodes
 
         Example:
             new_nodes = editor.append_to(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            elem.appendChild(node)
-        return nodes
+        self._record(elem)
+        return self._indexed(self._backend.append_to(elem, xml_content))
 
     def get_next_rid(self):
         """Get the next available rId for relationships files."""
         max_id = 0
-        for rel_elem in self.dom.getElementsByTagName("Relationship"):
-            rel_id = rel_elem.getAttribute("Id")
+        for rel_elem in self.find_all("Relationship"):
+            rel_id = self.get_attribute(rel_elem, "Id")
             if rel_id.startswith("rId"):
                 try:
                     max_id = max(max_id, int(rel_id[3:]))
@@ -299,15 +393,686 @@ class XMLEditor:
                     pass
         return f"rId{max_id + 1}"
 
+    def begin_transaction(self):
+        """
+        Start recording changes so that rollback() can undo them.
+
+        Only changes made through the editor's methods are recorded. Rolling back
+        puts the original nodes back in place, so references to them stay valid.
+        Namespace declarations added by ensure_namespace may be kept.
+        """
+        self._journal = {}
+        self._modified_before = self.modified
+
+    def commit(self):
+        """Keep the changes made since begin_transaction() and stop recording."""
+        self._journal = None
+
+    def rollback(self):
+        """
+        Undo every change made since begin_transaction().
+
+        Raises:
+            ValueError: If no transaction is open
+        """
+        if self._journal is None:
+            raise ValueError("No transaction to roll back")
+        for node, state in self._journal.items():
+            self._backend.restore_state(node, state)
+        self._journal = None
+        self._index = None
+        self.modified = self._modified_before
+
+    def _record(self, *nodes):
+        """Mark the editor modified and save the state of nodes about to change."""
+        self.modified = True
+        if self._journal is not None:
+            for node in nodes:
+                if node is not None and node not in self._journal:
+                    self._journal[node] = self._backend.save_state(node)
+
     def save(self):
         """
         Save the edited XML back to the file.
 
         Serializes the DOM tree and writes it back to the original file path,
-        preserving the original encoding (ascii or utf-8).
+        preserving the original encoding (ascii or utf-8). The tree is written
+        as it is serialized, through a fixed-size buffer, to a temporary file
+        that is then renamed over the old one. So the whole document is never
+        held in memory as text, an interrupted save leaves the old file intact,
+        and the old file is never written into (it may be a hard link to the
+        unedited document).
+        """
+        fd, temp_name = tempfile.mkstemp(
+            dir=self.xml_path.parent, prefix=f".{self.xml_path.name}."
+        )
+        try:
+            with os.fdopen(fd, "wb", buffering=SAVE_BUFFER_SIZE) as f:
+                self._backend.write(f, self.encoding)
+            if self.xml_path.exists():
+                shutil.copymode(self.xml_path, temp_name)
+            os.replace(temp_name, self.xml_path)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+        self.modified = False
+
+    # ==================== Node helpers (work with either backend) ====================
+
+    @property
+    def root(self):
+        """The document (root) element."""
+        return self._backend.root
+
+    def find_all(self, tag, within=None):
+        """
+        Return all elements with a tag name, in document order.
+
+        Args:
+            tag: Qualified tag name (e.g., "w:p", or "Relationship" in .rels files)
+            within: Only search the descendants of this element (default: whole document)
+
+        Returns:
+            list: Matching elements
+        """
+        return self._backend.find_all(tag, within)
+
+    def is_element(self, node):
+        """Return True if node is an element (not text, a comment, etc.)."""
+        return self._backend.is_element(node)
+
+    def tag_name(self, node):
+        """Return the qualified tag name of a node, e.g. "w:p"."""
+        return self._backend.tag_name(node)
+
+    def get_line(self, elem):
+        """Return the line an element started on in the original file, or None."""
+        return self._backend.get_line(elem)
+
+    def get_text(self, elem):
+        """
+        Extract all text content from an element.
+
+        Skips text nodes that contain only whitespace (spaces, tabs, newlines),
+        which typically represent XML formatting rather than document content.
+
+        Returns:
+            str: Concatenated text from all non-whitespace text nodes within the element
+        """
+        return self._backend.get_text(elem)
+
+    def get_attribute(self, elem, name):
+        """Return the value of a qualified attribute (e.g. "w:id"), or "" if unset."""
+        return self._backend.get_attribute(elem, name)
+
+    def has_attribute(self, elem, name):
+        """Return True if the element has a qualified attribute (e.g. "w:id")."""
+        return self._backend.has_attribute(elem, name)
+
+    def set_attribute(self, elem, name, value):
+        """Set a qualified attribute (e.g. "w:id"); its prefix must be declared."""
+        self._record(elem)
+        if self._index is not None:
+            self._index.set_attribute(elem, name, value)
+        self._backend.set_attribute(elem, name, value)
+
+    def remove_attribute(self, elem, name):
+        """Remove a qualified attribute (e.g. "w:id")."""
+        self._record(elem)
+        if self._index is not None:
+            self._index.set_attribute(elem, name, "")
+        self._backend.remove_attribute(elem, name)
+
+    def ensure_namespace(self, prefix, uri):
+        """Declare a namespace prefix on the root element if it is not declared."""
+        if not self._backend.has_namespace(prefix):
+            self._record(self.root)
+            self._backend.ensure_namespace(prefix, uri)
+
+    def parent(self, node):
+        """Return the parent element of a node (None for the root element)."""
+        return self._backend.parent(node)
+
+    def first_child(self, node):
+        """Return the first child of a node, or None."""
+        return self._backend.first_child(node)
+
+    def child_nodes(self, node):
+        """Return a list of the children of a node."""
+        return self._backend.child_nodes(node)
+
+    def leading_text(self, elem):
+        """Return the text before an element's first child element, or None."""
+        return self._backend.leading_text(elem)
+
+    def own_text(self, elem):
+        """Return the text directly inside an element (not in its child elements).
+
+        Unlike get_text, whitespace-only text is kept, e.g. the space in
+        <w:t xml:space="preserve"> </w:t>.
+        """
+        return self._backend.own_text(elem)
+
+    def create_element(self, tag):
+        """Create a new, detached element with a qualified tag name."""
+        return self._backend.create_element(tag)
+
+    def clone(self, elem):
+        """Return a detached deep copy of an element."""
+        return self._backend.clone(elem)
+
+    def rename(self, elem, tag):
+        """
+        Change the tag of an element, keeping its attributes and children.
+
+        Returns:
+            The renamed element (with minidom, a new element replacing elem)
+        """
+        self._record(self.parent(elem), elem)
+        self._unindex(elem)
+        elem = self._backend.rename(elem, tag)
+        self._indexed([elem])
+        return elem
+
+    def append_node(self, parent, node):
+        """Move a node to the end of parent's children."""
+        self._record(parent, self.parent(node))
+        self._touch(self.parent(node))
+        self._backend.append_node(parent, node)
+        self._indexed([node])
+
+    def insert_node_before(self, ref, node):
+        """Move a node to just before ref."""
+        self._record(self.parent(ref), self.parent(node))
+        self._touch(self.parent(node))
+        self._backend.insert_node_before(ref, node)
+        self._indexed([node])
+
+    def remove_node(self, elem):
+        """Remove an element and its descendants from the document."""
+        self._record(self.parent(elem))
+        self._unindex(elem)
+        self._backend.remove_node(elem)
+
+    def move_children(self, source, target):
+        """Move all children of source to the end of target."""
+        children = self.child_nodes(source)
+        self._record(source, target)
+        self._touch(source)
+        self._touch(target)
+        self._backend.move_children(source, target)
+        self._indexed(children)
+
+    def to_xml(self, node):
+        """Serialize a node (and its descendants) to a string."""
+        return self._backend.to_xml(node)
+
+    def _indexed(self, nodes):
+        """Add nodes just placed in the document to the indexes; return nodes."""
+        if self._index is not None:
+            for node in nodes:
+                if self._is_attached(node):
+                    self._index.touch(self.parent(node))
+                    if self.is_element(node):
+                        self._index.add(node)
+        return nodes
+
+    def _unindex(self, elem):
+        """Remove an element about to leave the document from the indexes."""
+        if self._index is not None:
+            self._index.touch(self.parent(elem))
+            self._index.remove(elem)
+
+    def _touch(self, node):
+        """Drop cached values of a node whose subtree is about to change."""
+        if self._index is not None and node is not None:
+            self._index.touch(node)
+
+
+class _NodeIndex:
+    """Lookup tables for XMLEditor.get_node, keyed by qualified names.
+
+    The tag table is built in one pass over the document; attribute and line
+    tables are built per tag the first time they are queried. Elements that are
+    removed stay in the attribute and line tables until they are rebuilt, so
+    lookups only return elements that are still in the tag table.
+
+    Values derived from an element's subtree, like its text, are cached per
+    element and dropped for the element and its ancestors when it is edited.
+    Text searches run over the cached texts of all elements of a tag (see
+    _TextTable), which are collected again after elements of the tag are edited.
+    """
+
+    def __init__(self, editor):
+        self._editor = editor
+        self._tags = {}  # tag -> {element: None}, a set in document order
+        self._attrs = {}  # (tag, attribute) -> {value: {element: None}}
+        self._attr_names = {}  # tag -> names of the indexed attributes
+        self._lines = {}  # tag -> (sorted start lines, elements in that order)
+        self._derived = {}  # element -> {key: value computed from its subtree}
+        self._text_tables = {}  # tag -> {key: _TextTable}
+        self.add(editor.root)
+        # Added elements go to the end of the tag table, moved ones stay put
+        self.in_document_order = True
+
+    def elements(self, tag):
+        """Return the elements with a tag (see in_document_order)."""
+        return list(self._tags.get(tag, {}))
+
+    def text(self, elem):
+        return self.derived(elem, "text", self._editor.get_text)
+
+    def find_text(self, tag, text, key="text", compute=None):
+        """
+        Return the elements of a tag whose text contains text.
+
+        Args:
+            tag: Qualified tag name
+            text: Text to find (not empty)
+            key: Name the element texts are cached under
+            compute: Callable returning an element's text (default: editor.get_text)
         """
-        content = self.dom.toxml(encoding=self.encoding)
-        self.xml_path.write_bytes(content)
+        tables = self._text_tables.setdefault(tag, {})
+        if key not in tables:
+            compute = compute or self._editor.get_text
+            elements = list(self._tags.get(tag, {}))
+            texts = [self.derived(elem, key, compute) for elem in elements]
+            tables[key] = _TextTable(elements, texts)
+        table = tables[key]
+        return [table.elements[i] for i in table.find(text)]
+
+    def derived(self, elem, key, compute):
+        values = self._derived.setdefault(elem, {})
+        if key not in values:
+            values[key] = compute(elem)
+        return values[key]
+
+    def touch(self, node):
+        """Drop the cached values of a node and its ancestors."""
+        while node is not None:
+            self._derived.pop(node, None)
+            if self._editor.is_element(node):
+                self._text_tables.pop(self._editor.tag_name(node), None)
+            node = self._editor.parent(node)
+
+    def candidates(self, tag, attrs, line_number, contains):
+        """Return the elements of a tag that may match the get_node filters."""
+        elements = self._tags.get(tag, {})
+        if attrs:
+            name, value = next(iter(attrs.items()))
+            candidates = self._with_attribute(tag, name, value)
+        elif line_number is not None:
+            candidates = self._on_lines(tag, line_number)
+        elif contains:
+            return self.find_text(tag, html.unescape(contains))
+        else:
+            return list(elements)
+        return [elem for elem in candidates if elem in elements]
+
+    def add(self, elem):
+        """Index an element and its descendants."""
+        editor = self._editor
+        self.in_document_order = False
+        for node in editor._backend.iter_elements(elem):
+            tag = editor.tag_name(node)
+            elements = self._tags.setdefault(tag, {})
+            if node in elements:
+                continue  # Moved within the document
+            elements[node] = None
+            self._text_tables.pop(tag, None)
+            for name in self._attr_names.get(tag, ()):
+                value = editor.get_attribute(node, name)
+                self._attrs[tag, name].setdefault(value, {})[node] = None
+            if tag in self._lines:
+                line = editor.get_line(node)
+                if line:
+                    lines, line_elements = self._lines[tag]
+                    position = bisect.bisect_right(lines, line)
+                    lines.insert(position, line)
+                    line_elements.insert(position, node)
+
+    def remove(self, elem):
+        """Drop an element and its descendants."""
+        editor = self._editor
+        for node in editor._backend.iter_elements(elem):
+            self._derived.pop(node, None)
+            tag = editor.tag_name(node)
+            self._tags.get(tag, {}).pop(node, None)
+            self._text_tables.pop(tag, None)
+            for name in self._attr_names.get(tag, ()):
+                value = editor.get_attribute(node, name)
+                self._attrs[tag, name].get(value, {}).pop(node, None)
+
+    def set_attribute(self, elem, name, value):
+        """Move an element to the bucket of an attribute's new value."""
+        tag = self._editor.tag_name(elem)
+        if elem not in self._tags.get(tag, {}):
+            return
+        values = self._attrs.get((tag, name))
+        if values is not None:
+            old_value = self._editor.get_attribute(elem, name)
+            values.get(old_value, {}).pop(elem, None)
+            values.setdefault(value, {})[elem] = None
+
+    def _with_attribute(self, tag, name, value):
+        values = self._attrs.get((tag, name))
+        if values is None:
+            values = {}
+            for elem in self._tags.get(tag, {}):
+                elem_value = self._editor.get_attribute(elem, name)
+                values.setdefault(elem_value, {})[elem] = None
+            self._attrs[tag, name] = values
+            self._attr_names.setdefault(tag, set()).add(name)
+        return list(values.get(value, {}))
+
+    def _on_lines(self, tag, line_number):
+        if tag not in self._lines:
+            pairs = []
+            for elem in self._tags.get(tag, {}):
+                line = self._editor.get_line(elem)
+                if line:
+                    pairs.append((line, elem))
+            pairs.sort(key=lambda pair: pair[0])
+            self._lines[tag] = ([line for line, _ in pairs], [e for _, e in pairs])
+        lines, elements = self._lines[tag]
+
+        if isinstance(line_number, range):
+            if not line_number:
+                return []
+            # Every line of the range lies between its smallest and largest
+            first, last = min(line_number), max(line_number)
+        else:
+            first = last = line_number
+        start = bisect.bisect_left(lines, first)
+        stop = bisect.bisect_right(lines, last)
+        # An element removed and added back may be listed twice
+        return list(dict.fromkeys(elements[start:stop]))
+
+
+class _TextTable:
+    """The texts of the elements of one tag, searched for substrings.
+
+    Texts are joined into one string, so a search is one str.find over all of
+    them. Tables that are searched often, like the paragraphs of a document
+    whose comments are imported in bulk, also index the words of the texts:
+    a phrase of several words is then only looked for in the texts that have
+    its words.
+    """
+
+    WORD_INDEX_AFTER = 100  # Searches of a table before its words are indexed
+
+    def __init__(self, elements, texts):
+        self.elements = elements
+        self.texts = texts
+        self.starts = []  # Offset of each text in joined
+        offset = 0
+        for text in texts:
+            self.starts.append(offset)
+            offset += len(text) + 1
+        # XML text cannot contain NUL, so no match spans two elements
+        self.joined = "\0".join(texts)
+        self.searches = 0
+        self._words = None  # word -> indexes of the texts with it, ascending
+        self._sorted_words = None
+        self._sorted_reversed_words = None
+
+    def find(self, text):
+        """Return the indexes of the texts that contain text, ascending."""
+        self.searches += 1
+        words = text.split()
+        if len(words) > 1 and self.searches > self.WORD_INDEX_AFTER:
+            return [i for i in self._candidates(words) if text in self.texts[i]]
+
+        found = []
+        position = self.joined.find(text)
+        while position != -1:
+            i = bisect.bisect_right(self.starts, position) - 1
+            found.append(i)
+            # Continue after this element's text
+            if i + 1 == len(self.starts):
+                break
+            position = self.joined.find(text, self.starts[i + 1])
+        return found
+
+    def _candidates(self, words):
+        """Return the indexes of the texts that may contain a phrase of words."""
+        if self._words is None:
+            self._index_words()
+        # Inner words of the phrase are whole words of the text. The first
+        # one may be the end of a longer word, the last one the start of one.
+        if len(words) > 2:
+            lists = [self._words.get(word, ()) for word in words[1:-1]]
+        else:
+            lists = [self._ending_with(words[0]), self._starting_with(words[-1])]
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for other in lists[1:]:
+            candidates.intersection_update(other)
+        return sorted(candidates)
+
+    def _index_words(self):
+        self._words = {}
+        for i, text in enumerate(self.texts):
+            for word in set(text.split()):
+                indexes = self._words.get(word)
+                if indexes is None:
+                    self._words[word] = [i]
+                else:
+                    indexes.append(i)
+        self._sorted_words = sorted(self._words)
+        self._sorted_reversed_words = sorted(word[::-1] for word in self._words)
+
+    def _starting_with(self, prefix):
+        words = self._sorted_words
+        indexes = []
+        position = bisect.bisect_left(words, prefix)
+        while position < len(words) and words[position].startswith(prefix):
+            indexes.extend(self._words[words[position]])
+            position += 1
+        return indexes
+
+    def _ending_with(self, suffix):
+        words = self._sorted_reversed_words
+        indexes = []
+        suffix = suffix[::-1]
+        position = bisect.bisect_left(words, suffix)
+        while position < len(words) and words[position].startswith(suffix):
+            indexes.extend(self._words[words[position][::-1]])
+            position += 1
+        return indexes
+
+
+class _MinidomBackend:
+    """XMLEditor backend on defusedxml.minidom, with lines from a patched SAX parser."""
+
+    def __init__(self, xml_path, cache_dir=None):
+        if cache_dir is None or not _minidom_builds_faithfully():
+            self.dom = self._parse(xml_path)
+            return
+
+        content = xml_path.read_bytes()
+        cache = _DomCache(cache_dir)
+        key = hashlib.sha256(content).hexdigest()
+        # Millions of new objects would otherwise trigger many useless collections
+        with _gc_paused():
+            records = cache.load(key)
+            if records is not None:
+                self.dom = _build_minidom(records)
+        if records is None:
+            self.dom = self._parse(io.BytesIO(content))
+            records = _minidom_records(self.dom)
+            if records is not None:
+                cache.store(key, records)
+
+    @staticmethod
+    def _parse(source):
+        parser = _create_line_tracking_parser()
+        return defusedxml.minidom.parse(
+            str(source) if isinstance(source, Path) else source, parser
+        )
+
+    @property
+    def root(self):
+        return self.dom.documentElement
+
+    def find_all(self, tag, within=None):
+        return (self.dom if within is None else within).getElementsByTagName(tag)
+
+    def iter_elements(self, elem):
+        yield elem
+        yield from elem.getElementsByTagName("*")
+
+    def is_element(self, node):
+        return node.nodeType == node.ELEMENT_NODE
+
+    def tag_name(self, node):
+        return node.nodeName
+
+    def get_line(self, elem):
+        return getattr(elem, "parse_position", (None,))[0]
+
+    def get_text(self, elem):
+        text_parts = []
+        for node in elem.childNodes:
+            if node.nodeType == node.TEXT_NODE:
+                # Skip whitespace-only text nodes (XML formatting)
+                if node.data.strip():
+                    text_parts.append(node.data)
+            elif node.nodeType == node.ELEMENT_NODE:
+                text_parts.append(self.get_text(node))
+        return "".join(text_parts)
+
+    def get_attribute(self, elem, name):
+        return elem.getAttribute(name)
+
+    def has_attribute(self, elem, name):
+        return elem.hasAttribute(name)
+
+    def set_attribute(self, elem, name, value):
+        elem.setAttribute(name, value)
+
+    def remove_attribute(self, elem, name):
+        elem.removeAttribute(name)
+
+    def has_namespace(self, prefix):
+        return self.root.hasAttribute(f"xmlns:{prefix}")  # type: ignore
+
+    def ensure_namespace(self, prefix, uri):
+        if not self.root.hasAttribute(f"xmlns:{prefix}"):  # type: ignore
+            self.root.setAttribute(f"xmlns:{prefix}", uri)  # type: ignore
+
+    def parent(self, node):
+        return node.parentNode
+
+    def first_child(self, node):
+        return node.firstChild
+
+    def child_nodes(self, node):
+        return list(node.childNodes)
+
+    def leading_text(self, elem):
+        child = elem.firstChild
+        if child and child.nodeType == child.TEXT_NODE:
+            return child.data
+        return None
+
+    def own_text(self, elem):
+        return "".join(
+            node.data for node in elem.childNodes if node.nodeType == node.TEXT_NODE
+        )
+
+    def create_element(self, tag):
+        return self.dom.createElement(tag)
+
+    def clone(self, elem):
+        return elem.cloneNode(True)
+
+    def rename(self, elem, tag):
+        new_elem = self.dom.createElement(tag)
+        # Copy ALL child nodes (not just firstChild) to handle entities
+        while elem.firstChild:
+            new_elem.appendChild(elem.firstChild)
+        for i in range(elem.attributes.length):
+            attr = elem.attributes.item(i)
+            new_elem.setAttribute(attr.name, attr.value)
+        elem.parentNode.replaceChild(new_elem, elem)
+        return new_elem
+
+    def append_node(self, parent, node):
+        parent.appendChild(node)
+
+    def insert_node_before(self, ref, node):
+        ref.parentNode.insertBefore(node, ref)
+
+    def remove_node(self, elem):
+        elem.parentNode.removeChild(elem)
+
+    def move_children(self, source, target):
+        while source.firstChild:
+            target.appendChild(source.firstChild)
+
+    def to_xml(self, node):
+        return node.toxml()
+
+    def save_state(self, node):
+        attributes = getattr(node, "attributes", None)
+        return (
+            list(node.childNodes),
+            None if attributes is None else list(attributes.items()),
+        )
+
+    def restore_state(self, node, state):
+        children, attributes = state
+        while node.firstChild:
+            node.removeChild(node.firstChild)
+        for child in children:
+            node.appendChild(child)
+        if attributes is not None:
+            for name in list(node.attributes.keys()):
+                node.removeAttribute(name)
+            for name, value in attributes:
+                node.setAttribute(name, value)
+
+    def replace_node(self, elem, new_content):
+        parent = elem.parentNode
+        nodes = self._parse_fragment(new_content)
+        for node in nodes:
+            parent.insertBefore(node, elem)
+        parent.removeChild(elem)
+        return nodes
+
+    def insert_after(self, elem, xml_content):
+        parent = elem.parentNode
+        next_sibling = elem.nextSibling
+        nodes = self._parse_fragment(xml_content)
+        for node in nodes:
+            if next_sibling:
+                parent.insertBefore(node, next_sibling)
+            else:
+                parent.appendChild(node)
+        return nodes
+
+    def insert_before(self, elem, xml_content):
+        parent = elem.parentNode
+        nodes = self._parse_fragment(xml_content)
+        for node in nodes:
+            parent.insertBefore(node, elem)
+        return nodes
+
+    def append_to(self, elem, xml_content):
+        nodes = self._parse_fragment(xml_content)
+        for node in nodes:
+            elem.appendChild(node)
+        return nodes
+
+    def write(self, file, encoding):
+        # What toxml(encoding=...) does, into the file instead of a BytesIO
+        writer = io.TextIOWrapper(
+            file, encoding=encoding, errors="xmlcharrefreplace", newline="\n"
+        )
+        self.dom.writexml(writer, encoding=encoding)
+        writer.flush()
+        writer.detach()  # Leave the file open for its owner
 
     def _parse_fragment(self, xml_content):
         """
@@ -343,6 +1108,602 @@ class XMLEditor:
         return nodes
 
 
+class _LxmlBackend:
+    """XMLEditor backend on lxml, which records each element's sourceline itself.
+
+    Qualified names like "w:p" are resolved with the prefixes declared on the
+    root element. Text is not a node in lxml, so inserted nodes are elements
+    (and comments), and text between elements moves with the element before it.
+    """
+
+    def __init__(self, xml_path, cache_dir=None):
+        # cache_dir is ignored: parsing is faster than loading a cached tree
+        # Never resolve entities or fetch anything, like defusedxml
+        parser = lxml.etree.XMLParser(
+            resolve_entities=False, no_network=True, huge_tree=True
+        )
+        content = xml_path.read_bytes()
+        self.dom = lxml.etree.parse(io.BytesIO(content), parser)
+        self._nsmap = dict(self.root.nsmap)
+
+        # Past line 65535 sourceline is not reliable, so long files are scanned
+        # for the line each element starts on (elements are in start tag order)
+        self._long_lines = {}
+        if content.count(b"\n") >= _MAX_LXML_LINE - 1:
+            elements = self.root.iter(lxml.etree.Element)
+            for elem, line in zip(elements, _start_tag_lines(content)):
+                if line >= _MAX_LXML_LINE:
+                    self._long_lines[elem] = line
+
+        # ns_clean drops the declarations fragments repeat from the wrapper
+        self._fragment_parser = lxml.etree.XMLParser(
+            resolve_entities=False, no_network=True, ns_clean=True
+        )
+
+    @property
+    def root(self):
+        return self.dom.getroot()
+
+    def find_all(self, tag, within=None):
+        name = self._element_name(tag)
+        if name is None:
+            # Prefix not declared on the root element; compare names instead
+            nodes = self.root.iter() if within is None else within.iterdescendants()
+            return [n for n in nodes if self.is_element(n) and self.tag_name(n) == tag]
+        if within is None:
+            return list(self.root.iter(name))
+        return list(within.iterdescendants(name))
+
+    def iter_elements(self, elem):
+        return elem.iter(lxml.etree.Element)
+
+    def is_element(self, node):
+        return isinstance(node.tag, str)
+
+    def tag_name(self, node):
+        if isinstance(node.tag, str):
+            local_name = node.tag.rpartition("}")[2]
+            return f"{node.prefix}:{local_name}" if node.prefix else local_name
+        if node.tag is lxml.etree.ProcessingInstruction:
+            return node.target
+        return "#entity" if node.tag is lxml.etree.Entity else "#comment"
+
+    def get_line(self, elem):
+        line = elem.sourceline
+        if line is not None and line >= _MAX_LXML_LINE:
+            return self._long_lines.get(elem, line)
+        return line
+
+    def get_text(self, elem):
+        return "".join(text for text in elem.itertext() if text.strip())
+
+    def get_attribute(self, elem, name):
+        key = self._attribute_name(elem, name)
+        return "" if key is None else elem.get(key, "")
+
+    def has_attribute(self, elem, name):
+        key = self._attribute_name(elem, name)
+        return key is not None and elem.get(key) is not None
+
+    def set_attribute(self, elem, name, value):
+        key = self._attribute_name(elem, name)
+        if key is None:
+            raise ValueError(f"Namespace prefix of attribute {name} is not declared")
+        elem.set(key, value)
+
+    def remove_attribute(self, elem, name):
+        key = self._attribute_name(elem, name)
+        if key is not None:
+            elem.attrib.pop(key, None)
+
+    def has_namespace(self, prefix):
+        return prefix in self._nsmap
+
+    def ensure_namespace(self, prefix, uri):
+        if prefix in self._nsmap:
+            return
+        # lxml cannot add a declaration to an existing element, but the cleanup
+        # can declare it on the root; keep every other prefix declared there too
+        keep = [p for p in self._nsmap if p] + [prefix]
+        lxml.etree.cleanup_namespaces(
+            self.dom, top_nsmap={prefix: uri}, keep_ns_prefixes=keep
+        )
+        self._nsmap = dict(self.root.nsmap)
+
+    def parent(self, node):
+        return node.getparent()
+
+    def first_child(self, node):
+        return node[0] if len(node) else None
+
+    def child_nodes(self, node):
+        return list(node)
+
+    def leading_text(self, elem):
+        return elem.text
+
+    def own_text(self, elem):
+        return (elem.text or "") + "".join(child.tail or "" for child in elem)
+
+    def create_element(self, tag):
+        name = self._element_name(tag)
+        if name is None:
+            raise ValueError(f"Namespace prefix of element {tag} is not declared")
+        return lxml.etree.Element(name, nsmap=self._nsmap)
+
+    def clone(self, elem):
+        new_elem = copy.deepcopy(elem)
+        new_elem.tail = None
+        return new_elem
+
+    def rename(self, elem, tag):
+        name = self._element_name(tag)
+        if name is None:
+            raise ValueError(f"Namespace prefix of element {tag} is not declared")
+        elem.tag = name
+        return elem
+
+    def append_node(self, parent, node):
+        parent.append(node)
+
+    def insert_node_before(self, ref, node):
+        ref.addprevious(node)
+
+    def remove_node(self, elem):
+        _remove_keeping_tail(elem)
+
+    def move_children(self, source, target):
+        _append_text(target, source.text)
+        source.text = None
+        for child in list(source):
+            target.append(child)
+
+    def to_xml(self, node):
+        return lxml.etree.tostring(node, encoding="unicode", with_tail=False)
+
+    def save_state(self, node):
+        children = [(child, child.tail) for child in node]
+        return node.tag, dict(node.attrib), node.text, children
+
+    def restore_state(self, node, state):
+        tag, attributes, text, children = state
+        node.tag = tag
+        node.attrib.clear()
+        node.attrib.update(attributes)
+        node.text = text
+        for child in list(node):
+            node.remove(child)
+        for child, tail in children:
+            node.append(child)
+            child.tail = tail
+
+    def replace_node(self, elem, new_content):
+        nodes = self.insert_before(elem, new_content)
+        _remove_keeping_tail(elem)
+        return nodes
+
+    def insert_after(self, elem, xml_content):
+        text, nodes = self._parse_fragment(xml_content)
+        if text:
+            elem.tail = (elem.tail or "") + text
+        anchor = elem
+        for node in nodes:
+            anchor.addnext(node)
+            anchor = node
+        return nodes
+
+    def insert_before(self, elem, xml_content):
+        text, nodes = self._parse_fragment(xml_content)
+        _insert_text_before(elem, text)
+        for node in nodes:
+            elem.addprevious(node)
+        return nodes
+
+    def append_to(self, elem, xml_content):
+        text, nodes = self._parse_fragment(xml_content)
+        _append_text(elem, text)
+        for node in nodes:
+            elem.append(node)
+        return nodes
+
+    def write(self, file, encoding):
+        # Declaration as tostring() writes it (write() upper-cases the encoding)
+        docinfo = self.dom.docinfo
+        declaration = f"<?xml version='{docinfo.xml_version}' encoding='{encoding}'"
+        if docinfo.standalone is not None:
+            declaration += f" standalone='{'yes' if docinfo.standalone else 'no'}'"
+        file.write(f"{declaration}?>\n".encode(encoding))
+        self.dom.write(file, encoding=encoding, xml_declaration=False)
+
+    def _parse_fragment(self, xml_content):
+        """
+        Parse XML fragment in the namespace context of the root element.
+
+        Returns:
+            tuple: (leading text, list of top-level nodes of the fragment)
+
+        Raises:
+            AssertionError: If fragment contains no element nodes
+        """
+        ns_decl = " ".join(
+            f'xmlns:{prefix}="{uri}"' if prefix else f'xmlns="{uri}"'
+            for prefix, uri in self._nsmap.items()
+        )
+        wrapper = lxml.etree.fromstring(
+            f"<root {ns_decl}>{xml_content}</root>".encode("utf-8"),
+            self._fragment_parser,
+        )
+        nodes = list(wrapper)
+        assert any(
+            self.is_element(n) for n in nodes
+        ), "Fragment must contain at least one element"
+        # Lines of the fragment are not lines of the file
+        for node in nodes:
+            for elem in node.iter():
+                elem.sourceline = 0
+        return wrapper.text, nodes
+
+    def _element_name(self, tag):
+        """Return the lxml name ("{uri}local") of a tag, or None if undeclared."""
+        prefix, _, local_name = tag.rpartition(":")
+        uri = self._nsmap.get(prefix or None)
+        if uri is None:
+            return None if prefix else local_name
+        return f"{{{uri}}}{local_name}"
+
+    def _attribute_name(self, elem, name):
+        """Return the lxml name of an attribute, or None if its prefix is undeclared."""
+        prefix, _, local_name = name.rpartition(":")
+        if not prefix:
+            return local_name  # Unprefixed attributes have no namespace
+        if prefix == "xml":
+            uri = XML_NAMESPACE
+        else:
+            uri = self._nsmap.get(prefix) or elem.nsmap.get(prefix)
+        return None if uri is None else f"{{{uri}}}{local_name}"
+
+
+_BACKENDS = {"minidom": _MinidomBackend, "lxml": _LxmlBackend}
+
+
+def user_cache_dir(name):
+    """Return a private cache directory of the current user, e.g. ~/.cache/<name>.
+
+    The directory is under $XDG_CACHE_HOME if set, and is created and checked
+    with private_directory.
+
+    Raises:
+        OSError: If the directory cannot be created or is not private
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return private_directory(Path(base) / name)
+
+
+def private_directory(path):
+    """Create a directory that only the current user can access, or check one.
+
+    Files read back from a cache are trusted, so a directory that another user
+    created, owns or can write to is refused rather than used.
+
+    Raises:
+        PermissionError: If the directory is not the user's or others can use it
+    """
+    path = Path(path)
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = path.lstat()
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is not a directory of the current user")
+    if info.st_mode & 0o077:
+        raise PermissionError(
+            f"{path} is accessible to other users (chmod 700 it to use it)"
+        )
+    return path
+
+
+class _DomCache:
+    """Parsed minidom trees on disk, as records of _minidom_records.
+
+    Entries are keyed by the content hash of the parsed file, the cache version
+    and the Python version (marshal's format is version specific). When the
+    cache grows past max_bytes, the least recently used entries are removed.
+
+    Entries are rebuilt into trees without any check, so the directory must be
+    private to the user (see private_directory); otherwise it is not used.
+    """
+
+    def __init__(self, directory, max_bytes=DOM_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        try:
+            self.directory = private_directory(Path(directory).expanduser())
+        except OSError as e:
+            print(f"Warning: Not using DOM cache {directory}: {e}")
+            self.directory = None
+
+    def _path(self, key):
+        python = f"{sys.version_info[0]}{sys.version_info[1]}"
+        return self.directory / f"{key}.v{DOM_CACHE_VERSION}.py{python}.dom"
+
+    def load(self, key):
+        """Return the cached records for key, or None."""
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            records = marshal.loads(path.read_bytes())  # Much faster than load()
+            os.utime(path)  # Most recently used
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return records
+
+    def store(self, key, records):
+        """Cache records under key, then evict entries beyond max_bytes.
+
+        The cache only saves work; failing to write it is not an error.
+        """
+        if self.directory is None:
+            return
+        try:
+            fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(marshal.dumps(records))
+                os.replace(temp_name, self._path(key))
+            except BaseException:
+                os.unlink(temp_name)
+                raise
+            self._evict()
+        except OSError as e:
+            print(f"Warning: Could not write DOM cache {self.directory}: {e}")
+
+    def _evict(self):
+        entries = []
+        for path in self.directory.glob("*.dom"):
+            try:
+                info = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another process
+            entries.append((info.st_mtime, info.st_size, path))
+        entries.sort(reverse=True)
+
+        total = 0
+        for _, size, path in entries:
+            total += size
+            if total > self.max_bytes:
+                path.unlink(missing_ok=True)
+
+
+def _minidom_records(dom):
+    """Flatten a parsed minidom tree into records that marshal can store.
+
+    Each node is a tuple (node type, index of its parent element, ...), parents
+    before children, where index 0 is the document and element i is the i-th
+    element record. Returns None if the tree has node types not recorded here.
+    """
+    records = []
+    element_index = {dom: 0}
+    pending = [dom]
+    while pending:
+        parent = pending.pop()
+        parent_index = element_index[parent]
+        for node in parent.childNodes:
+            node_type = node.nodeType
+            if node_type == node.ELEMENT_NODE:
+                attrs = None
+                if node._attrs is not None:
+                    attrs = tuple(
+                        (
+                            attr._name,
+                            attr.namespaceURI,
+                            attr._prefix,
+                            getattr(attr, "_localName", None),
+                            attr._value,
+                        )
+                        for attr in node._attrs.values()
+                    )
+                records.append(
+                    (
+                        node_type,
+                        parent_index,
+                        node.tagName,
+                        node.namespaceURI,
+                        node.prefix,
+                        getattr(node, "_localName", None),
+                        attrs,
+                        getattr(node, "parse_position", None),
+                    )
+                )
+                element_index[node] = len(element_index)
+                pending.append(node)
+            elif node_type in _CHARACTER_DATA_CLASSES:
+                records.append((node_type, parent_index, node.data))
+            elif node_type == node.PROCESSING_INSTRUCTION_NODE:
+                records.append((node_type, parent_index, node.target, node.data))
+            else:
+                return None
+    return records
+
+
+_CHARACTER_DATA_CLASSES = {
+    minidom.Node.TEXT_NODE: minidom.Text,
+    minidom.Node.CDATA_SECTION_NODE: minidom.CDATASection,
+    minidom.Node.COMMENT_NODE: minidom.Comment,
+}
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _build_minidom(records):
+    """Rebuild the minidom tree of _minidom_records.
+
+    Nodes are created without their constructors and DOM methods, which check
+    and update far more than a finished tree needs.
+    """
+    dom = minidom.Document()
+    elements = [dom]
+    new = object.__new__
+    for record in records:
+        node_type = record[0]
+        parent = elements[record[1]]
+        if node_type == minidom.Node.ELEMENT_NODE:
+            _, _, tag, uri, prefix, local_name, attrs, position = record
+            node = new(minidom.Element)
+            node.tagName = node.nodeName = tag
+            node.namespaceURI = uri
+            node.prefix = prefix
+            if local_name is not None:
+                node._localName = local_name
+            node.childNodes = NodeList()
+            node._attrs = node._attrsNS = None
+            if attrs is not None:
+                node._attrs, node._attrsNS = {}, {}
+                for name, attr_uri, attr_prefix, attr_local_name, value in attrs:
+                    attr = new(minidom.Attr)
+                    attr._name = name
+                    attr._value = value
+                    attr.namespaceURI = attr_uri
+                    attr._prefix = attr_prefix
+                    if attr_local_name is not None:
+                        attr._localName = attr_local_name
+                    attr.ownerDocument = dom
+                    attr.ownerElement = node
+                    text = new(minidom.Text)
+                    text._data = value
+                    text.ownerDocument = text.parentNode = None
+                    text.previousSibling = text.nextSibling = None
+                    attr.childNodes = NodeList((text,))
+                    node._attrs[name] = attr
+                    node._attrsNS[(attr_uri, attr.localName)] = attr
+            if position is not None:
+                node.parse_position = tuple(position)
+            elements.append(node)
+        elif node_type == minidom.Node.PROCESSING_INSTRUCTION_NODE:
+            node = new(minidom.ProcessingInstruction)
+            node.target, node.data = record[2], record[3]
+        else:
+            node = new(_CHARACTER_DATA_CLASSES[node_type])
+            node._data = record[2]
+
+        node.ownerDocument = dom
+        node.parentNode = parent
+        node.nextSibling = None
+        siblings = parent.childNodes
+        node.previousSibling = siblings[-1] if siblings else None
+        if siblings:
+            siblings[-1].nextSibling = node
+        siblings.append(node)
+    return dom
+
+
+# Elements with namespaced and plain attributes, text and a processing instruction
+# (the line-tracking parser drops comments and keeps CDATA as text)
+_ROUND_TRIP_SAMPLE = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<?mso-application progid="Word.Document"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml" plain="1">
+  <!-- comment -->
+  <w:body><w:p w14:paraId="1A2B3C4D"><w:r><w:t xml:space="preserve"> a &amp; b </w:t>
+  </w:r></w:p><![CDATA[x < y]]><w:p/></w:body>
+</w:document>"""
+
+_minidom_build_checked = None  # Result of _minidom_builds_faithfully, once known
+
+
+def _minidom_builds_faithfully():
+    """Return True if _build_minidom rebuilds a tree that behaves like the parsed one.
+
+    _build_minidom sets minidom's private slots directly, so a change in
+    minidom's internals could yield a subtly broken tree. Once per process, a
+    sample is parsed and rebuilt, and both trees are serialized, searched and
+    edited the same way; if anything differs, a warning is printed and the DOM
+    cache is not used.
+    """
+    global _minidom_build_checked
+    if _minidom_build_checked is not None:
+        return _minidom_build_checked
+
+    def exercise(dom):
+        results = [dom.toxml()]
+        elements = dom.getElementsByTagName("*")
+        results.append([getattr(elem, "parse_position", None) for elem in elements])
+        paragraph = dom.getElementsByTagName("w:p")[0]
+        results.append(paragraph.getAttributeNS(paragraph.namespaceURI, "paraId"))
+        results.append(paragraph.getAttribute("w14:paraId"))
+        text = dom.getElementsByTagName("w:t")[0]
+        text.firstChild.data = "changed"
+        text.setAttribute("xml:space", "default")
+        paragraph.setAttribute("w14:textId", "77777777")
+        paragraph.removeAttribute("w14:paraId")
+        body = paragraph.parentNode
+        body.insertBefore(paragraph.cloneNode(True), paragraph.nextSibling)
+        body.removeChild(body.lastChild)
+        body.appendChild(dom.createElement("w:sectPr"))
+        results.append(dom.toxml())
+        return results
+
+    try:
+        parsed = _MinidomBackend._parse(io.BytesIO(_ROUND_TRIP_SAMPLE))
+        with _gc_paused():
+            rebuilt = _build_minidom(_minidom_records(parsed))
+        faithful = exercise(rebuilt) == exercise(parsed)
+    except Exception:
+        faithful = False
+    if not faithful:
+        print(
+            "Warning: minidom trees rebuilt from the DOM cache differ from parsed "
+            "ones with this Python version; the DOM cache is not used"
+        )
+    _minidom_build_checked = faithful
+    return faithful
+
+
+def _start_tag_lines(content):
+    """Yield the line of each start tag in XML content, in document order."""
+    line = 1
+    position = 0
+    for match in _START_TAG_PATTERN.finditer(content):
+        if match.end() - match.start() == 1:  # A "<" that starts an element
+            line += content.count(b"\n", position, match.start())
+            position = match.start()
+            yield line
+
+
+def _append_text(elem, text):
+    """Append text after the last child of elem (lxml keeps it as a tail)."""
+    if not text:
+        return
+    if len(elem):
+        elem[-1].tail = (elem[-1].tail or "") + text
+    else:
+        elem.text = (elem.text or "") + text
+
+
+def _insert_text_before(elem, text):
+    """Insert text just before elem (lxml keeps it on the previous node)."""
+    if not text:
+        return
+    previous = elem.getprevious()
+    if previous is not None:
+        previous.tail = (previous.tail or "") + text
+    else:
+        parent = elem.getparent()
+        parent.text = (parent.text or "") + text
+
+
+def _remove_keeping_tail(elem):
+    """Remove an lxml element but not the text that follows it."""
+    _insert_text_before(elem, elem.tail)
+    elem.getparent().remove(elem)
+
+
 def _create_line_tracking_parser():
     """
     Create a SAX parser that tracks line and column numbers for each element.
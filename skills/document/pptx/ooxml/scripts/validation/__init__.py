@@ -4,6 +4,7 @@ Validation modules for Word document processing.
 
 from .base import BaseSchemaValidator
 from .docx import DOCXSchemaValidator
+from .engine import Rule
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
 
@@ -12,4 +13,5 @@ __all__ = [
     "DOCXSchemaValidator",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "Rule",
 ]
@@ -2,11 +2,65 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
+import io
+import itertools
+import os
 import re
-from pathlib import Path
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePosixPath
 
 import lxml.etree
 
+from .engine import iterparse_part, run_rules
+from .manifest import ValidationManifest, combine_hashes, hash_file
+from .package import PackageIndex
+from .report import ValidationReport, timed_check
+from .rules import NamespacesRule, RelationshipIdsRule, UniqueIdsRule
+
+# Compiled XSD schemas shared by every validator in this process.
+# Keyed by (schema path, mtime) so that edited schema files are recompiled.
+_SCHEMA_CACHE = {}
+
+# XSD errors found in parts of original files, keyed by the original file's
+# content hash and then by part name. An unchanged original is only ever
+# validated once per process, however many times its edits are re-validated.
+_BASELINE_CACHE = {}
+
+# Template tags ({{ ... }}) are placeholders for content replacement; they are
+# removed from text before XSD validation. The XPath finds the (rare) text
+# nodes that may contain one without visiting the rest in Python.
+_TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+_TEMPLATE_TEXT_XPATH = lxml.etree.XPath("//text()[contains(., '{{')]")
+
+# Worker processes for parallel XSD validation. The pool outlives individual
+# validators, so workers keep their compiled schemas (and baselines) warm.
+_POOL = None
+_POOL_SIZE = 0
+
+
+def _get_pool(jobs):
+    """Return the shared worker pool, (re)creating it with jobs workers."""
+    global _POOL, _POOL_SIZE
+    if _POOL is None or _POOL_SIZE != jobs:
+        if _POOL is not None:
+            _POOL.shutdown()
+        _POOL = ProcessPoolExecutor(max_workers=jobs)
+        _POOL_SIZE = jobs
+    return _POOL
+
+
+def _validate_part_xsd(validator, xml_file):
+    """Worker task: validate one part of the validator's package against XSD.
+
+    Returns the result together with the worker's timings, which the parent
+    process merges into its own report.
+    """
+    validator.report = ValidationReport()
+    return validator.validate_file_against_xsd(xml_file), validator.report
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -37,6 +91,10 @@ class BaseSchemaValidator:
         "grpsp": ("id", "file"),  # Group shape IDs
     }
 
+    # Element-level rules run together in a single walk over each part by validate()
+    # Subclasses extend this with format-specific rules
+    RULES = [NamespacesRule, UniqueIdsRule, RelationshipIdsRule]
+
     # Mapping of element names to expected relationship types
     # Subclasses should override this with format-specific mappings
     ELEMENT_RELATIONSHIP_TYPES = {}
@@ -103,27 +161,127 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        jobs=1,
+        incremental=False,
+        streaming=False,
+    ):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
 
+        # Stream parts through iterparse instead of keeping parsed trees, so that
+        # the non-XSD checks run in bounded memory on very large parts
+        self.streaming = streaming
+
+        # Reuse XSD results of unchanged parts from the manifest of earlier runs
+        self.incremental = incremental
+
+        # Number of worker processes for XSD validation (0 = one per CPU)
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
 
+        # Content hash of the original file, computed on first use
+        self._original_file_hash = None
+
+        # Parsed trees shared by all checks, so each part is parsed only once
+        self._xml_trees = {}
+
+        # Rules already run by run_rules, waiting to be reported
+        self._rule_results = {}
+
+        # Timings and counters of this run, see report.py
+        self.report = ValidationReport()
+
+        # Files, relationships and content types, indexed in one directory walk
+        self.package = PackageIndex(self.unpacked_dir, self.parse_xml)
+
         # Get all XML and .rels files
-        patterns = ["*.xml", "*.rels"]
-        self.xml_files = [
-            f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
-        ]
+        self.xml_files = self.package.xml_files
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+    def __getstate__(self):
+        # Validators are sent to worker processes without their parsed trees,
+        # which lxml cannot pickle; workers parse the parts they are given
+        state = self.__dict__.copy()
+        state["_xml_trees"] = {}
+        state["_rule_results"] = {}
+        return state
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def parse_xml(self, xml_file):
+        """Parse an XML file, reusing the tree if it was already parsed.
+
+        Checks must treat the returned tree as read-only, since it is shared.
+        In streaming mode trees are not kept, and each call parses the file.
+
+        Args:
+            xml_file: Path to the XML file to parse
+
+        Returns:
+            lxml.etree._ElementTree: The parsed tree
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the file is not well-formed
+        """
+        if self.streaming:
+            return self._parse_xml_file(xml_file)
+
+        tree = self._xml_trees.get(xml_file)
+        if tree is None:
+            tree = self._parse_xml_file(xml_file)
+            self._xml_trees[xml_file] = tree
+        else:
+            self.report.count("tree_cache_hits")
+        return tree
+
+    def _parse_xml_file(self, xml_file):
+        """Parse a file, recording its size and parse time in the report."""
+        start = time.perf_counter()
+        tree = lxml.etree.parse(str(xml_file))
+        seconds = time.perf_counter() - start
+
+        try:
+            part_name = self._part_name(xml_file)
+        except ValueError:
+            part_name = str(xml_file)  # Reached through a symlink
+        size = xml_file.stat().st_size
+        self.report.part(part_name)["bytes"] = size
+        self.report.add_part_time(part_name, "parse_seconds", seconds)
+        self.report.count("parse_bytes", size)
+        return tree
+
+    def run_rules(self, rule_classes):
+        """Run element-level rules together in one walk over each part.
+
+        The results are kept until the matching validate_* method reports them.
+
+        Args:
+            rule_classes: Rule subclasses to run
+        """
+        rules = [rule_class(self) for rule_class in rule_classes]
+        run_rules(self, rules, self.xml_files)
+        for rule in rules:
+            self._rule_results[type(rule)] = rule
+
+    def _report_rule(self, rule_class):
+        """Report the result of a rule, running it on its own if needed."""
+        if rule_class not in self._rule_results:
+            self.run_rules([rule_class])
+        return self._rule_results.pop(rule_class).report()
+
+    @timed_check
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
@@ -131,7 +289,11 @@ class BaseSchemaValidator:
         for xml_file in self.xml_files:
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                if self.streaming:
+                    for _ in iterparse_part(xml_file):
+                        pass
+                else:
+                    self.parse_xml(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -153,127 +315,17 @@ class BaseSchemaValidator:
                 print("PASSED - All XML files are well-formed")
             return True
 
+    @timed_check
     def validate_namespaces(self):
         """Validate that namespace prefixes in Ignorable attributes are declared."""
-        errors = []
-
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
-
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
-                    undeclared = set(attr_val.split()) - declared
-                    errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
-                    )
-            except lxml.etree.XMLSyntaxError:
-                continue
-
-        if errors:
-            print(f"FAILED - {len(errors)} namespace issues:")
-            for error in errors:
-                print(error)
-            return False
-        if self.verbose:
-            print("PASSED - All namespace prefixes properly declared")
-        return True
+        return self._report_rule(NamespacesRule)
 
+    @timed_check
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
-        errors = []
-        global_ids = {}  # Track globally unique IDs across all files
-
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
-
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All required IDs are unique")
-            return True
+        return self._report_rule(UniqueIdsRule)
 
+    @timed_check
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
@@ -281,7 +333,7 @@ class BaseSchemaValidator:
         errors = []
 
         # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        rels_files = self.package.rels_files
 
         if not rels_files:
             if self.verbose:
@@ -289,17 +341,12 @@ class BaseSchemaValidator:
             return True
 
         # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
-
-        # Track all files that are referenced by any .rels file
-        all_referenced_files = set()
+        all_files = [
+            file_path
+            for file_path in self.package.files
+            if file_path.name != "[Content_Types].xml"
+            and not file_path.name.endswith(".rels")
+        ]  # These files are not referenced by .rels
 
         if self.verbose:
             print(
@@ -308,60 +355,24 @@ class BaseSchemaValidator:
 
         # Check each .rels file
         for rels_file in rels_files:
+            rel_path = rels_file.relative_to(self.unpacked_dir)
             try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
-                broken_refs = []
-
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
-                    if target and not target.startswith(
-                        ("http", "mailto:")
-                    ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
-                        else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
-
-                # Report broken references
-                if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
-                    for broken_ref, line_num in broken_refs:
-                        errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
-                        )
-
+                relationships = self.package.relationships(rels_file)
             except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
                 errors.append(f"  Error parsing {rel_path}: {e}")
+                continue
+
+            # Report broken references (external URLs are skipped)
+            for rel in relationships:
+                if rel.target_path is not None and not self.package.has_file(
+                    rel.target_path
+                ):
+                    errors.append(
+                        f"  {rel_path}: Line {rel.sourceline}: Broken reference to {rel.target}"
+                    )
 
         # Check for unreferenced files (files that exist but are not referenced anywhere)
-        unreferenced_files = set(all_files) - all_referenced_files
+        unreferenced_files = set(all_files) - self.package.referenced_by.keys()
 
         if unreferenced_files:
             for unref_file in sorted(unreferenced_files):
@@ -385,103 +396,13 @@ class BaseSchemaValidator:
                 )
             return True
 
+    @timed_check
     def validate_all_relationship_ids(self):
         """
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
-        errors = []
-
-        # Process each XML file that might contain r:id references
-        for xml_file in self.xml_files:
-            # Skip .rels files themselves
-            if xml_file.suffix == ".rels":
-                continue
-
-            # Determine the corresponding .rels file
-            # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
-
-            # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
-                continue
-
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
-
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
-            for error in errors:
-                print(error)
-            print("\nThese ID mismatches will cause the document to appear corrupt!")
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All relationship ID references are valid")
-            return True
+        return self._report_rule(RelationshipIdsRule)
 
     def _get_expected_relationship_type(self, element_name):
         """
@@ -519,37 +440,20 @@ class BaseSchemaValidator:
 
         return None
 
+    @timed_check
     def validate_content_types(self):
         """Validate that all content files are properly declared in [Content_Types].xml."""
         errors = []
 
         # Find [Content_Types].xml file
         content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        if not self.package.has_file(content_types_file):
             print("FAILED - [Content_Types].xml file not found")
             return False
 
         try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
-
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
-            ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
+            # Get all declared parts (Override) and extensions (Default)
+            declared_parts, declared_extensions = self.package.content_types()
 
             # Root elements that require content type declaration
             declarable_roots = {
@@ -576,8 +480,7 @@ class BaseSchemaValidator:
             }
 
             # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
+            all_files = self.package.files
 
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
@@ -593,7 +496,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self.package.root_tag(xml_file)
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -653,9 +556,16 @@ class BaseSchemaValidator:
         unpacked_dir = self.unpacked_dir.resolve()
 
         # Validate current file
+        start = time.perf_counter()
         is_valid, current_errors = self._validate_single_file_xsd(
             xml_file, unpacked_dir
         )
+        if is_valid is not None:
+            self.report.add_part_time(
+                xml_file.relative_to(unpacked_dir).as_posix(),
+                "xsd_seconds",
+                time.perf_counter() - start,
+            )
 
         if is_valid is None:
             return None, set()  # Skipped
@@ -673,7 +583,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -685,6 +595,7 @@ class BaseSchemaValidator:
                 )
             return True, set()
 
+    @timed_check
     def validate_against_xsd(self):
         """Validate XML files against XSD schemas, showing only new errors compared to original."""
         new_errors = []
@@ -692,11 +603,9 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        results = self._validate_parts_xsd()
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,7 +621,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -738,6 +647,111 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_parts_xsd(self):
+        """Run validate_file_against_xsd on every part, in parallel if jobs > 1.
+
+        With incremental validation, parts whose key matches the manifest of an
+        earlier run reuse the stored result and are not validated again.
+
+        Returns:
+            list: (is_valid, new_errors_set) for each file in self.xml_files, in order
+        """
+        # Parts without a schema are skipped without leaving this process
+        parts = [f for f in self.xml_files if self._get_schema_path(f)]
+        results = {}
+
+        manifest = None
+        if self.incremental:
+            manifest = ValidationManifest(
+                ValidationManifest.path_for(self.unpacked_dir),
+                {
+                    "validator": type(self).__name__,
+                    "original": self._get_original_file_hash(),
+                },
+            )
+            file_hashes = {}
+            keys = {f: self._get_part_key(f, file_hashes) for f in parts}
+            for f in parts:
+                stored = manifest.lookup(self._part_name(f), keys[f])
+                if stored is not None:
+                    self.report.count("xsd_manifest_hits")
+                    is_valid, errors = stored
+                    results[f] = (is_valid, set(errors))
+            parts = [f for f in parts if f not in results]
+
+        if self.jobs <= 1 or len(parts) <= 1:
+            for f in parts:
+                results[f] = self.validate_file_against_xsd(f)
+        else:
+            # Hash the original once here rather than once per worker
+            self._get_original_file_hash()
+
+            # Hand out the biggest parts first so no worker is left with a large
+            # part at the end; results are merged back in xml_files order
+            parts.sort(key=lambda f: f.stat().st_size, reverse=True)
+            pool = _get_pool(self.jobs)
+            outcomes = pool.map(_validate_part_xsd, itertools.repeat(self), parts)
+            for f, (result, worker_report) in zip(parts, outcomes):
+                results[f] = result
+                self.report.merge(worker_report)
+
+        if manifest is not None:
+            for f in parts:
+                is_valid, errors = results[f]
+                manifest.record(self._part_name(f), keys[f], [is_valid, sorted(errors)])
+            manifest.save(self._part_name(f) for f in keys)
+
+        return [results.get(f, (None, set())) for f in self.xml_files]
+
+    def _part_name(self, xml_file):
+        """Return the package part name of a file, e.g. "word/document.xml"."""
+        return xml_file.relative_to(self.unpacked_dir).as_posix()
+
+    def _get_part_key(self, xml_file, file_hashes):
+        """Return the manifest key of a part.
+
+        The key covers the part itself, its schema, its .rels file and every
+        part that .rels file points at, so a part is re-validated whenever
+        any of them changes.
+
+        Args:
+            xml_file: Path to the part
+            file_hashes: dict of path -> content hash, shared between calls
+        """
+        schema_path = self._get_schema_path(xml_file)
+        key_parts = [str(schema_path), str(schema_path.stat().st_mtime_ns)]
+
+        for dependency in [xml_file] + self._get_part_dependencies(xml_file):
+            if dependency not in file_hashes:
+                file_hashes[dependency] = hash_file(dependency)
+            key_parts.append(
+                f"{self._part_name(dependency)}={file_hashes[dependency]}"
+            )
+
+        return combine_hashes(*key_parts)
+
+    def _get_part_dependencies(self, xml_file):
+        """Return the .rels file of a part and the existing parts it points at."""
+        rels_file = self.package.rels_file_for(xml_file)
+        if rels_file is None:
+            return []
+
+        dependencies = [rels_file]
+        try:
+            relationships = self.package.relationships(rels_file)
+        except Exception:
+            return dependencies
+
+        for rel in relationships:
+            if (
+                rel.target_path is not None
+                and self.package.has_file(rel.target_path)
+                and rel.target_path not in dependencies
+            ):
+                dependencies.append(rel.target_path)
+
+        return dependencies
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -762,64 +776,93 @@ class BaseSchemaValidator:
 
         return None
 
-    def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
+    def _load_schema(self, schema_path):
+        """Return the compiled XSD schema at schema_path, compiling it at most once.
 
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
-
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
-
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
+        Compiling the ISO/IEC 29500 schemas (and everything they import) is by far
+        the most expensive part of XSD validation, so compiled schemas are kept in
+        a process-wide cache shared by all validator instances. A schema that
+        fails to compile is cached too, and its error raised again on every use.
+        """
+        schema_path = Path(schema_path).resolve()
+        key = (str(schema_path), schema_path.stat().st_mtime_ns)
 
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
+        schema = _SCHEMA_CACHE.get(key)
+        if schema is None:
+            self.report.count("schema_cache_misses")
+            try:
+                with open(schema_path, "rb") as xsd_file:
+                    parser = lxml.etree.XMLParser()
+                    xsd_doc = lxml.etree.parse(
+                        xsd_file, parser=parser, base_url=str(schema_path)
+                    )
+                schema = lxml.etree.XMLSchema(xsd_doc)
+            except (lxml.etree.XMLSyntaxError, lxml.etree.XMLSchemaParseError) as e:
+                schema = e.with_traceback(None)
+            _SCHEMA_CACHE[key] = schema
+        else:
+            self.report.count("schema_cache_hits")
+        if isinstance(schema, Exception):
+            raise schema.with_traceback(None)
+        return schema
+
+    def _preprocess_for_xsd(self, xml_doc, clean):
+        """Return a copy of a part prepared for XSD validation.
+
+        Works on a single in-memory copy of the tree (the parsed part may be
+        shared with other checks) and:
+          - removes template tags from text and tail content, except in
+            t elements and after comments and processing instructions
+          - removes mc:Ignorable from the root element
+          - if clean is True, removes attributes and elements (with their
+            tails) that are not in OOXML_NAMESPACES, below the root
 
-        return lxml.etree.ElementTree(xml_copy)
+        Args:
+            xml_doc: Parsed lxml ElementTree of the part
+            clean: Whether to remove non-OOXML attributes and elements
 
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
-        elements_to_remove = []
+        Returns:
+            lxml.etree._ElementTree: The preprocessed copy
+        """
+        xml_doc = copy.deepcopy(xml_doc)
+        root = xml_doc.getroot()
 
-        # Find elements to remove
-        for elem in list(root):
-            # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
+        for text in _TEMPLATE_TEXT_XPATH(xml_doc):
+            owner = text.getparent()
+            if callable(owner.tag):  # Comment or processing instruction
                 continue
+            if owner.tag.endswith("}t") or owner.tag == "t":
+                continue
+            if text.is_tail:
+                owner.tail = _TEMPLATE_TAG_PATTERN.sub("", owner.tail)
+            else:
+                owner.text = _TEMPLATE_TAG_PATTERN.sub("", owner.text)
 
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
-                    continue
-
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
+        root.attrib.pop(f"{{{self.MC_NAMESPACE}}}Ignorable", None)
 
-        # Remove collected elements
-        for elem in elements_to_remove:
-            root.remove(elem)
+        if clean:
+            foreign = {}  # Clark name -> not in an allowed namespace
 
-    def _preprocess_for_mc_ignorable(self, xml_doc):
-        """Preprocess XML to handle mc:Ignorable attribute properly."""
-        # Remove mc:Ignorable attributes before validation
-        root = xml_doc.getroot()
+            def is_foreign(name):
+                result = foreign.get(name)
+                if result is None:
+                    result = name.startswith("{") and (
+                        name[1 : name.index("}")] not in self.OOXML_NAMESPACES
+                    )
+                    foreign[name] = result
+                return result
+
+            elements_to_remove = []
+            for elem in root.iter(lxml.etree.Element):
+                for attr in elem.keys():
+                    if is_foreign(attr):
+                        del elem.attrib[attr]
+                if elem is not root and is_foreign(elem.tag):
+                    elements_to_remove.append(elem)
 
-        # Remove mc:Ignorable attribute from root
-        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
-            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
+            # Removing an element also removes its tail text
+            for elem in elements_to_remove:
+                elem.getparent().remove(elem)
 
         return xml_doc
 
@@ -830,28 +873,36 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            # Load XML
+            xml_doc = self.parse_xml(xml_file)
+        except Exception as e:
+            return False, {str(e)}
+
+        return self._validate_xml_doc_xsd(
+            xml_doc, schema_path, xml_file.relative_to(base_path)
+        )
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+    def _validate_xml_doc_xsd(self, xml_doc, schema_path, relative_path):
+        """Validate a parsed XML document against an XSD schema.
 
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+        Args:
+            xml_doc: Parsed lxml ElementTree of the part
+            schema_path: Path to the XSD schema for the part
+            relative_path: Path of the part relative to the package root
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
+        Returns:
+            tuple: (is_valid, errors_set)
+        """
+        try:
+            # Load schema (compiled once per process)
+            schema = self._load_schema(schema_path)
+
+            # Preprocess XML, cleaning ignorable namespaces if needed
+            clean = bool(
                 relative_path.parts
                 and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+            )
+            xml_doc = self._preprocess_for_xsd(xml_doc, clean)
 
             # Validate
             if schema.validate(xml_doc):
@@ -869,82 +920,67 @@ class BaseSchemaValidator:
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        Errors are looked up in a baseline index keyed by the original file's
+        content hash, so each part of an unchanged original is validated once.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
-        relative_path = xml_file.relative_to(unpacked_dir)
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
-
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
+        part_name = xml_file.relative_to(unpacked_dir).as_posix()
+
+        baseline = _BASELINE_CACHE.setdefault(self._get_original_file_hash(), {})
+        if part_name not in baseline:
+            self.report.count("baseline_cache_misses")
+            start = time.perf_counter()
+            baseline[part_name] = self._validate_original_part(part_name)
+            self.report.add_part_time(
+                part_name, "baseline_seconds", time.perf_counter() - start
             )
-            return errors if errors else set()
+        else:
+            self.report.count("baseline_cache_hits")
+        return baseline[part_name]
+
+    def _get_original_file_hash(self):
+        """Return the SHA-256 hex digest of the original file's contents."""
+        if self._original_file_hash is None:
+            self._original_file_hash = hash_file(self.original_file)
+        return self._original_file_hash
 
-    def _remove_template_tags_from_text_nodes(self, xml_doc):
-        """Remove template tags from XML text nodes and collect warnings.
+    def _validate_original_part(self, part_name):
+        """Validate one part of the original file, read straight from the zip.
 
-        Template tags follow the pattern {{ ... }} and are used as placeholders
-        for content replacement. They should be removed from text content before
-        XSD validation while preserving XML structure.
+        Args:
+            part_name: Zip member name of the part (e.g. "word/document.xml")
 
         Returns:
-            tuple: (cleaned_xml_doc, warnings_list)
+            set: Set of error messages from the original part
         """
-        warnings = []
-        template_pattern = re.compile(r"\{\{[^}]*\}\}")
-
-        # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        def process_text_content(text, content_type):
-            if not text:
-                return text
-            matches = list(template_pattern.finditer(text))
-            if matches:
-                for match in matches:
-                    warnings.append(
-                        f"Found template tag in {content_type}: {match.group()}"
-                    )
-                return template_pattern.sub("", text)
-            return text
+        relative_path = PurePosixPath(part_name)
+        schema_path = self._get_schema_path(Path(relative_path))
+        if not schema_path:
+            return set()
 
-        # Process all text nodes in the document
-        for elem in xml_copy.iter():
-            # Skip processing if this is a w:t element
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
-                continue
+        with zipfile.ZipFile(self.original_file, "r") as zip_ref:
+            if part_name not in zip_ref.NameToInfo:
+                # File didn't exist in original, so no original errors
+                return set()
+            content = zip_ref.read(part_name)
 
-            elem.text = process_text_content(elem.text, "text content")
-            elem.tail = process_text_content(elem.tail, "tail content")
+        try:
+            xml_doc = lxml.etree.parse(io.BytesIO(content))
+        except Exception as e:
+            return {str(e)}
 
-        return lxml.etree.ElementTree(xml_copy), warnings
+        is_valid, errors = self._validate_xml_doc_xsd(
+            xml_doc, schema_path, relative_path
+        )
+        return errors if errors else set()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,237 @@
+"""
+Single-pass rule engine for validating document XML parts.
+
+Each part is parsed once (through the validator's tree cache) and walked once.
+Rules register callbacks for the element tags they care about, and every rule
+registered for a part runs during that same walk.
+
+In streaming mode parts are not kept as trees at all: the same callbacks are
+driven by lxml.etree.iterparse, and elements are cleared as soon as they have
+been handled, so memory use per part is bounded by the depth of the document
+rather than its size.
+"""
+
+import time
+
+import lxml.etree
+
+
+class Rule:
+    """A validation check that plugs into the single-pass part walk.
+
+    Subclasses register callbacks in handlers(), collect problems in
+    self.errors while parts are walked, and print the result in report().
+    """
+
+    # Tags (Clark notation) of enclosing elements the walk should keep track of,
+    # so callbacks can ask whether the current element is inside one of them
+    SCOPES = ()
+
+    # Tags (Clark notation) of elements whose subtrees this rule ignores. Callbacks
+    # are not called for these elements or anything inside them, and subtrees no
+    # active rule wants to see are not walked at all.
+    SKIPS = ()
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.errors = []
+
+    def handlers(self):
+        """Return the element callbacks of this rule.
+
+        Returns:
+            dict: (event, tag) -> callback(xml_file, elem, walk). event is "start"
+                  (attributes are available and callbacks run in document order)
+                  or "end" (the element's text is complete). tag is a Clark
+                  notation tag, or "*" to match every element. In streaming mode
+                  an element's descendants are already cleared by its "end"
+                  event, so callbacks must not look below the element itself.
+        """
+        return {}
+
+    def applies_to(self, xml_file):
+        """Return True if this rule should inspect xml_file."""
+        return True
+
+    def start_part(self, xml_file, root):
+        """Called before the elements of a part are walked."""
+
+    def part_error(self, xml_file, error):
+        """Record an error that stopped this rule from checking a part."""
+        self.errors.append(f"  {self.relative_path(xml_file)}: Error: {error}")
+
+    def report(self):
+        """Print the result of the rule and return True if it passed."""
+        raise NotImplementedError("Subclasses must implement the report method")
+
+    def relative_path(self, xml_file):
+        """Return xml_file relative to the unpacked directory."""
+        return xml_file.relative_to(self.validator.unpacked_dir)
+
+
+class PartWalk:
+    """State of the walk over one part, shared by all rule callbacks."""
+
+    def __init__(self, scopes):
+        self._depths = dict.fromkeys(scopes, 0)
+
+    def inside(self, tag):
+        """Return True if the current element is, or is inside, a tag element."""
+        return self._depths[tag] > 0
+
+    def enter(self, elem):
+        if elem.tag in self._depths:
+            self._depths[elem.tag] += 1
+
+    def leave(self, elem):
+        if elem.tag in self._depths:
+            self._depths[elem.tag] -= 1
+
+
+def run_rules(validator, rules, xml_files):
+    """Walk every part once, running the callbacks of all applicable rules.
+
+    Args:
+        validator: Validator providing the parsed-tree cache (parse_xml), the
+                   streaming setting and the report that timings go to
+        rules: Rule instances to run
+        xml_files: Parts to walk, in reporting order
+    """
+    report = validator.report
+    rule_stats = {rule: [0.0, 0] for rule in rules}  # rule -> [seconds, calls]
+
+    for xml_file in xml_files:
+        active = [rule for rule in rules if rule.applies_to(xml_file)]
+        if not active:
+            continue
+
+        part_name = xml_file.relative_to(validator.unpacked_dir).as_posix()
+        start = time.perf_counter()
+        elements = 0
+        try:
+            if validator.streaming:
+                report.count("parse_bytes", xml_file.stat().st_size)
+                walker = iterparse_part(xml_file)
+            else:
+                root = validator.parse_xml(xml_file).getroot()
+                walker = lxml.etree.iterwalk(root, events=("start", "end"))
+            elements = _walk_part(xml_file, walker, active, rule_stats)
+        except (lxml.etree.XMLSyntaxError, OSError) as e:
+            # When streaming, this can happen part way through the walk
+            for rule in active:
+                rule.part_error(xml_file, e)
+
+        report.add_part_time(part_name, "walk_seconds", time.perf_counter() - start)
+        report.part(part_name)["elements"] = elements
+        report.count("elements_visited", elements)
+
+    for rule, (seconds, calls) in rule_stats.items():
+        report.add_rule_time(type(rule).__name__, seconds, calls)
+
+
+def iterparse_part(source):
+    """Parse a part incrementally, yielding (event, element) like iterwalk.
+
+    Each element is cleared once its "end" event has been handled, and finished
+    siblings are removed from their parent, so only the path from the root to
+    the current element is held in memory.
+
+    Args:
+        source: Path of the part, or a binary file object to read it from
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the part is not well-formed
+    """
+    if not hasattr(source, "read"):
+        source = str(source)
+    for event, elem in lxml.etree.iterparse(source, events=("start", "end")):
+        yield event, elem
+        if event == "end":
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+def _walk_part(xml_file, walker, rules, rule_stats):
+    """Dispatch the elements of one part to the rule callbacks.
+
+    Args:
+        xml_file: Path of the part, passed on to the callbacks
+        walker: iterwalk or iterparse_part iterator over the part
+        rules: Rules that apply to the part
+        rule_stats: dict of rule -> [seconds, calls], updated with the time
+                    spent in each rule's callbacks
+
+    Returns:
+        int: Number of elements walked
+    """
+    dispatch = {"start": {}, "end": {}}
+    scopes = set()
+    skips = {}  # tag -> rules that ignore its subtree
+    for rule in rules:
+        scopes.update(rule.SCOPES)
+        for tag in rule.SKIPS:
+            skips.setdefault(tag, []).append(rule)
+        for (event, tag), callback in rule.handlers().items():
+            dispatch[event].setdefault(tag, []).append((rule, callback))
+
+    start_any = dispatch["start"].pop("*", [])
+    end_any = dispatch["end"].pop("*", [])
+    failed = set()
+    muted = dict.fromkeys(rules, 0)  # rule -> number of enclosing skipped elements
+    walk = PartWalk(scopes)
+    skip_subtree = getattr(walker, "skip_subtree", None)
+    root_started = False
+    elements = 0
+    clock = time.perf_counter
+
+    def call(callbacks, elem):
+        for rule, callback in callbacks:
+            if rule in failed or muted[rule]:
+                continue
+            stats = rule_stats[rule]
+            start = clock()
+            try:
+                callback(xml_file, elem, walk)
+            except Exception as e:
+                # Like a failed parse, an error stops the rule for this part only
+                rule.part_error(xml_file, e)
+                failed.add(rule)
+            stats[0] += clock() - start
+            stats[1] += 1
+
+    for event, elem in walker:
+        if event == "start":
+            elements += 1
+            if not root_started:
+                root_started = True
+                for rule in rules:
+                    try:
+                        rule.start_part(xml_file, elem)
+                    except Exception as e:
+                        rule.part_error(xml_file, e)
+                        failed.add(rule)
+
+            walk.enter(elem)
+            skipped_by = skips.get(elem.tag, ())
+            for rule in skipped_by:
+                muted[rule] += 1
+            if (
+                skipped_by
+                and skip_subtree
+                and all(muted[rule] or rule in failed for rule in rules)
+            ):
+                # Nobody looks inside this element; its end event still follows
+                skip_subtree()
+            call(dispatch["start"].get(elem.tag, ()), elem)
+            call(start_any, elem)
+        else:
+            call(dispatch["end"].get(elem.tag, ()), elem)
+            call(end_any, elem)
+            walk.leave(elem)
+            for rule in skips.get(elem.tag, ()):
+                muted[rule] -= 1
+
+    return elements
@@ -0,0 +1,103 @@
+"""
+Fingerprints of the paragraphs of a document, to find the paragraphs that differ.
+
+Each paragraph with text is kept as a short hash of its text, its w14:paraId
+and its position, so two documents are compared in memory proportional to
+their number of paragraphs rather than to their text. Only the paragraphs in
+windows whose fingerprints do not line up are read again, to show the changes.
+"""
+
+import difflib
+import hashlib
+from itertools import zip_longest
+
+W14_NAMESPACE = "http://schemas.microsoft.com/office/word/2010/wordml"
+
+
+class ParagraphIndex:
+    """Fingerprint, w14:paraId and position of each paragraph with text, in order."""
+
+    def __init__(self, paragraphs, get_text):
+        """
+        Args:
+            paragraphs: The w:p elements of a document, in document order
+            get_text: Callable returning the text of a w:p element
+        """
+        self._get_text = get_text
+        self.elements = []
+        self.numbers = []  # 1-based position among all paragraphs
+        self.para_ids = []
+        self.fingerprints = []
+        for number, elem in enumerate(paragraphs, 1):
+            text = get_text(elem)
+            # Skip empty paragraphs - they don't affect content validation
+            if not text:
+                continue
+            self.elements.append(elem)
+            self.numbers.append(number)
+            self.para_ids.append(elem.get(f"{{{W14_NAMESPACE}}}paraId"))
+            self.fingerprints.append(
+                hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+            )
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+    def text(self, i):
+        """Return the text of the i-th paragraph with text."""
+        return self._get_text(self.elements[i])
+
+    def label(self, i):
+        """Return where the i-th paragraph with text is, e.g. "paragraph 12"."""
+        para_id = self.para_ids[i]
+        if para_id:
+            return f"paragraph {self.numbers[i]}, w14:paraId {para_id}"
+        return f"paragraph {self.numbers[i]}"
+
+    def changes(self, modified):
+        """
+        Yield the paragraphs that differ between this document and a modified one.
+
+        Fingerprints are aligned like the lines of a diff. In each window of
+        paragraphs that do not line up, paragraphs with the same w14:paraId
+        are paired first, and the others in order between them.
+
+        Args:
+            modified: ParagraphIndex of the modified document
+
+        Yields:
+            tuple: (i, j), indexes of a paragraph in this index and in the
+                   modified one; i is None for an added paragraph and j for
+                   a removed one
+        """
+        if self.fingerprints == modified.fingerprints:
+            return
+        matcher = difflib.SequenceMatcher(
+            None, self.fingerprints, modified.fingerprints, autojunk=False
+        )
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            for i, j in self._pair(modified, range(i1, i2), range(j1, j2)):
+                if i is None or j is None:
+                    yield i, j
+                elif self.fingerprints[i] != modified.fingerprints[j]:
+                    yield i, j
+
+    def _pair(self, modified, originals, modifieds):
+        """Pair the paragraphs of a window, by w14:paraId where they have one."""
+        by_para_id = {
+            modified.para_ids[j]: j for j in modifieds if modified.para_ids[j]
+        }
+        anchors = []  # (i, j) with the same paraId, in order in both windows
+        for i in originals:
+            j = by_para_id.get(self.para_ids[i]) if self.para_ids[i] else None
+            if j is not None and (not anchors or j > anchors[-1][1]):
+                anchors.append((i, j))
+
+        i, j = originals.start, modifieds.start
+        for anchor_i, anchor_j in anchors + [(originals.stop, modifieds.stop)]:
+            yield from zip_longest(range(i, anchor_i), range(j, anchor_j))
+            if anchor_i < originals.stop:
+                yield anchor_i, anchor_j
+            i, j = anchor_i + 1, anchor_j + 1
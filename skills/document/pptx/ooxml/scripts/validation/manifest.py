@@ -0,0 +1,103 @@
+"""
+Manifest of per-part validation results, kept beside an unpacked directory.
+
+Each entry records the key a part was validated under (its content hash plus
+the hashes of everything its result depends on) and the result itself. A later
+run with the same key for a part reuses the stored result instead of
+validating the part again.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# Bump when the stored results or the way keys are computed change
+MANIFEST_VERSION = 1
+
+
+class ValidationManifest:
+    """Per-part validation results from earlier runs over the same directory."""
+
+    def __init__(self, path, header):
+        """
+        Args:
+            path: Path of the manifest file
+            header: dict identifying what the results were computed against
+                    (validator, original file hash, ...). A manifest written
+                    under a different header is ignored.
+        """
+        self.path = Path(path)
+        self.header = dict(header, version=MANIFEST_VERSION)
+        self.parts = {}
+        self._load()
+
+    @staticmethod
+    def path_for(unpacked_dir):
+        """Return the manifest path for an unpacked directory."""
+        unpacked_dir = Path(unpacked_dir)
+        return unpacked_dir.parent / f".{unpacked_dir.name}.validation.json"
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return  # Missing or unreadable manifest: validate everything
+
+        if isinstance(data, dict) and data.get("header") == self.header:
+            self.parts = data.get("parts", {})
+
+    def lookup(self, part_name, key):
+        """Return the stored result for part_name if it was stored under key."""
+        entry = self.parts.get(part_name)
+        if entry is None or entry.get("key") != key:
+            return None
+        return entry["result"]
+
+    def record(self, part_name, key, result):
+        """Store the result of validating part_name under key."""
+        self.parts[part_name] = {"key": key, "result": result}
+
+    def save(self, part_names):
+        """Write the manifest, keeping only entries for part_names.
+
+        The file is replaced atomically, so a concurrent or interrupted run
+        never sees a partially written manifest.
+        """
+        part_names = set(part_names)
+        data = {
+            "header": self.header,
+            "parts": {
+                name: entry for name, entry in self.parts.items() if name in part_names
+            },
+        }
+        try:
+            fd, temp_path = tempfile.mkstemp(
+                dir=self.path.parent, prefix=self.path.name, suffix=".tmp"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            # The manifest only saves work; failing to write it is not an error
+            print(f"Warning: Could not write validation manifest {self.path}: {e}")
+
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def combine_hashes(*parts):
+    """Return one SHA-256 hex digest for an ordered sequence of strings."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
@@ -0,0 +1,189 @@
+"""
+In-memory index of an unpacked OPC package (the zip layout of .docx/.pptx/.xlsx).
+
+The directory is walked once, and the .rels files and [Content_Types].xml are
+parsed at most once each, so relationship and content type checks query the
+index instead of rescanning the filesystem.
+"""
+
+from fnmatch import fnmatchcase
+
+import lxml.etree
+
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+CONTENT_TYPES_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+
+class Relationship:
+    """One <Relationship> entry of a .rels file."""
+
+    def __init__(self, rels_file, element, target_path):
+        self.rels_file = rels_file
+        self.id = element.get("Id")
+        self.type = element.get("Type", "")
+        self.target = element.get("Target")
+        self.sourceline = element.sourceline
+        # Resolved path of an internal target, or None for external targets
+        self.target_path = target_path
+
+    @property
+    def is_external(self):
+        return self.target_path is None
+
+    @property
+    def type_name(self):
+        """The last segment of the relationship type URI, e.g. "slideLayout"."""
+        return self.type.split("/")[-1] if "/" in self.type else self.type
+
+
+class PackageIndex:
+    """Files, relationships and content types of an unpacked package."""
+
+    def __init__(self, unpacked_dir, parse_xml):
+        """
+        Args:
+            unpacked_dir: Resolved path of the unpacked package
+            parse_xml: Callable returning the parsed lxml tree of a file
+        """
+        self.unpacked_dir = unpacked_dir
+        self._parse_xml = parse_xml
+
+        # Every file and directory, in the order of a single recursive walk
+        entries = list(unpacked_dir.rglob("*"))
+        self.files = [f for f in entries if f.is_file()]
+        self._file_set = set(self.files)
+
+        # XML parts first, then .rels files, as validators report them
+        self.xml_files = [f for f in entries if fnmatchcase(f.name, "*.xml")] + [
+            f for f in entries if fnmatchcase(f.name, "*.rels")
+        ]
+        self.rels_files = [f for f in self.xml_files if fnmatchcase(f.name, "*.rels")]
+
+        self._relationships = {}  # rels file -> list of Relationship or error
+        self._content_types = None
+        self._referenced_by = None
+
+    def has_file(self, path):
+        """Return True if path is a file of the package."""
+        return path in self._file_set
+
+    def glob(self, pattern):
+        """Return the files matching a pattern like "ppt/slides/*.xml".
+
+        Like Path.glob, but only the last path segment may contain wildcards.
+        """
+        directory, _, name_pattern = pattern.rpartition("/")
+        directory = self.unpacked_dir / directory
+        return [
+            f
+            for f in self.files
+            if f.parent == directory and fnmatchcase(f.name, name_pattern)
+        ]
+
+    def rels_file_for(self, part):
+        """Return the .rels file of a part (dir/_rels/name.rels), or None."""
+        rels_file = part.parent / "_rels" / f"{part.name}.rels"
+        return rels_file if self.has_file(rels_file) else None
+
+    def relationships(self, rels_file):
+        """Return the relationships of a .rels file, in document order.
+
+        Raises:
+            Exception: Whatever parsing the .rels file raised, on every call
+        """
+        result = self._relationships.get(rels_file)
+        if result is None:
+            try:
+                result = self._read_relationships(rels_file)
+            except Exception as e:
+                result = e
+            self._relationships[rels_file] = result
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _read_relationships(self, rels_file):
+        rels_root = self._parse_xml(rels_file).getroot()
+
+        relationships = []
+        for rel in rels_root.iterfind(
+            f".//{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+        ):
+            relationships.append(
+                Relationship(rels_file, rel, self._resolve_target(rels_file, rel))
+            )
+        return relationships
+
+    def _resolve_target(self, rels_file, rel):
+        target = rel.get("Target")
+        if not target or target.startswith(("http", "mailto:")):
+            return None  # External URLs are not part of the package
+
+        if rels_file.name == ".rels":
+            # Root .rels file - targets are relative to unpacked_dir
+            target_path = self.unpacked_dir / target
+        else:
+            # Other .rels files - targets are relative to their parent's parent
+            # e.g., word/_rels/document.xml.rels -> targets relative to word/
+            target_path = rels_file.parent.parent / target
+
+        try:
+            return target_path.resolve()
+        except (OSError, ValueError):
+            return target_path
+
+    @property
+    def referenced_by(self):
+        """dict of resolved target path -> relationships pointing at it.
+
+        .rels files that cannot be parsed contribute no references.
+        """
+        if self._referenced_by is None:
+            self._referenced_by = {}
+            for rels_file in self.rels_files:
+                try:
+                    relationships = self.relationships(rels_file)
+                except Exception:
+                    continue
+                for rel in relationships:
+                    if rel.target_path is not None:
+                        self._referenced_by.setdefault(rel.target_path, []).append(rel)
+        return self._referenced_by
+
+    def content_types(self):
+        """Return the declarations of [Content_Types].xml.
+
+        Returns:
+            tuple: (overrides, defaults) where overrides maps part names (without
+                   the leading "/") to content types, and defaults maps
+                   lowercase extensions to content types
+
+        Raises:
+            Exception: Whatever parsing [Content_Types].xml raised
+        """
+        if self._content_types is None:
+            root = self._parse_xml(self.unpacked_dir / "[Content_Types].xml").getroot()
+            overrides = {}
+            defaults = {}
+
+            # Get Override declarations (specific files)
+            for override in root.iterfind(f".//{{{CONTENT_TYPES_NAMESPACE}}}Override"):
+                part_name = override.get("PartName")
+                if part_name is not None:
+                    overrides[part_name.lstrip("/")] = override.get("ContentType")
+
+            # Get Default declarations (by extension)
+            for default in root.iterfind(f".//{{{CONTENT_TYPES_NAMESPACE}}}Default"):
+                extension = default.get("Extension")
+                if extension is not None:
+                    defaults[extension.lower()] = default.get("ContentType")
+
+            self._content_types = (overrides, defaults)
+        return self._content_types
+
+    def root_tag(self, xml_file):
+        """Return the tag of a part's root element, reading only its start."""
+        for _, elem in lxml.etree.iterparse(str(xml_file), events=("start",)):
+            return elem.tag
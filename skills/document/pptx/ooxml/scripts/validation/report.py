@@ -0,0 +1,74 @@
+"""
+Machine-readable report of a validation run: what was checked and where the time went.
+"""
+
+import functools
+import time
+
+
+class ValidationReport:
+    """Timings and counters collected while a validator runs."""
+
+    def __init__(self):
+        self.checks = []  # {"name", "passed", "seconds"} in the order they ran
+        self.rules = {}  # rule name -> {"seconds", "calls"}
+        self.parts = {}  # part name -> timings and sizes (see part())
+        self.counters = {}  # e.g. schema_cache_hits, parse_bytes, elements_visited
+
+    def record_check(self, name, passed, seconds):
+        self.checks.append({"name": name, "passed": passed, "seconds": seconds})
+
+    def add_rule_time(self, name, seconds, calls):
+        stats = self.rules.setdefault(name, {"seconds": 0.0, "calls": 0})
+        stats["seconds"] += seconds
+        stats["calls"] += calls
+
+    def part(self, name):
+        """Return the (mutable) stats of one part, e.g. "word/document.xml".
+
+        Keys are filled in as they are measured: bytes, parse_seconds,
+        walk_seconds, elements, xsd_seconds, baseline_seconds.
+        """
+        return self.parts.setdefault(name, {})
+
+    def add_part_time(self, name, key, seconds):
+        stats = self.part(name)
+        stats[key] = stats.get(key, 0.0) + seconds
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, other):
+        """Add the rule, part and counter stats of another report to this one."""
+        for name, stats in other.rules.items():
+            self.add_rule_time(name, stats["seconds"], stats["calls"])
+        for name, stats in other.parts.items():
+            part = self.part(name)
+            for key, value in stats.items():
+                if key.endswith("_seconds"):
+                    part[key] = part.get(key, 0.0) + value
+                else:
+                    part[key] = value  # Sizes, not work done
+        for name, n in other.counters.items():
+            self.count(name, n)
+
+    def to_dict(self):
+        return {
+            "checks": self.checks,
+            "rules": self.rules,
+            "parts": self.parts,
+            "counters": self.counters,
+        }
+
+
+def timed_check(method):
+    """Record the result and duration of a validate_* method in self.report."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        passed = method(self, *args, **kwargs)
+        self.report.record_check(method.__name__, passed, time.perf_counter() - start)
+        return passed
+
+    return wrapper
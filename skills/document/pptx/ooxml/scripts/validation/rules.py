@@ -0,0 +1,213 @@
+"""
+Element-level validation rules shared by all Office document validators.
+"""
+
+import lxml.etree
+
+from .engine import Rule
+
+MC_ALTERNATE_CONTENT = (
+    "{http://schemas.openxmlformats.org/markup-compatibility/2006}AlternateContent"
+)
+
+
+class NamespacesRule(Rule):
+    """Namespace prefixes in Ignorable attributes must be declared."""
+
+    def start_part(self, xml_file, root):
+        declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+
+        for attr_val in [v for k, v in root.attrib.items() if k.endswith("Ignorable")]:
+            undeclared = set(attr_val.split()) - declared
+            self.errors.extend(
+                f"  {self.relative_path(xml_file)}: "
+                f"Namespace '{ns}' in Ignorable but not declared"
+                for ns in undeclared
+            )
+
+    def part_error(self, xml_file, error):
+        # Well-formedness is reported by validate_xml
+        if not isinstance(error, lxml.etree.XMLSyntaxError):
+            raise error
+
+    def report(self):
+        if self.errors:
+            print(f"FAILED - {len(self.errors)} namespace issues:")
+            for error in self.errors:
+                print(error)
+            return False
+        if self.validator.verbose:
+            print("PASSED - All namespace prefixes properly declared")
+        return True
+
+
+class UniqueIdsRule(Rule):
+    """IDs listed in UNIQUE_ID_REQUIREMENTS must be unique in their scope.
+
+    Elements inside mc:AlternateContent are ignored, since the alternatives
+    legitimately repeat the same IDs.
+    """
+
+    SKIPS = (MC_ALTERNATE_CONTENT,)
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.global_ids = {}  # Track globally unique IDs across all files
+        self.file_ids = {}  # Track IDs that must be unique within the current file
+
+    def handlers(self):
+        return {("start", "*"): self.check_element}
+
+    def start_part(self, xml_file, root):
+        self.file_ids = {}
+
+    def check_element(self, xml_file, elem, walk):
+        # Get the element name without namespace
+        tag = elem.tag.split("}")[-1].lower() if "}" in elem.tag else elem.tag.lower()
+
+        # Check if this element type has ID uniqueness requirements
+        requirements = self.validator.UNIQUE_ID_REQUIREMENTS
+        if tag not in requirements:
+            return
+        attr_name, scope = requirements[tag]
+
+        # Look for the specified attribute
+        id_value = None
+        for attr, value in elem.attrib.items():
+            attr_local = attr.split("}")[-1].lower() if "}" in attr else attr.lower()
+            if attr_local == attr_name:
+                id_value = value
+                break
+
+        if id_value is None:
+            return
+
+        if scope == "global":
+            # Check global uniqueness
+            if id_value in self.global_ids:
+                prev_file, prev_line, prev_tag = self.global_ids[id_value]
+                self.errors.append(
+                    f"  {self.relative_path(xml_file)}: "
+                    f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
+                    f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                )
+            else:
+                self.global_ids[id_value] = (
+                    self.relative_path(xml_file),
+                    elem.sourceline,
+                    tag,
+                )
+        elif scope == "file":
+            # Check file-level uniqueness
+            key = (tag, attr_name)
+            if key not in self.file_ids:
+                self.file_ids[key] = {}
+
+            if id_value in self.file_ids[key]:
+                prev_line = self.file_ids[key][id_value]
+                self.errors.append(
+                    f"  {self.relative_path(xml_file)}: "
+                    f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                    f"(first occurrence at line {prev_line})"
+                )
+            else:
+                self.file_ids[key][id_value] = elem.sourceline
+
+    def report(self):
+        if self.errors:
+            print(f"FAILED - Found {len(self.errors)} ID uniqueness violations:")
+            for error in self.errors:
+                print(error)
+            return False
+        else:
+            if self.validator.verbose:
+                print("PASSED - All required IDs are unique")
+            return True
+
+
+class RelationshipIdsRule(Rule):
+    """r:id attributes must reference existing IDs in the part's .rels file.
+
+    When the validator defines ELEMENT_RELATIONSHIP_TYPES, the type of the
+    referenced relationship is checked as well.
+    """
+
+    def __init__(self, validator):
+        super().__init__(validator)
+        self.rid_to_type = {}
+        self.rid_attr = f"{{{validator.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+
+    def handlers(self):
+        return {("start", "*"): self.check_element}
+
+    def applies_to(self, xml_file):
+        # Skip .rels files themselves, and parts without a .rels file (that's okay)
+        return (
+            xml_file.suffix != ".rels"
+            and self.validator.package.rels_file_for(xml_file) is not None
+        )
+
+    def start_part(self, xml_file, root):
+        # Get valid relationship IDs and their types from the .rels file
+        rels_file = self.validator.package.rels_file_for(xml_file)
+        self.rid_to_type = {}
+
+        for rel in self.validator.package.relationships(rels_file):
+            if rel.id:
+                # Check for duplicate rIds
+                if rel.id in self.rid_to_type:
+                    self.errors.append(
+                        f"  {self.relative_path(rels_file)}: Line {rel.sourceline}: "
+                        f"Duplicate relationship ID '{rel.id}' (IDs must be unique)"
+                    )
+                # Just the type name from the full URL
+                self.rid_to_type[rel.id] = rel.type_name
+
+    def check_element(self, xml_file, elem, walk):
+        # Check for r:id attribute (relationship ID)
+        rid_attr = elem.get(self.rid_attr)
+        if not rid_attr:
+            return
+
+        xml_rel_path = self.relative_path(xml_file)
+        elem_name = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+        rid_to_type = self.rid_to_type
+
+        # Check if the ID exists
+        if rid_attr not in rid_to_type:
+            self.errors.append(
+                f"  {xml_rel_path}: Line {elem.sourceline}: "
+                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+            )
+        # Check if we have type expectations for this element
+        elif self.validator.ELEMENT_RELATIONSHIP_TYPES:
+            expected_type = self.validator._get_expected_relationship_type(elem_name)
+            if expected_type:
+                actual_type = rid_to_type[rid_attr]
+                # Check if the actual type matches or contains the expected type
+                if expected_type not in actual_type.lower():
+                    self.errors.append(
+                        f"  {xml_rel_path}: Line {elem.sourceline}: "
+                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                        f"but should point to a '{expected_type}' relationship"
+                    )
+
+    def part_error(self, xml_file, error):
+        self.errors.append(
+            f"  Error processing {self.relative_path(xml_file)}: {error}"
+        )
+
+    def report(self):
+        if self.errors:
+            print(
+                f"FAILED - Found {len(self.errors)} relationship ID reference errors:"
+            )
+            for error in self.errors:
+                print(error)
+            print("\nThese ID mismatches will cause the document to appear corrupt!")
+            return False
+        else:
+            if self.validator.verbose:
+                print("PASSED - All relationship ID references are valid")
+            return True